@@ -0,0 +1,188 @@
+"""
+Benchmark the daily flow end to end with the mock LLM backend.
+
+Runs the flow's stages back to back for --runs synthetic days: a seeded
+random walk over NIFTY_50 produces each day's MarketSnapshot, candidates
+get synthetic indicators and Reddit sentiment, and DecisionEngine answers
+with the deterministic mock backend (settings.mock_llm_*), so decisions,
+trades and snapshots are real rows and the portfolio evolves run to run.
+Reports mean/p50/p95/max per stage and overall runs per second.
+
+The stage services are called directly, without Prefect, so the numbers
+are the stages' own cost. Every run writes decisions, trades, snapshots
+and llm_calls rows: point POSTGRES_URL (settings.postgres_url) at a
+scratch database and seed it (scripts/seed.py) first.
+
+    poetry run python scripts/benchmark_daily_flow.py --runs 2000 --latency-ms 0
+"""
+import argparse
+import contextlib
+import os
+import time
+
+import numpy as np
+
+# The OpenAI client is built at import time; the mock backend never calls it
+os.environ.setdefault("OPENAI_API_KEY", "unused-mock-backend")
+
+from investment_engine.services.data_sources.market_snapshot import MarketSnapshot
+from investment_engine.services.decision_service import DecisionService
+from investment_engine.services.llm.decision_engine import DecisionEngine
+from investment_engine.services.portfolio_service import PortfolioService
+from investment_engine.services.screener_service import ScreenerService
+from investment_engine.services.snapshot_service import SnapshotService
+from investment_engine.services.trade_service import TradeService
+from investment_engine.settings import settings
+from investment_engine.workflows.schemas.screener_models import ScreenerSpec
+from investment_engine.workflows.utils.nifty_50 import NIFTY_50
+
+STAGES = ["build_state", "screen", "generate", "persist", "execute", "snapshot"]
+
+
+class SyntheticMarket:
+    """Seeded daily random walk; step() returns the next day's MarketSnapshot."""
+
+    def __init__(self, symbols, seed: int, daily_vol: float = 0.02):
+        self.symbols = np.asarray(symbols, dtype=str)
+        self.rng = np.random.default_rng(seed)
+        self.daily_vol = daily_vol
+        n = len(self.symbols)
+        self.opens = [self.rng.uniform(100, 4000, n) for _ in range(2)]
+        self.closes = [o * self.rng.lognormal(0, daily_vol, n) for o in self.opens]
+        self.avg_volume = self.rng.uniform(1e5, 5e6, n)
+
+    def step(self) -> MarketSnapshot:
+        n = len(self.symbols)
+        open_ = self.closes[-1] * self.rng.lognormal(0, self.daily_vol / 4, n)
+        close = open_ * self.rng.lognormal(0, self.daily_vol, n)
+        high = np.maximum(open_, close) * (1 + self.rng.uniform(0, 0.01, n))
+        low = np.minimum(open_, close) * (1 - self.rng.uniform(0, 0.01, n))
+        volume = self.avg_volume * self.rng.lognormal(0, 0.4, n)
+
+        columns = {
+            "current_price": np.round(close, 2),
+            "daily_change_pct": np.round((close / self.closes[-1] - 1) * 100, 2),
+            "volume": volume.astype(np.int64),
+            "open": open_,
+            "high": high,
+            "low": low,
+            "prev_close": self.closes[-1],
+            "prev_open": self.opens[-1],
+            "prev_prev_close": self.closes[-2],
+            "prev_prev_open": self.opens[-2],
+            "avg_volume": self.avg_volume.copy(),
+        }
+        self.opens = [self.opens[-1], open_]
+        self.closes = [self.closes[-1], close]
+        return MarketSnapshot(self.symbols, columns)
+
+    def reddit(self):
+        """Same shape as RedditSentimentIngester.aggregates() entries."""
+        mentions = int(self.rng.integers(1, 40))
+        positive = int(self.rng.integers(0, mentions + 1))
+        negative = int(self.rng.integers(0, mentions - positive + 1))
+        return {
+            "mentions": mentions,
+            "mentions_latest_bucket": int(self.rng.integers(0, mentions + 1)),
+            "avg_sentiment": round((positive - negative) / mentions, 3),
+            "positive": positive,
+            "negative": negative,
+            "window_hours": 24.0,
+        }
+
+    def enrich(self, candidates):
+        """Stand-ins for attach_indicators and attach_reddit_sentiment."""
+        enriched = []
+        for stock in candidates:
+            price = stock["current_price"]
+            enriched.append({
+                **stock,
+                "indicators": {
+                    "sma_20": round(price * self.rng.uniform(0.95, 1.05), 2),
+                    "rsi_14": round(self.rng.uniform(20, 80), 2),
+                },
+                "reddit": self.reddit(),
+                "news": [],
+                "has_news_context": False,
+            })
+        return enriched
+
+
+def run_once(market: SyntheticMarket, spec: ScreenerSpec, sharded: bool):
+    timings = {}
+
+    def timed(stage, fn, *args, **kwargs):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        timings[stage] = time.perf_counter() - start
+        return result
+
+    snapshot = market.step()
+    state = timed("build_state", PortfolioService.build_state, current_prices=snapshot.prices)
+    candidates = market.enrich(timed("screen", ScreenerService.screen, snapshot, spec))
+    if sharded:
+        response = timed("generate", DecisionEngine.generate_sharded, state, candidates, backend="mock")
+    else:
+        response = timed("generate", DecisionEngine.generate_mock, state, candidates)
+    # Stored as the response's model_name (mock:<model>), as store_decisions does
+    rows = timed("persist", DecisionService.persist, response, state["portfolio_id"])
+    timed("execute", TradeService.execute, decision_rows=rows, state=state, price_lookup=snapshot.prices)
+    timed("snapshot", SnapshotService.create, portfolio_id=state["portfolio_id"], price_lookup=snapshot.prices)
+
+    actions = [d.action.upper() for d in response.decisions]
+    return timings, actions.count("BUY"), actions.count("SELL"), state["total_value"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated LLM latency per call")
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=settings.mock_llm_seed)
+    parser.add_argument("--top-n", type=int, default=10, help="screener candidates per run")
+    parser.add_argument("--sharded", action="store_true", help="evaluate candidates in mock shards")
+    parser.add_argument("--verbose", action="store_true", help="keep the stages' own log output")
+    args = parser.parse_args()
+
+    settings.llm_backend = "mock"
+    settings.mock_llm_seed = args.seed
+    settings.mock_llm_latency_ms = args.latency_ms
+    settings.mock_llm_latency_jitter_ms = args.jitter_ms
+
+    market = SyntheticMarket(NIFTY_50, seed=args.seed)
+    spec = ScreenerSpec(min_abs_change_pct=1.5, top_n=args.top_n)
+
+    timings = {stage: [] for stage in STAGES}
+    buys = sells = 0
+    total_value = None
+
+    devnull = open(os.devnull, "w")
+    start = time.perf_counter()
+    for _ in range(args.runs):
+        with contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(devnull):
+            run_timings, run_buys, run_sells, total_value = run_once(market, spec, args.sharded)
+        for stage, seconds in run_timings.items():
+            timings[stage].append(seconds)
+        buys += run_buys
+        sells += run_sells
+    elapsed = time.perf_counter() - start
+    devnull.close()
+
+    print()
+    print(
+        f"{args.runs} runs, seed {args.seed}, LLM latency {args.latency_ms:.0f}±{args.jitter_ms:.0f}ms, "
+        f"{'sharded' if args.sharded else 'single call'}, top {args.top_n} candidates"
+    )
+    print(f"{'stage':>12} {'mean ms':>9} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'share':>6}")
+    stage_total = sum(sum(values) for values in timings.values())
+    for stage in STAGES:
+        ms = np.array(timings[stage]) * 1000
+        print(
+            f"{stage:>12} {ms.mean():>9.2f} {np.percentile(ms, 50):>8.2f} {np.percentile(ms, 95):>8.2f} "
+            f"{ms.max():>8.2f} {ms.sum() / 1000 / stage_total:>6.1%}"
+        )
+    print(f"{args.runs / elapsed:.1f} runs/s, {buys} BUYs, {sells} SELLs, last portfolio value {total_value:,.2f}")
+
+
+if __name__ == "__main__":
+    main()
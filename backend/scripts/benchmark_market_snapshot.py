@@ -0,0 +1,102 @@
+"""
+Benchmark the vectorized market snapshot against the legacy per-symbol loop.
+
+Builds synthetic yfinance-shaped (ticker, field) frames with a few gaps and
+short histories, checks both paths agree, then times them at several
+universe sizes.
+
+    poetry run python scripts/benchmark_market_snapshot.py
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from investment_engine.services.data_sources.bar_store import FIELDS
+from investment_engine.services.data_sources.market_snapshot import compute_snapshot
+
+UNIVERSE_SIZES = [50, 500, 2000]
+ROUNDS = 5
+
+
+def legacy_snapshot(data, symbols):
+    """The original per-symbol loop from MarketDataClient.get_market_snapshot."""
+    snapshot = []
+    for symbol in symbols:
+        ticker_key = f"{symbol}.NS"
+        try:
+            df = data[ticker_key].dropna().tail(3)
+            if len(df) < 3:
+                continue
+
+            curr_row = df.iloc[-1]
+            prev_row = df.iloc[-2]
+            prev_prev_row = df.iloc[-3]
+
+            current_close = float(curr_row['Close'])
+            prev_close = float(prev_row['Close'])
+            daily_change_pct = ((current_close - prev_close) / prev_close) * 100
+
+            snapshot.append({
+                "symbol": symbol,
+                "current_price": current_close,
+                "daily_change_pct": round(daily_change_pct, 2),
+                "volume": int(curr_row['Volume']),
+                "open": float(curr_row['Open']),
+                "high": float(curr_row['High']),
+                "low": float(curr_row['Low']),
+                "prev_close": prev_close,
+                "prev_open": float(prev_row['Open']),
+                "prev_prev_close": float(prev_prev_row['Close']),
+                "prev_prev_open": float(prev_prev_row['Open']),
+            })
+        except KeyError:
+            continue
+    return snapshot
+
+
+def make_frame(n_symbols: int, n_rows: int = 4, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    symbols = [f"SYM{i:04d}" for i in range(n_symbols)]
+    columns = pd.MultiIndex.from_product([[f"{s}.NS" for s in symbols], FIELDS])
+    index = pd.bdate_range(end="2026-01-30", periods=n_rows)
+
+    values = rng.uniform(100, 3000, size=(n_rows, len(columns)))
+    values[:, 4::5] = rng.integers(10_000, 5_000_000, size=(n_rows, n_symbols))
+    # Sprinkle missing values: holidays, halted symbols, partial rows
+    values[rng.random(values.shape) < 0.02] = np.nan
+
+    return pd.DataFrame(values, index=index, columns=columns), symbols
+
+
+def best_of(fn, rounds: int = ROUNDS) -> float:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    print(f"{'symbols':>8} {'legacy (ms)':>12} {'vectorized (ms)':>16} {'speedup':>8}")
+
+    for n_symbols in UNIVERSE_SIZES:
+        data, symbols = make_frame(n_symbols)
+
+        # Both paths must agree before timing them
+        expected = pd.DataFrame(legacy_snapshot(data, symbols))
+        actual = compute_snapshot(data, symbols)
+        pd.testing.assert_frame_equal(expected, actual[expected.columns], check_dtype=False)
+
+        legacy_s = best_of(lambda: legacy_snapshot(data, symbols))
+        vectorized_s = best_of(lambda: compute_snapshot(data, symbols))
+
+        print(
+            f"{n_symbols:>8} {legacy_s * 1000:>12.1f} {vectorized_s * 1000:>16.1f} "
+            f"{legacy_s / vectorized_s:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
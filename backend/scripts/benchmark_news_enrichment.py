@@ -0,0 +1,85 @@
+"""
+Benchmark news enrichment against the local MarketAux stub.
+
+Starts scripts/marketaux_stub.py in-process, then runs the enrich_candidates
+task at 10, 100 and 1000 candidates in both fetch modes and reports wall
+time, requests sent, and how many candidates got news. The Postgres news
+cache and daily quota are bypassed so only the fetch path is measured.
+
+    poetry run python scripts/benchmark_news_enrichment.py --latency-ms 150 --rate-429 0.02
+"""
+import argparse
+import time
+
+from marketaux_stub import StubConfig, start_stub
+
+from investment_engine.services.rate_limiter import get_rate_limiter
+from investment_engine.settings import settings
+from investment_engine.workflows.tasks.external.enrich_stock_candidates import enrich_candidates
+
+CANDIDATE_COUNTS = [10, 100, 1000]
+FETCH_MODES = ["per_symbol", "batched"]
+
+
+def configure(args, base_url: str) -> None:
+    settings.market_aux_api_key = "stub"
+    settings.market_aux_base_url = base_url
+    settings.news_fetch_max_concurrency = args.concurrency
+    settings.news_enrichment_deadline_seconds = args.deadline
+    settings.news_batch_size = args.batch_size
+    settings.marketaux_rate_per_second = args.rate_per_second
+    settings.marketaux_burst = args.concurrency
+    settings.marketaux_daily_quota = None
+    # Limiters are built once from settings; rebuild with the values above
+    get_rate_limiter.cache_clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--rate-5xx", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=settings.news_fetch_max_concurrency)
+    parser.add_argument("--batch-size", type=int, default=settings.news_batch_size)
+    parser.add_argument("--deadline", type=float, default=120.0)
+    parser.add_argument("--rate-per-second", type=float, default=1000.0, help="MarketAux limiter rate")
+    args = parser.parse_args()
+
+    server, stats = start_stub(config=StubConfig(
+        latency_ms=args.latency_ms,
+        rate_429=args.rate_429,
+        rate_5xx=args.rate_5xx,
+    ))
+    configure(args, f"http://127.0.0.1:{server.server_port}/v1")
+
+    results = []
+    for n_candidates in CANDIDATE_COUNTS:
+        candidates = [{"symbol": f"SYM{i:04d}"} for i in range(n_candidates)]
+        for mode in FETCH_MODES:
+            settings.news_fetch_mode = mode
+            stats.reset()
+
+            start = time.perf_counter()
+            enriched = enrich_candidates.fn(candidates, use_cache=False)
+            seconds = time.perf_counter() - start
+
+            with_news = sum(1 for stock in enriched if stock["has_news_context"])
+            results.append((n_candidates, mode, seconds, stats.requests, stats.counts.get(429, 0), with_news))
+
+    server.shutdown()
+
+    print()
+    print(
+        f"latency {args.latency_ms:.0f}ms, concurrency {args.concurrency}, batch size {args.batch_size}, "
+        f"429 rate {args.rate_429:.0%}, 5xx rate {args.rate_5xx:.0%}"
+    )
+    print(f"{'candidates':>10} {'mode':>11} {'seconds':>8} {'cand/s':>8} {'requests':>9} {'429s':>5} {'with news':>10}")
+    for n_candidates, mode, seconds, requests, throttled, with_news in results:
+        print(
+            f"{n_candidates:>10} {mode:>11} {seconds:>8.2f} {n_candidates / seconds:>8.1f} "
+            f"{requests:>9} {throttled:>5} {with_news:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark the Reddit sentiment ingester on a synthetic stream.
+
+Generates posts and comments mentioning NIFTY 50 symbols on the fly (never
+materialized as a list), feeds them through RedditSentimentIngester and
+reports throughput and peak Python memory. Peak memory should stay flat as
+the stream grows, since the aggregates are fixed-size.
+
+    poetry run python scripts/benchmark_reddit_ingest.py
+"""
+import random
+import time
+import tracemalloc
+from typing import Iterator, List
+
+from investment_engine.services.data_sources.reddit_client import (
+    LEXICON,
+    FixtureRedditSource,
+    RedditItem,
+    RedditSentimentIngester,
+    RedditSource,
+)
+from investment_engine.settings import settings
+from investment_engine.workflows.utils.nifty_50 import NIFTY_50
+
+STREAM_SIZES = [10_000, 100_000, 1_000_000]
+TEXT_POOL_SIZE = 1_000
+FILLER = "the market today was something else and i think we will see more of this soon".split()
+
+
+class SyntheticRedditSource(RedditSource):
+
+    name = "synthetic"
+
+    def __init__(self, n_items: int, span_hours: float = 48.0, seed: int = 11):
+        self.n_items = n_items
+        self.span_seconds = span_hours * 3600
+        self.seed = seed
+
+    def _texts(self, rng: random.Random) -> List[str]:
+        words = list(LEXICON)
+        texts = []
+        for _ in range(TEXT_POOL_SIZE):
+            parts = rng.sample(FILLER, 8) + rng.sample(words, 2)
+            # Most items mention one symbol, some several, some none
+            parts += rng.sample(NIFTY_50, rng.choice([0, 1, 1, 1, 2]))
+            rng.shuffle(parts)
+            texts.append(" ".join(parts))
+        return texts
+
+    def stream(self) -> Iterator[RedditItem]:
+        rng = random.Random(self.seed)
+        # A fixed pool of texts keeps generation cost out of the measurement
+        texts = self._texts(rng)
+        now = time.time()
+        for i in range(self.n_items):
+            yield RedditItem(
+                id=str(i),
+                kind="comment" if i % 4 else "post",
+                created_utc=now - rng.random() * self.span_seconds,
+                text=texts[i % TEXT_POOL_SIZE],
+            )
+
+
+def main():
+    # Sanity check on the bundled fixture first
+    ingester = RedditSentimentIngester()
+    ingester.ingest(FixtureRedditSource(settings.reddit_fixture_path))
+    top = sorted(ingester.aggregates().items(), key=lambda kv: -kv[1]["mentions"])[:5]
+    print(f"Fixture: {ingester.items_read} items, top mentions: " + ", ".join(
+        f"{symbol} {agg['mentions']} ({agg['avg_sentiment']:+.2f})" for symbol, agg in top
+    ))
+    print()
+
+    print(f"{'items':>10} {'seconds':>8} {'items/s':>10} {'matched':>9} {'peak KiB':>9}")
+    for n_items in STREAM_SIZES:
+        ingester = RedditSentimentIngester()
+        source = SyntheticRedditSource(n_items)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        ingester.ingest(source)
+        aggregates = ingester.aggregates()
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert sum(a["mentions"] for a in aggregates.values()) > 0
+        print(
+            f"{n_items:>10} {seconds:>8.2f} {n_items / seconds:>10.0f} "
+            f"{ingester.items_matched:>9} {peak / 1024:>9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Local stand-in for the MarketAux `/news/all` endpoint.
+
+Serves synthetic articles in the shape MarketAuxClient consumes (data,
+entities, meta) with configurable latency and injected 429 / 5xx errors,
+so news enrichment can be load- and failure-tested offline.
+
+    poetry run python scripts/marketaux_stub.py --port 8765 --latency-ms 150 --rate-429 0.05
+
+Then point the app at it:
+
+    MARKET_AUX_BASE_URL=http://127.0.0.1:8765/v1
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+SOURCES = ["economictimes.indiatimes.com", "livemint.com", "moneycontrol.com", "business-standard.com"]
+MARKET_STORIES = [
+    "RBI keeps repo rate unchanged, signals extended pause",
+    "Sensex, Nifty end higher as banks and IT stocks rally",
+    "FPIs turn net buyers of Indian equities this week",
+    "Budget push on capex lifts infrastructure stocks",
+]
+
+
+@dataclass
+class StubConfig:
+    latency_ms: float = 100.0
+    jitter_ms: float = 50.0
+    rate_429: float = 0.0
+    rate_5xx: float = 0.0
+    retry_after_seconds: int = 1
+    max_limit: int = 3               # Free tier returns at most 3 articles per call
+    articles_per_symbol: int = 5
+    market_story_ratio: float = 0.3  # Chance a symbol is tagged on each market-wide story
+    seed: int = 7
+
+
+class StubStats:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts: Dict[int, int] = {}
+
+    def record(self, status: int) -> None:
+        with self._lock:
+            self.counts[status] = self.counts.get(status, 0) + 1
+
+    @property
+    def requests(self) -> int:
+        return sum(self.counts.values())
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counts.clear()
+
+
+def _symbol_articles(symbol: str, config: StubConfig) -> List[dict]:
+    """Deterministic per-symbol articles plus the market-wide stories it is tagged on."""
+    rng = random.Random(f"{config.seed}:{symbol}")
+    now = datetime.utcnow().replace(microsecond=0)
+    articles = []
+
+    for i in range(config.articles_per_symbol):
+        published_at = now - timedelta(hours=rng.randint(1, 24 * 13))
+        articles.append({
+            "uuid": hashlib.md5(f"{symbol}:{i}".encode()).hexdigest(),
+            "title": f"{symbol.split('.')[0]} {rng.choice(['shares gain', 'slips', 'reports quarterly results', 'announces buyback', 'wins large order'])} ({i})",
+            "description": f"Synthetic article {i} about {symbol}.",
+            "url": f"https://{rng.choice(SOURCES)}/markets/{symbol.lower()}/{i}",
+            "published_at": published_at.strftime("%Y-%m-%dT%H:%M:%S.000000Z"),
+            "source": rng.choice(SOURCES),
+            "entities": [{"symbol": symbol, "match_score": round(rng.uniform(20, 100), 2)}],
+        })
+
+    for i, title in enumerate(MARKET_STORIES):
+        if rng.random() < config.market_story_ratio:
+            articles.append({
+                "uuid": hashlib.md5(f"market:{i}".encode()).hexdigest(),
+                "title": title,
+                "description": "Synthetic market-wide story.",
+                "url": f"https://{SOURCES[i % len(SOURCES)]}/markets/story-{i}",
+                "published_at": (now - timedelta(hours=3 * (i + 1))).strftime("%Y-%m-%dT%H:%M:%S.000000Z"),
+                "source": SOURCES[i % len(SOURCES)],
+                "entities": [{"symbol": symbol, "match_score": 35.0}],
+            })
+    return articles
+
+
+def search_news(symbols: List[str], published_after: Optional[str], config: StubConfig) -> List[dict]:
+    """All matching articles, newest first; a story shared by several symbols is merged once."""
+    cutoff = datetime.fromisoformat(published_after) if published_after else None
+    merged: Dict[str, dict] = {}
+    for symbol in symbols:
+        for article in _symbol_articles(symbol, config):
+            if cutoff and datetime.fromisoformat(article["published_at"].rstrip("Z")) <= cutoff:
+                continue
+            if article["uuid"] in merged:
+                merged[article["uuid"]]["entities"].extend(article["entities"])
+            else:
+                merged[article["uuid"]] = {**article, "entities": list(article["entities"])}
+    return sorted(merged.values(), key=lambda a: a["published_at"], reverse=True)
+
+
+def make_handler(config: StubConfig, stats: StubStats, rng: random.Random):
+    rng_lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, status: int, body: dict, headers: Optional[Dict[str, str]] = None) -> None:
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+            stats.record(status)
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            if not parts.path.rstrip("/").endswith("/news/all"):
+                return self._send(404, {"error": {"code": "endpoint_not_found"}})
+
+            params = {key: values[0] for key, values in parse_qs(parts.query).items()}
+            if not params.get("api_token"):
+                return self._send(401, {"error": {"code": "invalid_api_token"}})
+
+            with rng_lock:
+                delay = max(config.latency_ms + rng.uniform(-config.jitter_ms, config.jitter_ms), 0) / 1000
+                roll = rng.random()
+            time.sleep(delay)
+
+            if roll < config.rate_429:
+                return self._send(
+                    429,
+                    {"error": {"code": "rate_limit_reached"}},
+                    {"Retry-After": str(config.retry_after_seconds)},
+                )
+            if roll < config.rate_429 + config.rate_5xx:
+                return self._send(503, {"error": {"code": "service_unavailable"}})
+
+            symbols = [s for s in params.get("symbols", "").split(",") if s]
+            limit = min(int(params.get("limit", config.max_limit)), config.max_limit)
+            page = max(int(params.get("page", 1)), 1)
+
+            found = search_news(symbols, params.get("published_after"), config)
+            data = found[(page - 1) * limit:page * limit]
+            self._send(200, {
+                "meta": {"found": len(found), "returned": len(data), "limit": limit, "page": page},
+                "data": data,
+            })
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def start_stub(host: str = "127.0.0.1", port: int = 0, config: Optional[StubConfig] = None) -> Tuple[ThreadingHTTPServer, StubStats]:
+    """Run the stub on a daemon thread; returns (server, stats). Port 0 picks a free port."""
+    config = config or StubConfig()
+    stats = StubStats()
+    server = ThreadingHTTPServer((host, port), make_handler(config, stats, random.Random(config.seed)))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="marketaux-stub", daemon=True).start()
+    return server, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=StubConfig.latency_ms)
+    parser.add_argument("--jitter-ms", type=float, default=StubConfig.jitter_ms)
+    parser.add_argument("--rate-429", type=float, default=StubConfig.rate_429, help="fraction of requests answered 429")
+    parser.add_argument("--rate-5xx", type=float, default=StubConfig.rate_5xx, help="fraction of requests answered 503")
+    parser.add_argument("--retry-after", type=int, default=StubConfig.retry_after_seconds)
+    parser.add_argument("--max-limit", type=int, default=StubConfig.max_limit)
+    parser.add_argument("--articles-per-symbol", type=int, default=StubConfig.articles_per_symbol)
+    args = parser.parse_args()
+
+    config = StubConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_429=args.rate_429,
+        rate_5xx=args.rate_5xx,
+        retry_after_seconds=args.retry_after,
+        max_limit=args.max_limit,
+        articles_per_symbol=args.articles_per_symbol,
+    )
+    server, stats = start_stub(args.host, args.port, config)
+    print(f"MarketAux stub listening on http://{args.host}:{server.server_port}/v1 (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print(f"Served {stats.requests} requests: {stats.counts}")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""
+Record live daily bars for the replay market data provider.
+
+Downloads `bar_store_backfill_days` of NIFTY 50 history from Yahoo Finance
+into `market_replay_dir`. Afterwards set MARKET_DATA_PROVIDER=replay to run
+the flow and the API against the recording without network access.
+
+    poetry run python scripts/record_market_bars.py
+"""
+from datetime import datetime, timedelta
+
+from investment_engine.services.data_sources.bar_store import BarStore
+from investment_engine.services.data_sources.market_providers import YFinanceProvider
+from investment_engine.settings import settings
+from investment_engine.workflows.utils.nifty_50 import NIFTY_50
+
+
+def main():
+    tickers = [f"{s}.NS" for s in NIFTY_50]
+    start = datetime.utcnow() - timedelta(days=settings.bar_store_backfill_days)
+
+    print(f"Recording bars since {start:%Y-%m-%d} for {len(tickers)} symbols into {settings.market_replay_dir}")
+    data = YFinanceProvider().download(tickers, start)
+    BarStore(settings.market_replay_dir).write(data, tickers)
+    print("Recording complete")
+
+
+if __name__ == "__main__":
+    main()
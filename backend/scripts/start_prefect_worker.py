@@ -4,13 +4,44 @@ Start Prefect worker
 import os
 import subprocess
 
+from investment_engine.services.llm.decision_ensemble import parse_members
+from investment_engine.services.llm.local_llm import LocalLLMBackend, LocalLLMError
+from investment_engine.settings import settings
+
+
+def ollama_models():
+    """Ollama models the worker's flows will call: the backend's, plus ensemble members when enabled."""
+    models = []
+    if settings.llm_backend == "ollama":
+        models.append(settings.ollama_model)
+    if settings.llm_ensemble_enabled:
+        models += [m.model for m in parse_members(settings.llm_ensemble_members) if m.backend == "ollama"]
+    return list(dict.fromkeys(models))
+
+
+def warm_up_local_llm():
+    """Load the Ollama models before the first flow run so it doesn't pay the load time."""
+    if not settings.ollama_warm_up_on_worker_start:
+        return
+    for model in ollama_models():
+        print(f"Warming up Ollama model {model} (keep_alive {settings.ollama_keep_alive})")
+        try:
+            load_seconds = LocalLLMBackend.warm_up(model)
+            print(f"Model ready, loaded in {load_seconds:.1f}s")
+        except LocalLLMError as e:
+            print(f"ERROR: {e}")
+            print(f"Decision runs using {model} will fail until the Ollama server is reachable.")
+
+
 def main():
     os.environ["PREFECT_API_URL"] = "http://127.0.0.1:4200/api"
 
+    warm_up_local_llm()
+
     print("Starting Prefect Worker")
     print("Connecting to  http://127.0.0.1:4200")
 
     subprocess.run(["prefect", "worker", "start", "--pool", "default-agent-pool"])
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
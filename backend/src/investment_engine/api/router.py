@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from investment_engine.api.routers import health, portfolio, decisions, trades
+from investment_engine.api.routers import health, portfolio, decisions, trades, llm
 
 router = APIRouter()
 
@@ -7,3 +7,4 @@ router.include_router(health.router)
 router.include_router(portfolio.router)
 router.include_router(decisions.router)
 router.include_router(trades.router)
+router.include_router(llm.router)
@@ -1,7 +1,19 @@
 from fastapi import APIRouter
 
+from investment_engine.services.rate_limiter import rate_limiter_states
+
 router = APIRouter()
 
 @router.get("/api/health")
 async def health_check():   
     return {"status": "ok"}
+
+
+@router.get("/api/health/rate-limits")
+def rate_limits():
+    """
+    Token bucket, backoff and daily quota state per external API provider,
+    for tuning concurrency against provider limits. A plain def: the quota
+    lookup is a synchronous Postgres query, so FastAPI runs it in the threadpool.
+    """
+    return rate_limiter_states()
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+
+from investment_engine.services.llm.telemetry import LLMTelemetryService
+
+router = APIRouter(
+    prefix="/api/llm",
+    tags=["llm"]
+)
+
+
+@router.get("/telemetry")
+async def get_llm_telemetry(
+    days: int = Query(14, ge=1, le=365, description="Look-back window in days"),
+    model: Optional[str] = None
+):
+    """
+    p50/p95 latency, token averages, retries and estimated cost of
+    DecisionEngine calls, overall, per model and per day
+    """
+    try:
+        return LLMTelemetryService.summary(days=days, model=model)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
@@ -1,10 +1,16 @@
-from fastapi import APIRouter, HTTPException, Query
+import asyncio
+import json
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from typing import Optional
 
 from investment_engine.services.portfolio_service import PortfolioService
-from investment_engine.services.data_sources.market_client import MarketDataClient
+from investment_engine.services.price_cache_service import PriceCacheService
+from investment_engine.services.price_stream_service import PriceStreamService
+from investment_engine.settings import settings
 from investment_engine.services.portfolio_validation_service import PortfolioValidationService
-from investment_engine.workflows.utils.nifty_50 import NIFTY_50
 from investment_engine.schemas.portfolio import (
     PortfolioState, 
     PortfolioValueHistory, 
@@ -25,24 +31,71 @@ async def get_current_portfolio(
     """Get current portfolio state with optional real-time market valuation"""
     try:
         current_prices = None
+        prices_as_of = None
         if real_time:
             try:
-                # Fetch current market prices for real-time valuation
-                market_data = MarketDataClient.get_market_snapshot(NIFTY_50)
-                current_prices = {
-                    stock["symbol"]: stock["current_price"] 
-                    for stock in market_data
-                }
+                # Cached market prices; only a cold cache waits on the network,
+                # and that wait happens off the event loop
+                current_prices, prices_as_of = await run_in_threadpool(PriceCacheService.get_prices)
             except Exception as e:
                 # If market data fetch fails, fall back to snapshot prices
                 print(f"Warning: Could not fetch real-time prices, using snapshot prices: {e}")
         
-        return PortfolioService.get_current_portfolio_state(portfolio_id, current_prices)
+        # Valuation queries Postgres synchronously; keep it off the event loop too
+        return await run_in_threadpool(
+            PortfolioService.get_current_portfolio_state,
+            portfolio_id,
+            current_prices,
+            market_data_timestamp=prices_as_of,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@router.get("/stream")
+async def stream_portfolio(request: Request):
+    """
+    Server-Sent Events stream of live portfolio valuation.
+
+    Sends a full `portfolio` event on connect (and whenever positions change),
+    then `update` events carrying only the repriced positions and new totals.
+    """
+    try:
+        initial_state = await PriceStreamService.current_state()
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+    queue = PriceStreamService.subscribe()
+
+    def format_event(event: str, payload: dict) -> str:
+        return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+    async def event_stream():
+        try:
+            yield format_event("portfolio", initial_state.model_dump(mode="json"))
+            while not await request.is_disconnected():
+                try:
+                    event, payload = await asyncio.wait_for(
+                        queue.get(), timeout=settings.price_stream_keepalive_seconds
+                    )
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_event(event, payload)
+        finally:
+            PriceStreamService.unsubscribe(queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 
 @router.get("/value-history", response_model=PortfolioValueHistory)
 async def get_portfolio_value_history(
@@ -118,15 +171,15 @@ async def get_portfolio():
     try:
         # Use real-time prices for legacy endpoint too
         try:
-            market_data = MarketDataClient.get_market_snapshot(NIFTY_50)
-            current_prices = {
-                stock["symbol"]: stock["current_price"] 
-                for stock in market_data
-            }
+            current_prices, prices_as_of = await run_in_threadpool(PriceCacheService.get_prices)
         except Exception:
-            current_prices = None
+            current_prices, prices_as_of = None, None
             
-        portfolio_state = PortfolioService.get_current_portfolio_state(current_prices=current_prices)
+        portfolio_state = await run_in_threadpool(
+            PortfolioService.get_current_portfolio_state,
+            current_prices=current_prices,
+            market_data_timestamp=prices_as_of,
+        )
         return {
             "total_value": portfolio_state.current_value,
             "cash": portfolio_state.cash_balance,
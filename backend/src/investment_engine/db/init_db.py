@@ -1,3 +1,5 @@
+from sqlalchemy import text
+
 from investment_engine.db.base import Base
 from investment_engine.db.session import engine
 
@@ -8,14 +10,35 @@ import investment_engine.db.models.decisions
 import investment_engine.db.models.portfolio_snapshots
 import investment_engine.db.models.position_snapshots
 import investment_engine.db.models.experiments
+import investment_engine.db.models.news_articles
+import investment_engine.db.models.api_quota_usage
+import investment_engine.db.models.llm_response_cache
+import investment_engine.db.models.llm_calls
 
 import investment_engine.db.models
 
+# create_all only creates missing tables; columns added to existing tables
+# since the first release are listed here as (table, column, DDL type, indexed)
+ADDED_COLUMNS = [
+    ("decisions", "llm_call_id", "INTEGER REFERENCES llm_calls(id)", True),
+    ("decisions", "ensemble_stats", "JSON", False),
+]
+
+
+def add_missing_columns():
+    with engine.begin() as conn:
+        for table, column, ddl, indexed in ADDED_COLUMNS:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {column} {ddl}"))
+            if indexed:
+                conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{table}_{column} ON {table} ({column})"))
+
+
 """
     - Run this file to initialize tables in postgres
 """
 def init_db():
     Base.metadata.create_all(bind=engine)
+    add_missing_columns()
     print("Tables created successfully 🚀")
 
 
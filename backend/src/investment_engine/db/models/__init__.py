@@ -14,6 +14,10 @@ from .portfolio_snapshots import PortfolioSnapshot  # noqa: F401
 from .position_snapshots import PositionSnapshot  # noqa: F401
 from .decisions import Decision  # noqa: F401
 from .experiments import Experiment  # noqa: F401
+from .news_articles import NewsArticle, NewsFetchState  # noqa: F401
+from .api_quota_usage import ApiQuotaUsage  # noqa: F401
+from .llm_response_cache import LLMResponseCache  # noqa: F401
+from .llm_calls import LLMCall  # noqa: F401
 
 __all__ = [
     "Portfolio",
@@ -22,5 +26,10 @@ __all__ = [
     "PositionSnapshot",
     "Decision",
     "Experiment",
+    "NewsArticle",
+    "NewsFetchState",
+    "ApiQuotaUsage",
+    "LLMResponseCache",
+    "LLMCall",
 ]
 
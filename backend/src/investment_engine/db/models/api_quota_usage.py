@@ -0,0 +1,21 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Date, DateTime, Integer, String
+from datetime import date, datetime
+
+from investment_engine.db.base import Base
+
+
+class ApiQuotaUsage(Base):
+    """Requests made to an external API on one (UTC) day."""
+
+    __tablename__ = "api_quota_usage"
+
+    provider: Mapped[str] = mapped_column(String(50), primary_key=True)
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+
+    used: Mapped[int] = mapped_column(Integer, default=0)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow
+    )
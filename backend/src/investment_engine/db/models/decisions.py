@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, DateTime, ForeignKey, Numeric, Text
+from sqlalchemy import JSON, String, DateTime, ForeignKey, Numeric, Text
 from datetime import datetime
 
 from investment_engine.db.base import Base
@@ -24,6 +24,14 @@ class Decision(Base):
 
     model_used: Mapped[str] = mapped_column(String(50))
 
+    # LLM call that produced this decision (telemetry); added to existing tables by init_db
+    llm_call_id: Mapped[int] = mapped_column(
+        ForeignKey("llm_calls.id"), index=True, nullable=True
+    )
+
+    # Ensemble mode: every model's vote, agreement and who timed out
+    ensemble_stats: Mapped[dict] = mapped_column(JSON, nullable=True)
+
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow
     )
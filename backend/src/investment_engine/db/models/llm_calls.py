@@ -0,0 +1,40 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import DateTime, Float, Integer, Numeric, String, Text
+from datetime import datetime
+
+from investment_engine.db.base import Base
+
+
+class LLMCall(Base):
+    """One DecisionEngine call: tokens, latency, retries and cost. Decisions link back via llm_call_id."""
+
+    __tablename__ = "llm_calls"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    backend: Mapped[str] = mapped_column(String(20))      # openai, ollama
+
+    model: Mapped[str] = mapped_column(String(50), index=True)
+
+    # ok, error, or response_cache_hit (answered from llm_response_cache, no API call)
+    status: Mapped[str] = mapped_column(String(20))
+
+    candidates: Mapped[int] = mapped_column(Integer, default=0)
+
+    prompt_tokens: Mapped[int] = mapped_column(Integer, default=0)
+
+    cached_tokens: Mapped[int] = mapped_column(Integer, default=0)
+
+    completion_tokens: Mapped[int] = mapped_column(Integer, default=0)
+
+    latency_ms: Mapped[float] = mapped_column(Float)
+
+    retries: Mapped[int] = mapped_column(Integer, default=0)
+
+    cost_usd: Mapped[float] = mapped_column(Numeric(10, 6), default=0)
+
+    error: Mapped[str] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, index=True
+    )
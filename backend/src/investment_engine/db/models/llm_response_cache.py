@@ -0,0 +1,26 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import DateTime, Integer, String, Text
+from datetime import datetime
+
+from investment_engine.db.base import Base
+
+
+class LLMResponseCache(Base):
+    """Parsed LLM response stored under a hash of everything that produced it."""
+
+    __tablename__ = "llm_response_cache"
+
+    # sha256 of model, temperature, response schema and prompts
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+
+    model: Mapped[str] = mapped_column(String(50))
+
+    response: Mapped[str] = mapped_column(Text)
+
+    hits: Mapped[int] = mapped_column(Integer, default=0)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, index=True
+    )
+
+    last_hit_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
@@ -0,0 +1,47 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import DateTime, Index, String, Text, UniqueConstraint
+from datetime import datetime
+from typing import Optional
+
+from investment_engine.db.base import Base
+
+
+class NewsArticle(Base):
+    """Cached MarketAux article for one symbol (one row per symbol + URL)."""
+
+    __tablename__ = "news_articles"
+    __table_args__ = (
+        UniqueConstraint("symbol", "url", name="uq_news_articles_symbol_url"),
+        Index("ix_news_articles_symbol_published_at", "symbol", "published_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    symbol: Mapped[str] = mapped_column(String(20))
+
+    url: Mapped[str] = mapped_column(String(1024))
+
+    title: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    source: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+
+    published_at: Mapped[datetime] = mapped_column(DateTime)
+
+    fetched_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow
+    )
+
+
+class NewsFetchState(Base):
+    """When news was last requested for a symbol, even if nothing new came back."""
+
+    __tablename__ = "news_fetch_state"
+
+    symbol: Mapped[str] = mapped_column(String(20), primary_key=True)
+
+    fetched_at: Mapped[datetime] = mapped_column(DateTime)
+
+    # Newest cached article; the next request only asks for articles after it
+    latest_published_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
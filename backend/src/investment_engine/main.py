@@ -2,6 +2,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from investment_engine.api.router import router
+from investment_engine.services.price_cache_service import PriceCacheService
+from investment_engine.services.price_stream_service import PriceStreamService
 from investment_engine.settings import settings
 
 app = FastAPI()
@@ -25,4 +27,26 @@ async def load_settings() -> None:
     app.state.settings = settings
 
 
+@app.on_event("startup")
+async def warm_price_cache() -> None:
+    """
+    Start filling the price cache so the first dashboard request doesn't
+    wait on a market download.
+    """
+    PriceCacheService.refresh_in_background()
+
+
+@app.on_event("startup")
+async def start_price_stream() -> None:
+    """
+    One background loop revalues the portfolio for all SSE subscribers.
+    """
+    PriceStreamService.start()
+
+
+@app.on_event("shutdown")
+async def stop_price_stream() -> None:
+    await PriceStreamService.stop()
+
+
 app.include_router(router)
\ No newline at end of file
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional
 from pydantic import BaseModel
 
 
@@ -47,5 +47,7 @@ class DecisionDetail(BaseModel):
     reasoning: str
     raw_llm_output: str
     model_used: str
+    llm_call_id: Optional[int] = None
+    ensemble_stats: Optional[Dict[str, Any]] = None
     created_at: datetime
     trade: Optional[TradeExecution] = None
\ No newline at end of file
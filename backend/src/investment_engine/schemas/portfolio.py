@@ -28,6 +28,16 @@ class PortfolioState(BaseModel):
     positions: List[Position]
 
 
+class PortfolioValueUpdate(BaseModel):
+    portfolio_id: int
+    current_value: float
+    equity_value: float
+    unrealized_pnl: float
+    unrealized_pnl_pct: float
+    market_data_timestamp: Optional[datetime] = None
+    positions: List[Position]           # Only positions whose price changed
+
+
 class PortfolioSnapshot(BaseModel):
     date: str
     total_value: float
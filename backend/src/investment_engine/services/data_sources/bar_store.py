@@ -0,0 +1,220 @@
+"""
+Local columnar OHLCV bar store.
+
+Daily bars are kept on disk as one NumPy ``.npz`` file per symbol per year:
+
+    {root}/{TICKER}/{YYYY}.npz      -> date, Open, High, Low, Close, Volume columns
+    {root}/_manifest.json           -> last stored bar date + last fetch time per ticker
+    {root}/_manifest.lock           -> flock held while a writer updates bars + manifest
+
+Reads return the same (ticker, field) MultiIndex frame that
+``yf.download(group_by="ticker")`` produces, so callers don't care whether
+bars came from disk or the network.
+"""
+
+import fcntl
+import json
+import os
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+FIELDS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+class BarStore:
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._manifest_path = self.root / "_manifest.json"
+        self._lock_path = self.root / "_manifest.lock"
+        self._manifest_mtime: Optional[float] = None
+        self._manifest = self._load_manifest()
+
+    # ------------------------------------------------------------------
+    # Manifest
+    # ------------------------------------------------------------------
+
+    def _load_manifest(self) -> Dict[str, Dict[str, str]]:
+        try:
+            self._manifest_mtime = self._manifest_path.stat().st_mtime
+        except FileNotFoundError:
+            self._manifest_mtime = None
+            return {}
+        try:
+            return json.loads(self._manifest_path.read_text())
+        except (OSError, ValueError) as e:
+            print(f"Warning: unreadable bar store manifest, rebuilding: {e}")
+            return {}
+
+    def _refresh_manifest(self) -> None:
+        """Pick up entries another process (API price refresh, a flow run) wrote since we last read."""
+        try:
+            mtime = self._manifest_path.stat().st_mtime
+        except FileNotFoundError:
+            mtime = None
+        if mtime != self._manifest_mtime:
+            self._manifest = self._load_manifest()
+
+    def _save_manifest(self) -> None:
+        tmp_path = self._manifest_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(self._manifest, indent=1, sort_keys=True))
+        os.replace(tmp_path, self._manifest_path)
+        self._manifest_mtime = self._manifest_path.stat().st_mtime
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Exclusive across processes sharing this store; writers re-read the manifest inside it."""
+        with open(self._lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def last_dates(self, tickers: List[str]) -> Dict[str, Optional[pd.Timestamp]]:
+        """Last stored bar date per ticker (None if the ticker has no history)."""
+        self._refresh_manifest()
+        result = {}
+        for ticker in tickers:
+            entry = self._manifest.get(ticker)
+            result[ticker] = pd.Timestamp(entry["last_date"]) if entry and entry.get("last_date") else None
+        return result
+
+    def stale_tickers(self, tickers: List[str], refresh_seconds: int) -> List[str]:
+        """
+        Tickers that have not been fetched within ``refresh_seconds``.
+        The latest stored bar may be an intraday (partial) bar, so history
+        that is merely "up to today" still needs refreshing after a while.
+        """
+        self._refresh_manifest()
+        now = datetime.utcnow()
+        stale = []
+        for ticker in tickers:
+            entry = self._manifest.get(ticker)
+            if not entry or not entry.get("fetched_at"):
+                stale.append(ticker)
+                continue
+            fetched_at = datetime.fromisoformat(entry["fetched_at"])
+            if (now - fetched_at).total_seconds() > refresh_seconds:
+                stale.append(ticker)
+        return stale
+
+    # ------------------------------------------------------------------
+    # Partitions
+    # ------------------------------------------------------------------
+
+    def _partition_path(self, ticker: str, year: int) -> Path:
+        return self.root / ticker / f"{year}.npz"
+
+    def _partition_years(self, ticker: str) -> List[int]:
+        ticker_dir = self.root / ticker
+        if not ticker_dir.exists():
+            return []
+        return sorted(int(p.stem) for p in ticker_dir.glob("*.npz"))
+
+    def _read_partition(self, ticker: str, year: int) -> pd.DataFrame:
+        with np.load(self._partition_path(ticker, year)) as npz:
+            return pd.DataFrame(
+                {field: npz[field] for field in FIELDS},
+                index=pd.DatetimeIndex(npz["date"].astype("datetime64[ns]")),
+            )
+
+    def _write_partition(self, ticker: str, year: int, df: pd.DataFrame) -> None:
+        path = self._partition_path(ticker, year)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".npz.tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                date=df.index.values.astype("datetime64[D]"),
+                **{field: df[field].to_numpy(dtype="float64") for field in FIELDS},
+            )
+        os.replace(tmp_path, path)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def write(self, data: pd.DataFrame, tickers: List[str]) -> None:
+        """
+        Upsert bars from a (ticker, field) MultiIndex frame.
+        Every ticker in ``tickers`` is marked as fetched, even if the
+        download returned no new rows for it.
+
+        Runs under the store lock against a freshly read manifest, so
+        concurrent writers in other processes keep each other's entries.
+        """
+        with self._locked():
+            self._manifest = self._load_manifest()
+            self._write_locked(data, tickers)
+            self._save_manifest()
+
+    def _write_locked(self, data: pd.DataFrame, tickers: List[str]) -> None:
+        fetched_at = datetime.utcnow().isoformat()
+        available = set(data.columns.get_level_values(0)) if not data.empty else set()
+
+        for ticker in tickers:
+            entry = self._manifest.setdefault(ticker, {})
+            entry["fetched_at"] = fetched_at
+
+            if ticker not in available:
+                continue
+
+            bars = data[ticker][FIELDS].dropna(subset=["Close"])
+            if bars.empty:
+                continue
+            bars.index = pd.DatetimeIndex(bars.index).tz_localize(None).normalize()
+
+            for year, new_rows in bars.groupby(bars.index.year):
+                if self._partition_path(ticker, year).exists():
+                    merged = pd.concat([self._read_partition(ticker, year), new_rows])
+                    # Later rows win: refreshes a partial intraday bar
+                    merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+                else:
+                    merged = new_rows.sort_index()
+                self._write_partition(ticker, year, merged)
+
+            last_date = bars.index.max()
+            if not entry.get("last_date") or pd.Timestamp(entry["last_date"]) < last_date:
+                entry["last_date"] = last_date.strftime("%Y-%m-%d")
+
+    def read(
+        self,
+        tickers: List[str],
+        tail: Optional[int] = None,
+        since: Optional[pd.Timestamp] = None,
+    ) -> pd.DataFrame:
+        """
+        Load the last ``tail`` bars (all bars if None) for each ticker as a
+        (ticker, field) MultiIndex frame aligned on date. ``since`` limits
+        the read to bars on or after that date, skipping older partitions.
+        """
+        frames = {}
+        for ticker in tickers:
+            parts = []
+            rows = 0
+            # Walk partitions newest-first so short reads touch one file
+            for year in reversed(self._partition_years(ticker)):
+                if since is not None and year < since.year:
+                    break
+                part = self._read_partition(ticker, year)
+                if since is not None:
+                    part = part[part.index >= since]
+                parts.append(part)
+                rows += len(part)
+                if tail is not None and rows >= tail:
+                    break
+            if not parts:
+                continue
+            df = pd.concat(reversed(parts)).sort_index()
+            frames[ticker] = df.tail(tail) if tail is not None else df
+
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, axis=1)
@@ -1,110 +1,103 @@
-import yfinance as yf
-import pandas as pd
-from typing import List, Dict, Any
+import os
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from investment_engine.services.data_sources.bar_store import BarStore
+from investment_engine.services.data_sources.market_fetch_engine import MarketFetchEngine
+from investment_engine.services.data_sources.market_providers import MarketDataProvider, get_market_provider
+from investment_engine.services.data_sources.market_snapshot import VOLUME_LOOKBACK, MarketSnapshot, compute_snapshot
+from investment_engine.settings import settings
+
 
 class MarketDataClient:
+
+    # Rows per ticker needed for the Today / Yesterday / Day-Before snapshot
+    SNAPSHOT_ROWS = 3
+
+    @staticmethod
+    def bar_store(provider: MarketDataProvider) -> BarStore:
+        """Local bar store for a provider; each provider gets its own directory."""
+        return BarStore(os.path.join(settings.bar_store_dir, provider.name))
+
     @staticmethod
-    def get_market_snapshot(symbols: List[str]) -> List[Dict[str, Any]]:
+    def sync_bar_store(
+        store: BarStore,
+        tickers: List[str],
+        provider: MarketDataProvider,
+        max_age_seconds: Optional[int] = None,
+    ) -> None:
         """
-        Fetches the last 3 trading days of data for the given symbols.
-        Returns a snapshot including Today, Yesterday, and Day-Before metrics.
+        Bring the local bar store up to date for the given tickers.
+
+        Only tickers not fetched within `max_age_seconds` (default
+        `bar_store_refresh_seconds`) hit the provider. Tickers with history
+        are fetched from their last stored date (inclusive, so a partial
+        intraday bar gets replaced); new tickers are backfilled
+        `bar_store_backfill_days` so indicators and backtests have history
+        to work with.
+
+        Downloads are chunked and run concurrently by MarketFetchEngine.
+        Tickers that still fail are left stale so the next call retries them.
         """
+        if max_age_seconds is None:
+            max_age_seconds = settings.bar_store_refresh_seconds
+
+        stale = store.stale_tickers(tickers, max_age_seconds)
+        if not stale:
+            return
+
+        last_dates = store.last_dates(stale)
+        backfill = [t for t in stale if last_dates[t] is None]
+        incremental = [t for t in stale if last_dates[t] is not None]
+
+        # (tickers, start, rows a ticker must return to count as fetched)
+        batches = []
+        if backfill:
+            start = datetime.utcnow() - timedelta(days=settings.bar_store_backfill_days)
+            batches.append((backfill, start, MarketDataClient.SNAPSHOT_ROWS))
+        if incremental:
+            batches.append((incremental, min(last_dates[t] for t in incremental), 1))
+
+        engine = MarketFetchEngine(provider)
+        for batch, start, min_rows in batches:
+            print(f"Fetching bars since {start:%Y-%m-%d} for {len(batch)} symbols...")
+            result = engine.fetch(batch, start, min_rows=min_rows)
+
+            # Failed tickers keep serving whatever history is already on disk
+            failed = set(result.failed)
+            store.write(result.data, [t for t in batch if t not in failed])
+
+    @staticmethod
+    def get_market_snapshot(
+        symbols: List[str],
+        max_age_seconds: Optional[int] = None,
+        provider: Optional[MarketDataProvider] = None,
+    ) -> MarketSnapshot:
+        """
+        Reads the last 3 trading days of data for the given symbols from the
+        local bar store, fetching only the bars missing since the last run.
+        Returns a columnar snapshot including Today, Yesterday, and
+        Day-Before metrics.
+
+        `provider` defaults to the one configured by `market_data_provider`.
+        """
+        provider = provider or get_market_provider()
+
         # 1. Add .NS suffix for NSE India
         tickers = [f"{s}.NS" for s in symbols]
-        
-        # 2. Batch Download
-        # We fetch "4d" to safely get 3 valid trading rows
-        print(f"Fetching 3-day history for {len(tickers)} symbols...")
-        try:
-            data = yf.download(
-                tickers, 
-                period="4d", 
-                group_by='ticker', 
-                threads=True,
-                progress=False
-            )
-        except Exception as e:
-            print(f"Critical Error downloading market data: {e}")
-            return []
-        
-        snapshot = []
-        
-        for symbol in symbols:
-            ticker_key = f"{symbol}.NS"
-            try:
-                # 3. Extract DataFrame for this ticker
-                # .tail(3) gives us [Day-Before, Yesterday, Today]
-                df = data[ticker_key].dropna().tail(3)
-                
-                # Safety Check: Need at least 3 rows to calculate 3-day context
-                if len(df) < 3:
-                    print(f"Insufficient data for {symbol} (rows={len(df)}), skipping...")
-                    continue
-
-                # 4. Extract Data Points
-                # Row -1 = Today (Current)
-                # Row -2 = Yesterday
-                # Row -3 = Day Before Yesterday
-                
-                curr_row = df.iloc[-1]
-                prev_row = df.iloc[-2]
-                prev_prev_row = df.iloc[-3]
-
-                current_close = float(curr_row['Close'])
-                prev_close = float(prev_row['Close'])
-                
-                # Calculate Daily Change % ((New - Old) / Old) * 100
-                daily_change_pct = ((current_close - prev_close) / prev_close) * 100
-
-                snapshot.append({
-                    "symbol": symbol,
-                    # --- Critical Signals ---
-                    "current_price": current_close,
-                    "daily_change_pct": round(daily_change_pct, 2),
-                    "volume": int(curr_row['Volume']),
-                    
-                    # --- Today's Candle ---
-                    "open": float(curr_row['Open']),
-                    "high": float(curr_row['High']),
-                    "low": float(curr_row['Low']),
-                    
-                    # --- Yesterday's Context (Trend Check) ---
-                    "prev_close": prev_close,
-                    "prev_open": float(prev_row['Open']),
-                    
-                    # --- Day Before Context (Reversal Check) ---
-                    "prev_prev_close": float(prev_prev_row['Close']),
-                    "prev_prev_open": float(prev_prev_row['Open']),
-                })
-                
-            except KeyError:
-                print(f"Data missing for {symbol}")
-                continue
-            except Exception as e:
-                print(f"Error processing {symbol}: {e}")
-                continue
-                
+
+        # 2. Incremental fetch into the local store, then a local read
+        store = MarketDataClient.bar_store(provider)
+        MarketDataClient.sync_bar_store(store, tickers, provider, max_age_seconds)
+        # Extra rows give the snapshot its average-volume baseline
+        data = store.read(tickers, tail=VOLUME_LOOKBACK + 1)
+
+        # 3. Vectorized 3-day metrics for every ticker at once
+        snapshot = compute_snapshot(data, symbols)
+
+        skipped = len(symbols) - len(snapshot)
+        if skipped:
+            print(f"Insufficient or missing data for {skipped} symbols, skipped.")
+
         print(f"Successfully captured snapshot for {len(snapshot)} symbols.")
-        return snapshot
-
-    def filter_candidates(market_snapshot: List[Dict[str, Any]], min_change_pct: float = 1.5, top_n: int = 10) -> List[Dict[str, Any]]:
-        print(f"Filtering {len(market_snapshot)} stocks. Criteria: >{min_change_pct}% move.")
-    
-        candidates = []
-        for stock in market_snapshot:
-            # We care about big moves UP or DOWN (Volatility = Opportunity)
-            if abs(stock['daily_change_pct']) >= min_change_pct:
-                candidates.append(stock)
-                
-        # Sort by absolute change descending (Biggest movers at the top)
-        candidates.sort(key=lambda x: abs(x['daily_change_pct']), reverse=True)
-        
-        # Cap the list to avoid over-processing
-        final_list = candidates[:top_n]
-        
-        # Log results for debugging
-        print(f"Found {len(candidates)} active movers. Returning Top {len(final_list)}.")
-        for c in final_list:
-            print(f"-> {c['symbol']}: {c['daily_change_pct']}% | Price: {c['current_price']}")
-            
-        return final_list
\ No newline at end of file
+        return MarketSnapshot.from_frame(snapshot)
@@ -0,0 +1,140 @@
+"""
+Chunked, concurrent market data fetch engine.
+
+Splits a ticker universe into chunks, downloads the chunks concurrently
+under a bounded worker pool and retries only the tickers that failed or
+came back with too few rows. One slow or failing chunk no longer costs the
+whole run its market data.
+
+How much the chunks actually overlap is up to the provider: the live
+yfinance provider serializes its batched downloads (see YFinanceProvider),
+so there the gain is per-chunk retries and the parallelism inside each
+batch, not concurrent chunks.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+import pandas as pd
+
+from investment_engine.services.data_sources.market_providers import MarketDataProvider
+from investment_engine.settings import settings
+
+
+@dataclass
+class ChunkTiming:
+    chunk: int
+    attempt: int
+    symbols: int
+    # Download time only; time queued behind the rate limiter or other
+    # chunks (see MarketDataProvider.last_wait_seconds) is in wait_seconds
+    seconds: float
+    incomplete: int
+    wait_seconds: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class FetchResult:
+    data: pd.DataFrame
+    timings: List[ChunkTiming] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+
+
+class MarketFetchEngine:
+
+    def __init__(
+        self,
+        provider: MarketDataProvider,
+        chunk_size: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        max_retries: Optional[int] = None,
+    ):
+        self.provider = provider
+        self.chunk_size = chunk_size or settings.market_fetch_chunk_size
+        self.max_workers = max_workers or settings.market_fetch_max_workers
+        self.max_retries = settings.market_fetch_max_retries if max_retries is None else max_retries
+
+    @staticmethod
+    def _complete_tickers(data: Optional[pd.DataFrame], chunk: List[str], min_rows: int) -> List[str]:
+        """Tickers in `chunk` with at least `min_rows` bars that have a close."""
+        if data is None or data.empty:
+            return []
+        closes = data.xs("Close", axis=1, level=1)
+        rows = closes.notna().sum()
+        return [t for t in chunk if rows.get(t, 0) >= min_rows]
+
+    def _download_chunk(self, chunk: List[str], start: datetime):
+        started = time.perf_counter()
+        try:
+            data, error = self.provider.download(chunk, start), None
+        except Exception as e:
+            data, error = None, str(e)
+        elapsed = time.perf_counter() - started
+        wait = min(self.provider.last_wait_seconds(), elapsed)
+        return data, elapsed - wait, wait, error
+
+    def fetch(self, tickers: List[str], start: datetime, min_rows: int = 1) -> FetchResult:
+        """
+        Download bars from `start` for all tickers.
+
+        A ticker counts as fetched once it has `min_rows` bars; everything
+        else is retried (in fresh chunks) up to `max_retries` times. Tickers
+        still incomplete after the last attempt are reported in `failed`.
+        """
+        result = FetchResult(data=pd.DataFrame())
+        frames = []
+        pending = list(tickers)
+
+        for attempt in range(1, self.max_retries + 2):
+            if not pending:
+                break
+            if attempt > 1:
+                time.sleep(settings.market_fetch_retry_backoff_seconds * (attempt - 1))
+                print(f"Retrying {len(pending)} symbols (attempt {attempt})...")
+
+            chunks = [pending[i:i + self.chunk_size] for i in range(0, len(pending), self.chunk_size)]
+            retry = []
+
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as pool:
+                futures = {
+                    pool.submit(self._download_chunk, chunk, start): (number, chunk)
+                    for number, chunk in enumerate(chunks, start=1)
+                }
+                for future in as_completed(futures):
+                    number, chunk = futures[future]
+                    data, seconds, wait, error = future.result()
+
+                    complete = self._complete_tickers(data, chunk, min_rows)
+                    if complete:
+                        frames.append(data[complete])
+                    completed = set(complete)
+                    retry.extend(t for t in chunk if t not in completed)
+
+                    timing = ChunkTiming(
+                        chunk=number,
+                        attempt=attempt,
+                        symbols=len(chunk),
+                        seconds=round(seconds, 3),
+                        incomplete=len(chunk) - len(complete),
+                        wait_seconds=round(wait, 3),
+                        error=error,
+                    )
+                    result.timings.append(timing)
+                    print(
+                        f"Chunk {number}/{len(chunks)} (attempt {attempt}): {len(chunk)} symbols "
+                        f"in {timing.seconds:.2f}s (queued {timing.wait_seconds:.2f}s), {timing.incomplete} incomplete"
+                        + (f" - {error}" if error else "")
+                    )
+
+            pending = retry
+
+        result.failed = pending
+        if frames:
+            result.data = pd.concat(frames, axis=1).sort_index()
+        if result.failed:
+            print(f"Could not fetch {len(result.failed)} symbols: {', '.join(result.failed)}")
+        return result
@@ -0,0 +1,187 @@
+"""
+Market data providers.
+
+A provider turns (tickers, start date) into a yfinance-shaped
+(ticker, field) MultiIndex frame of daily bars. MarketDataClient resolves
+the provider from `settings.market_data_provider`:
+
+    yfinance -> live Yahoo Finance downloads
+    replay   -> recorded bars served from a local bar store directory, with
+                optional simulated latency, for offline benchmarking
+"""
+
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from functools import lru_cache
+from typing import List, Optional
+
+import pandas as pd
+import yfinance as yf
+
+from investment_engine.services.data_sources.bar_store import BarStore, FIELDS
+from investment_engine.services.rate_limiter import RateLimitExceeded, get_rate_limiter
+from investment_engine.settings import settings
+
+
+class MarketDataProvider(ABC):
+
+    # Also namespaces the local bar store, so replayed bars never mix with live ones
+    name: str
+
+    @abstractmethod
+    def download(self, tickers: List[str], start: datetime) -> pd.DataFrame:
+        """Daily bars from `start` (inclusive) up to now for the given tickers."""
+
+    def last_wait_seconds(self) -> float:
+        """
+        How long the calling thread's last download() was queued (rate
+        limiter, locks) before fetching, so callers can time the fetch alone.
+        """
+        return 0.0
+
+
+class _YFinanceErrors(logging.Handler):
+    """Collects the per-ticker failures yf.download logs instead of raising."""
+
+    def __init__(self):
+        super().__init__(level=logging.ERROR)
+        self.messages: List[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append(record.getMessage())
+
+    @property
+    def rate_limited(self) -> bool:
+        return any("rate limit" in m.lower() or "too many requests" in m.lower() for m in self.messages)
+
+
+class YFinanceProvider(MarketDataProvider):
+    """
+    One batched `yf.download` per chunk: yfinance fetches the chunk's
+    tickers on its own threads, and the whole batch takes one token from
+    the "yfinance" rate limiter.
+
+    yf.download keeps per-call state at module level (yfinance 1.1), so
+    batches run one at a time behind a process-wide lock. Live throughput is
+    therefore one chunk at a time, with up to `market_fetch_chunk_size`
+    tickers in flight inside it; MarketFetchEngine's chunk concurrency pays
+    off for the replay provider and for isolating failed chunks, not for
+    parallel Yahoo batches.
+    """
+
+    name = "yfinance"
+
+    # Serializes yf.download across MarketFetchEngine workers
+    _download_lock = threading.Lock()
+    # Per worker thread: time queued on the limiter and _download_lock
+    _waits = threading.local()
+
+    def last_wait_seconds(self) -> float:
+        return getattr(self._waits, "seconds", 0.0)
+
+    def download(self, tickers: List[str], start: datetime) -> pd.DataFrame:
+        queued = time.perf_counter()
+        self._waits.seconds = 0.0
+        limiter = get_rate_limiter("yfinance")
+        try:
+            limiter.acquire()
+        except RateLimitExceeded as e:
+            self._waits.seconds = time.perf_counter() - queued
+            print(f"Skipping {len(tickers)} tickers: {e}")
+            return pd.DataFrame()
+
+        errors = _YFinanceErrors()
+        yf_logger = logging.getLogger("yfinance")
+        with self._download_lock:
+            self._waits.seconds = time.perf_counter() - queued
+            yf_logger.addHandler(errors)
+            try:
+                data = yf.download(
+                    tickers,
+                    start=start.strftime("%Y-%m-%d"),
+                    group_by="ticker",
+                    auto_adjust=True,
+                    threads=True,
+                    progress=False,
+                )
+            except Exception as e:
+                # The whole chunk is retried by the fetch engine
+                print(f"Error downloading {len(tickers)} tickers: {e}")
+                return pd.DataFrame()
+            finally:
+                yf_logger.removeHandler(errors)
+
+        if errors.rate_limited:
+            limiter.report_rate_limited()
+        else:
+            limiter.report_success()
+        if errors.messages:
+            # Failed tickers are left out of the frame; the fetch engine retries them
+            print(f"yfinance errors: {'; '.join(errors.messages)[:500]}")
+
+        if data is None or data.empty:
+            return pd.DataFrame()
+
+        frames = {}
+        for ticker in tickers:
+            if ticker not in data.columns.get_level_values(0):
+                continue
+            history = data[ticker][FIELDS].dropna(subset=["Close"])
+            if history.empty:
+                continue
+            history.index = pd.DatetimeIndex(history.index).tz_localize(None)
+            frames[ticker] = history
+
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, axis=1)
+
+
+class ReplayProvider(MarketDataProvider):
+    """
+    Serves bars recorded with scripts/record_market_bars.py.
+
+    `as_of` pins the replay to a past trading day so repeated runs see
+    identical data; `latency_ms` is slept on every download to stand in for
+    the network.
+    """
+
+    name = "replay"
+
+    def __init__(self, recording_dir: str, latency_ms: int = 0, as_of: Optional[str] = None):
+        self.recording = BarStore(recording_dir)
+        self.latency_ms = latency_ms
+        self.as_of = pd.Timestamp(as_of) if as_of else None
+
+    def download(self, tickers: List[str], start: datetime) -> pd.DataFrame:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+        data = self.recording.read(tickers)
+        if data.empty:
+            return data
+
+        mask = data.index >= pd.Timestamp(start).normalize()
+        if self.as_of is not None:
+            mask &= data.index <= self.as_of
+        return data[mask]
+
+
+@lru_cache(maxsize=None)
+def get_market_provider(name: Optional[str] = None) -> MarketDataProvider:
+    """Provider by name, defaulting to `settings.market_data_provider`."""
+    name = name or settings.market_data_provider
+
+    if name == YFinanceProvider.name:
+        return YFinanceProvider()
+    if name == ReplayProvider.name:
+        return ReplayProvider(
+            recording_dir=settings.market_replay_dir,
+            latency_ms=settings.market_replay_latency_ms,
+            as_of=settings.market_replay_as_of,
+        )
+
+    raise ValueError(f"Unknown market data provider: {name}")
@@ -0,0 +1,201 @@
+"""
+Vectorized market snapshot computation.
+
+Turns a yfinance-style (ticker, field) MultiIndex frame into the 3-day
+snapshot used by the workflow: Today, Yesterday and Day-Before metrics for
+every ticker at once, without a per-symbol Python loop.
+
+The result travels between flow tasks as a MarketSnapshot: one NumPy array
+per column plus a symbol -> row index, instead of a dict per symbol.
+"""
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from investment_engine.services.data_sources.bar_store import FIELDS
+
+OPEN, HIGH, LOW, CLOSE, VOLUME = range(len(FIELDS))
+
+# Complete rows before Today averaged into `avg_volume`
+VOLUME_LOOKBACK = 20
+
+SNAPSHOT_COLUMNS = [
+    "symbol",
+    "current_price",
+    "daily_change_pct",
+    "volume",
+    "open",
+    "high",
+    "low",
+    "prev_close",
+    "prev_open",
+    "prev_prev_close",
+    "prev_prev_open",
+    "avg_volume",
+]
+
+
+def _empty_snapshot() -> pd.DataFrame:
+    return pd.DataFrame({column: [] for column in SNAPSHOT_COLUMNS})
+
+
+def compute_snapshot(data: pd.DataFrame, symbols: List[str], suffix: str = ".NS") -> pd.DataFrame:
+    """
+    Compute the 3-day snapshot for all symbols in one pass.
+
+    Matches the per-ticker `data[ticker].dropna().tail(3)` semantics: a row
+    only counts for a ticker if all of its OHLCV fields are present, and
+    tickers with fewer than 3 such rows are skipped.
+
+    `avg_volume` is the mean volume of up to VOLUME_LOOKBACK complete rows
+    before Today (NaN if the frame holds none), so pass at least
+    VOLUME_LOOKBACK + 1 rows per ticker for a full average.
+
+    Returns one row per symbol with the SNAPSHOT_COLUMNS columns.
+    """
+    if data.empty:
+        return _empty_snapshot()
+
+    present = set(data.columns.get_level_values(0))
+    symbols = [s for s in symbols if f"{s}{suffix}" in present]
+    if not symbols:
+        return _empty_snapshot()
+
+    tickers = [f"{s}{suffix}" for s in symbols]
+    n_rows, n_tickers = len(data), len(tickers)
+
+    # (rows, tickers, fields) cube; reindex guarantees field order and fills gaps with NaN
+    cube = (
+        data.reindex(columns=pd.MultiIndex.from_product([tickers, FIELDS]))
+        .to_numpy(dtype="float64")
+        .reshape(n_rows, n_tickers, len(FIELDS))
+    )
+
+    # A row survives .dropna() only if every field is present
+    valid = ~np.isnan(cube).any(axis=2)
+    valid_count = valid.cumsum(axis=0)
+    total = valid_count[-1]
+    enough = total >= 3
+
+    # Row index of the k-th last valid row per ticker (k=0 -> Today)
+    def nth_last_row(k: int) -> np.ndarray:
+        return np.argmax(valid & (valid_count == (total - k)), axis=0)
+
+    cols = np.arange(n_tickers)
+    today = cube[nth_last_row(0), cols]
+    yesterday = cube[nth_last_row(1), cols]
+    day_before = cube[nth_last_row(2), cols]
+
+    current_close = today[:, CLOSE]
+    prev_close = yesterday[:, CLOSE]
+
+    # Calculate Daily Change % ((New - Old) / Old) * 100
+    # Volume baseline: the complete rows strictly before Today, newest VOLUME_LOOKBACK of them
+    lookback = valid & (valid_count < total) & (valid_count >= total - VOLUME_LOOKBACK)
+    lookback_volume = np.where(lookback, cube[:, :, VOLUME], 0.0).sum(axis=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        daily_change_pct = np.round((current_close - prev_close) / prev_close * 100, 2)
+        avg_volume = lookback_volume / lookback.sum(axis=0)
+
+    snapshot = pd.DataFrame({
+        "symbol": np.asarray(symbols, dtype=object),
+        # --- Critical Signals ---
+        "current_price": current_close,
+        "daily_change_pct": daily_change_pct,
+        "volume": today[:, VOLUME],
+        # --- Today's Candle ---
+        "open": today[:, OPEN],
+        "high": today[:, HIGH],
+        "low": today[:, LOW],
+        # --- Yesterday's Context (Trend Check) ---
+        "prev_close": prev_close,
+        "prev_open": yesterday[:, OPEN],
+        # --- Day Before Context (Reversal Check) ---
+        "prev_prev_close": day_before[:, CLOSE],
+        "prev_prev_open": day_before[:, OPEN],
+        # --- Volume Baseline ---
+        "avg_volume": avg_volume,
+    })[enough].reset_index(drop=True)
+
+    snapshot["volume"] = snapshot["volume"].astype("int64")
+    return snapshot
+
+
+class PriceLookup(Mapping):
+    """Read-only {symbol: current_price} view over a MarketSnapshot."""
+
+    def __init__(self, snapshot: "MarketSnapshot"):
+        self._snapshot = snapshot
+
+    def __getitem__(self, symbol: str) -> float:
+        return float(self._snapshot.columns["current_price"][self._snapshot.index[symbol]])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._snapshot.symbols.tolist())
+
+    def __len__(self) -> int:
+        return len(self._snapshot)
+
+    def __contains__(self, symbol: object) -> bool:
+        return symbol in self._snapshot.index
+
+
+class MarketSnapshot:
+    """
+    Columnar market snapshot: `symbols` plus one array per SNAPSHOT_COLUMNS
+    metric, row i describing symbols[i].
+
+    Pickles as a handful of contiguous arrays (the symbol index is rebuilt
+    on load), so it is cheap to pass through Prefect task results.
+    """
+
+    def __init__(self, symbols: np.ndarray, columns: Dict[str, np.ndarray]):
+        self.symbols = np.asarray(symbols, dtype=str)
+        self.columns = columns
+        self.index = {symbol: i for i, symbol in enumerate(self.symbols.tolist())}
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> "MarketSnapshot":
+        """Build from a compute_snapshot() frame."""
+        return cls(
+            symbols=frame["symbol"].to_numpy(dtype=str),
+            columns={
+                column: frame[column].to_numpy()
+                for column in SNAPSHOT_COLUMNS
+                if column != "symbol"
+            },
+        )
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol: object) -> bool:
+        return symbol in self.index
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"symbols": self.symbols, "columns": self.columns}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state["symbols"], state["columns"])
+
+    @property
+    def prices(self) -> PriceLookup:
+        """O(1) {symbol: current_price} lookup without copying."""
+        return PriceLookup(self)
+
+    def price(self, symbol: str) -> Optional[float]:
+        i = self.index.get(symbol)
+        return None if i is None else float(self.columns["current_price"][i])
+
+    def record(self, i: int) -> Dict[str, Any]:
+        """Row i as a plain dict with native Python values."""
+        row = {"symbol": str(self.symbols[i])}
+        row.update({column: values[i].item() for column, values in self.columns.items()})
+        return row
+
+    def records(self) -> List[Dict[str, Any]]:
+        return [self.record(i) for i in range(len(self))]
@@ -1,100 +1,322 @@
+import math
 import requests
+from concurrent.futures import ThreadPoolExecutor, wait
+from requests.adapters import HTTPAdapter
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 
+from investment_engine.services.news_cache_service import NewsCacheService
+from investment_engine.services.rate_limiter import RateLimitExceeded, get_rate_limiter, parse_retry_after
+from investment_engine.settings import settings
+
 class MarketAuxClient:
     
-    def __init__(self, api_key: str, base_url: str ):
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str,
+        max_concurrency: Optional[int] = None,
+        timeout_seconds: Optional[float] = None,
+        deadline_seconds: Optional[float] = None,
+        use_cache: Optional[bool] = None,
+        fetch_mode: Optional[str] = None,
+    ):
         self.api_key = api_key
         self.base_url = base_url
         if not self.api_key or not self.base_url:
             raise ValueError("MARKET_AUX_API_KEY/ MARKET_AUX_BASE_URL is not set.")
 
-    def enrich_stock_candidates(self, candidates: List[Dict[str, Any]]):
-        enriched_list = []
-    
-        for stock in candidates:
-            symbol = stock['symbol']
-            
-            # 2. Fetch News (IO Bound)
+        self.max_concurrency = max_concurrency or settings.news_fetch_max_concurrency
+        self.timeout_seconds = timeout_seconds or settings.news_fetch_timeout_seconds
+        self.deadline_seconds = deadline_seconds or settings.news_enrichment_deadline_seconds
+        self.use_cache = settings.news_cache_enabled if use_cache is None else use_cache
+        self.fetch_mode = fetch_mode or settings.news_fetch_mode
+        if self.fetch_mode not in ("batched", "per_symbol"):
+            raise ValueError(f"Unknown news fetch mode '{self.fetch_mode}'. Available: batched, per_symbol")
+
+        # One keep-alive connection pool shared by all worker threads
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def close(self):
+        self.session.close()
+
+    @staticmethod
+    def _attach_news(stock: Dict[str, Any], news_items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        # Create a clean copy to avoid mutating the input directly
+        enriched_stock = stock.copy()
+        enriched_stock['news'] = news_items
+        # Metadata flag for the Decision Engine
+        # This helps the LLM know if it's flying blind or has data.
+        enriched_stock['has_news_context'] = bool(news_items)
+        return enriched_stock
+
+    def _fetch_news_safe(
+        self,
+        symbols: List[str],
+        since: Optional[datetime] = None,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """One fetch job: a single symbol, or a whole batch in batched mode."""
+        try:
+            if len(symbols) == 1 and self.fetch_mode == "per_symbol":
+                news_items = self.get_stock_news(symbols[0], limit=3, since=since)
+                news = None if news_items is None else {symbols[0]: news_items}
+            else:
+                news = self.get_batch_news(symbols, limit=3, since=since)
+
+        except Exception as e:
+            print(f"Failed to fetch news for {', '.join(symbols)}: {e}")
+            return {}
+
+        # Only successful requests count as fetched, failures retry next run
+        if news is None:
+            return {}
+        if self.use_cache:
+            # A cache write failure must not cost the run news it already has
             try:
-                news_items = self.get_stock_news(symbol, limit=3)
+                for symbol, news_items in news.items():
+                    NewsCacheService.store(symbol, news_items)
             except Exception as e:
-                #logger.error(f"Failed to fetch news for {symbol}: {e}")
-                news_items = []
-
-            # 3. Create a clean copy to avoid mutating the input directly
-            enriched_stock = stock.copy()
-            
-            # 4. Attach the Context
-            enriched_stock['news'] = news_items
-            
-            # 5. Add a metadata flag for the Decision Engine
-            # This helps the LLM know if it's flying blind or has data.
-            if news_items:
-                enriched_stock['has_news_context'] = True
-                #logger.info(f"Found {len(news_items)} articles for {symbol}")
-            else:
-                enriched_stock['has_news_context'] = False
-                #logger.warning(f"No news found for {symbol}")
-                
-            enriched_list.append(enriched_stock)
-            
-        return enriched_list
-
-    def get_stock_news(self, symbol: str, limit: int = 3) -> List[Dict[str, Any]]:
+                print(f"Warning: could not cache news for {', '.join(symbols)}: {e}")
+        return news
+
+    def _fetch_concurrently(
+        self,
+        symbols: List[str],
+        since: Dict[str, Optional[datetime]],
+    ) -> Dict[str, List[Dict[str, Any]]]:
         """
-        Fetches the latest news for a specific stock symbol.
+        Fetches news for `symbols` with at most `max_concurrency` requests in
+        flight; one request per symbol, or per `news_batch_size` symbols in
+        batched mode. Symbols still pending after `deadline_seconds` are left
+        out of the result instead of holding up the flow.
         """
-        endpoint = f"{self.base_url}/news/all"
-        
-        # 2. Constructing the Parameters
+        if not symbols:
+            return {}
+
+        size = settings.news_batch_size if self.fetch_mode == "batched" else 1
+        jobs = [symbols[i:i + size] for i in range(0, len(symbols), size)]
+
+        pool = ThreadPoolExecutor(
+            max_workers=min(self.max_concurrency, len(jobs)),
+            thread_name_prefix="news-fetch",
+        )
+        futures = {}
+        for job in jobs:
+            # A batch asks from its oldest `since`; any overlap is deduplicated by the cache
+            job_since = [since.get(symbol) for symbol in job]
+            futures[pool.submit(self._fetch_news_safe, job, None if None in job_since else min(job_since))] = job
+        done, pending = wait(futures, timeout=self.deadline_seconds)
+        # Don't wait on stragglers; their results are discarded
+        pool.shutdown(wait=False, cancel_futures=True)
+
+        if pending:
+            late = [symbol for future in pending for symbol in futures[future]]
+            print(f"News deadline of {self.deadline_seconds}s hit, continuing without fresh news for: {', '.join(late)}")
+
+        fetched = {}
+        for future in done:
+            fetched.update(future.result())
+        return fetched
+
+    def enrich_stock_candidates(self, candidates: List[Dict[str, Any]]):
+        """
+        Attaches recent news to each candidate. Output order matches `candidates`.
+
+        With the cache enabled, symbols fetched within `news_cache_ttl_seconds`
+        are served from Postgres and the rest only request articles newer
+        than their latest cached one. Without fresh news before the deadline
+        a symbol falls back to whatever is cached, or none.
+        """
+        if not candidates:
+            return []
+
+        symbols = [stock['symbol'] for stock in candidates]
+        use_cache = self.use_cache
+        states = {}
+        if use_cache:
+            try:
+                states = NewsCacheService.get_fetch_states(symbols)
+            except Exception as e:
+                print(f"Warning: news cache unavailable, fetching everything: {e}")
+                use_cache = False
+
+        to_fetch = [s for s in symbols if not (use_cache and NewsCacheService.is_fresh(states.get(s)))]
+        since = {s: states[s].latest_published_at for s in to_fetch if s in states}
+        if use_cache:
+            print(f"News cache: {len(symbols) - len(to_fetch)} symbols fresh, fetching {len(to_fetch)}")
+
+        fetched = self._fetch_concurrently(to_fetch, since)
+
+        cached = {}
+        if use_cache:
+            try:
+                cached = NewsCacheService.get_recent_articles(symbols, limit=3)
+            except Exception as e:
+                print(f"Warning: could not read news cache: {e}")
+
+        return [
+            self._attach_news(stock, cached.get(stock['symbol']) or fetched.get(stock['symbol'], []))
+            for stock in candidates
+        ]
+
+    @staticmethod
+    def _query_symbol(symbol: str) -> str:
         # Marketaux uses the '.NS' suffix for NSE stocks, but verify if they need it.
         # Usually, standard tickers 'RELIANCE' work, but 'RELIANCE.NS' is safer for India context.
-        query_symbol = f"{symbol}.NS" if not symbol.endswith(".NS") else symbol
+        return f"{symbol}.NS" if not symbol.endswith(".NS") else symbol
 
-        # We only want to look for recent articles
-        lookback_window = datetime.now() - timedelta(days=14)
-        published_after = lookback_window.strftime('%Y-%m-%dT%H:%M')
+    @staticmethod
+    def _clean_article(item: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "title": item.get("title"),
+            "description": item.get("description"),
+            "url": item.get("url"),
+            "published_at": item.get("published_at"),
+            "source": item.get("source"),
+        }
+
+    def _request_news(
+        self,
+        symbols: List[str],
+        limit: int,
+        since: Optional[datetime] = None,
+        page: int = 1,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        One /news/all call for one or more symbols. Returns the JSON body,
+        or None if the request failed.
+        """
+        endpoint = f"{self.base_url}/news/all"
+
+        # We only want to look for recent articles, and none we already have
+        lookback_window = datetime.utcnow() - timedelta(days=settings.news_lookback_days)
+        if since is not None and since > lookback_window:
+            lookback_window = since
+        published_after = lookback_window.strftime('%Y-%m-%dT%H:%M:%S')
 
         params = {
             "api_token": self.api_key,
-            "symbols": query_symbol,
-            "filter_entities": "true", # Only return news definitely about this entity
+            "symbols": ",".join(self._query_symbol(s) for s in symbols),
+            "filter_entities": "true", # Only return news definitely about these entities
             "limit": limit,            # Free tier max is 3
+            "page": page,
             "language": "en",          # English only
             "countries": "in",         # Country to search for 
-            "published_after": published_after, # Weak filter (14 days)
+            "published_after": published_after, # Lookback window or latest cached article
             # "min_match_score": 50,     # Optional: Strictness of match (avoid loose mentions)
         }
 
+        label = ", ".join(symbols)
+        limiter = get_rate_limiter("marketaux")
         try:
-            print(f"Fetching news for {symbol}...")
-            response = requests.get(endpoint, params=params, timeout=10)
-            
-            # 3. Handle HTTP Errors (401, 429, 500)
-            if response.status_code == 429:
-                print(f"RATE LIMIT EXCEEDED. Stopping news fetch for {symbol}.")
-                return []
-            
-            response.raise_for_status()
-            
-            data = response.json()
+            for attempt in range(settings.rate_limit_max_retries + 1):
+                # Shared across worker threads: after a 429 everyone waits out the backoff
+                limiter.acquire(timeout=self.deadline_seconds)
+
+                print(f"Fetching news for {label}" + (f" (page {page})" if page > 1 else "") + "...")
+                response = self.session.get(endpoint, params=params, timeout=self.timeout_seconds)
+
+                # Handle HTTP Errors (401, 429, 500)
+                if response.status_code == 429:
+                    limiter.report_rate_limited(parse_retry_after(response.headers.get("Retry-After")))
+                    continue
+
+                response.raise_for_status()
+                limiter.report_success()
+                return response.json()
+
+            print(f"RATE LIMIT EXCEEDED. Giving up news fetch for {label}.")
+            return None
+
+        except RateLimitExceeded as e:
+            print(f"Skipping news fetch for {label}: {e}")
+            return None
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"Error fetching news for {label}: {e}")
+            return None
+
+    def get_stock_news(
+        self,
+        symbol: str,
+        limit: int = 3,
+        since: Optional[datetime] = None,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Fetches the latest news for a specific stock symbol, optionally only
+        articles published after `since` (UTC). Returns None if the request
+        failed.
+        """
+        data = self._request_news([symbol], limit=limit, since=since)
+        if data is None:
+            return None
+        return [self._clean_article(item) for item in data.get("data", [])]
+
+    def get_batch_news(
+        self,
+        symbols: List[str],
+        limit: int = 3,
+        since: Optional[datetime] = None,
+    ) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """
+        Fetches news for several symbols with comma-separated `symbols`
+        requests, paging until every symbol has `limit` articles, the results
+        run out, or the page budget is spent: enough `news_page_size` pages
+        for `limit` articles per symbol, at most `news_batch_max_pages`.
+
+        Busy names can fill most of those pages, so a symbol still short of
+        `limit` when the budget runs out (but the results did not) is topped
+        up with its own request. A symbol whose top-up fails is left out,
+        so it isn't cached as fetched and is retried next run.
+
+        Articles are split back to symbols by their entity list, so one
+        article about two candidates is attached to both. Returns
+        {symbol: articles}, or None if the first page failed.
+        """
+        wanted = {self._query_symbol(s): s for s in symbols}
+        news = {s: [] for s in symbols}
+        max_pages = min(math.ceil(limit * len(symbols) / settings.news_page_size), settings.news_batch_max_pages)
+        exhausted = False
+
+        for page in range(1, max_pages + 1):
+            data = self._request_news(symbols, limit=settings.news_page_size, since=since, page=page)
+            if data is None:
+                if page == 1:
+                    return None
+                # Keep what earlier pages returned; short symbols are topped up below
+                break
+
             articles = data.get("data", [])
-            
-            # 4. Clean and Format the Response
-            cleaned_news = []
             for item in articles:
-                cleaned_news.append({
-                    "title": item.get("title"),
-                    "description": item.get("description"),
-                    "url": item.get("url"),
-                    "published_at": item.get("published_at"),
-                    "source": item.get("source"),
-                })
-                
-            return cleaned_news
-
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching news for {symbol}: {e}")
-            return []
\ No newline at end of file
+                matched = {
+                    wanted[entity.get("symbol")]
+                    for entity in item.get("entities") or []
+                    if entity.get("symbol") in wanted
+                }
+                for symbol in matched:
+                    if len(news[symbol]) < limit:
+                        news[symbol].append(self._clean_article(item))
+
+            meta = data.get("meta") or {}
+            found = meta.get("found", 0)
+            if not articles or page * settings.news_page_size >= found:
+                exhausted = True
+                break
+            if all(len(items) >= limit for items in news.values()):
+                break
+
+        if exhausted:
+            return news
+
+        for symbol in [s for s, items in news.items() if len(items) < limit]:
+            extra = self.get_stock_news(symbol, limit=limit, since=since)
+            if extra is None:
+                del news[symbol]
+                continue
+            seen = {item["url"] for item in news[symbol]}
+            news[symbol].extend(item for item in extra if item["url"] not in seen)
+            news[symbol] = news[symbol][:limit]
+
+        return news
@@ -0,0 +1,277 @@
+"""
+Reddit sentiment ingester.
+
+Streams posts and comments from Indian market subreddits (or a local JSONL
+fixture), finds NIFTY 50 ticker mentions and folds each item into per-symbol
+rolling-window aggregates: mention counts and a simple lexicon sentiment.
+
+Memory is bounded by (symbols x buckets) regardless of how much is read:
+item text is scored as it streams past and never stored, and each symbol
+keeps a fixed ring of time buckets that is reused as the window rolls.
+"""
+
+import json
+import re
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from investment_engine.settings import settings
+from investment_engine.workflows.utils.nifty_50 import NIFTY_50
+
+# Small finance lexicon; scores are summed per item and squashed to [-1, 1]
+LEXICON = {
+    # Positive
+    "bullish": 1.0, "buy": 0.5, "buying": 0.5, "long": 0.5, "breakout": 1.0, "rally": 1.0,
+    "upside": 1.0, "beat": 1.0, "beats": 1.0, "strong": 0.5, "growth": 0.5, "profit": 0.5,
+    "undervalued": 1.0, "accumulate": 0.5, "outperform": 1.0, "upgrade": 1.0, "green": 0.5,
+    "moon": 1.0, "rocket": 1.0, "gain": 0.5, "gains": 0.5, "surge": 1.0, "record": 0.5,
+    # Negative
+    "bearish": -1.0, "sell": -0.5, "selling": -0.5, "short": -0.5, "crash": -1.0, "dump": -1.0,
+    "downside": -1.0, "miss": -1.0, "misses": -1.0, "weak": -0.5, "loss": -0.5, "losses": -0.5,
+    "overvalued": -1.0, "exit": -0.5, "underperform": -1.0, "downgrade": -1.0, "red": -0.5,
+    "fraud": -1.0, "scam": -1.0, "fall": -0.5, "falls": -0.5, "plunge": -1.0, "debt": -0.5,
+}
+NEGATIONS = {"not", "no", "never", "dont", "don't", "isnt", "isn't", "wont", "won't"}
+
+WORD_PATTERN = re.compile(r"[a-z']+")
+
+
+@dataclass
+class RedditItem:
+    id: str
+    kind: str           # "post" or "comment"
+    created_utc: float
+    text: str
+    score: int = 0
+
+
+class RedditSource(ABC):
+
+    name: str
+
+    @abstractmethod
+    def stream(self) -> Iterator[RedditItem]:
+        """Items newest-first or in any order; each is consumed once."""
+
+
+class PrawRedditSource(RedditSource):
+    """Latest posts and comments of `subreddits` through the Reddit API (read-only)."""
+
+    name = "praw"
+
+    def __init__(self, subreddits: List[str], limit: int):
+        import praw
+
+        if not settings.reddit_client_id or not settings.reddit_client_secret:
+            raise ValueError("REDDIT_CLIENT_ID / REDDIT_CLIENT_SECRET is not set.")
+
+        self.reddit = praw.Reddit(
+            client_id=settings.reddit_client_id,
+            client_secret=settings.reddit_client_secret,
+            user_agent=settings.reddit_user_agent,
+        )
+        self.reddit.read_only = True
+        self.subreddits = subreddits
+        self.limit = limit
+
+    def stream(self) -> Iterator[RedditItem]:
+        subreddit = self.reddit.subreddit("+".join(self.subreddits))
+
+        # praw listings are lazy generators; pages are fetched as we iterate
+        for post in subreddit.new(limit=self.limit):
+            yield RedditItem(
+                id=post.id,
+                kind="post",
+                created_utc=post.created_utc,
+                text=f"{post.title}\n{post.selftext or ''}",
+                score=post.score,
+            )
+        for comment in subreddit.comments(limit=self.limit):
+            yield RedditItem(
+                id=comment.id,
+                kind="comment",
+                created_utc=comment.created_utc,
+                text=comment.body or "",
+                score=comment.score,
+            )
+
+
+class FixtureRedditSource(RedditSource):
+    """
+    Items from a JSONL file (one {"id", "kind", "created_utc", "text", "score"}
+    object per line), read lazily. `shift_to_now` moves the newest item to
+    the current time so a fixed recording always falls inside the window.
+    """
+
+    name = "fixture"
+
+    def __init__(self, path: str, shift_to_now: bool = True):
+        self.path = path
+        self.shift_to_now = shift_to_now
+
+    def _newest(self) -> float:
+        newest = 0.0
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    newest = max(newest, float(json.loads(line)["created_utc"]))
+        return newest
+
+    def stream(self) -> Iterator[RedditItem]:
+        offset = time.time() - self._newest() if self.shift_to_now else 0.0
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                yield RedditItem(
+                    id=str(row["id"]),
+                    kind=row.get("kind", "post"),
+                    created_utc=float(row["created_utc"]) + offset,
+                    text=row.get("text", ""),
+                    score=int(row.get("score", 0)),
+                )
+
+
+def get_reddit_source(name: Optional[str] = None) -> RedditSource:
+    name = name or settings.reddit_source
+    if name == "praw":
+        return PrawRedditSource(
+            subreddits=[s.strip() for s in settings.reddit_subreddits.split(",") if s.strip()],
+            limit=settings.reddit_fetch_limit,
+        )
+    if name == "fixture":
+        return FixtureRedditSource(settings.reddit_fixture_path)
+    raise ValueError(f"Unknown Reddit source '{name}'. Available: praw, fixture")
+
+
+def score_text(text: str) -> float:
+    """Lexicon sentiment in [-1, 1]; a negation flips the next word."""
+    total = 0.0
+    hits = 0
+    negate = False
+    for word in WORD_PATTERN.findall(text.lower()):
+        if word in NEGATIONS:
+            negate = True
+            continue
+        value = LEXICON.get(word)
+        if value is not None:
+            total += -value if negate else value
+            hits += 1
+        negate = False
+    return 0.0 if hits == 0 else max(-1.0, min(1.0, total / hits))
+
+
+class RollingSentiment:
+    """
+    Per-symbol ring of `n_buckets` time buckets of `bucket_seconds` each.
+    A bucket is cleared when a newer period maps onto its slot, so only the
+    last `n_buckets * bucket_seconds` seconds are ever counted.
+    """
+
+    def __init__(self, symbols: List[str], bucket_seconds: int, n_buckets: int):
+        self.symbols = list(symbols)
+        self.index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.bucket_seconds = bucket_seconds
+        self.n_buckets = n_buckets
+
+        shape = (len(self.symbols), n_buckets)
+        self.period = np.full(shape, -1, dtype="int64")   # period number each slot holds
+        self.mentions = np.zeros(shape, dtype="int64")
+        self.sentiment_sum = np.zeros(shape, dtype="float64")
+        self.positive = np.zeros(shape, dtype="int64")
+        self.negative = np.zeros(shape, dtype="int64")
+
+    def add(self, symbol: str, created_utc: float, sentiment: float, now: float) -> bool:
+        """Count one mention; False if it is older than the window."""
+        period = int(created_utc // self.bucket_seconds)
+        if period <= int(now // self.bucket_seconds) - self.n_buckets:
+            return False
+
+        row, slot = self.index[symbol], period % self.n_buckets
+        if self.period[row, slot] != period:
+            if self.period[row, slot] > period:
+                return False
+            self.period[row, slot] = period
+            self.mentions[row, slot] = 0
+            self.sentiment_sum[row, slot] = 0.0
+            self.positive[row, slot] = 0
+            self.negative[row, slot] = 0
+
+        self.mentions[row, slot] += 1
+        self.sentiment_sum[row, slot] += sentiment
+        self.positive[row, slot] += sentiment > 0
+        self.negative[row, slot] += sentiment < 0
+        return True
+
+    def summary(self, now: float) -> Dict[str, Dict[str, Any]]:
+        """Aggregates over the live window for every symbol with mentions."""
+        current = int(now // self.bucket_seconds)
+        live = self.period > current - self.n_buckets
+        latest = self.period == current
+
+        mentions = np.where(live, self.mentions, 0).sum(axis=1)
+        sentiment_sum = np.where(live, self.sentiment_sum, 0.0).sum(axis=1)
+        positive = np.where(live, self.positive, 0).sum(axis=1)
+        negative = np.where(live, self.negative, 0).sum(axis=1)
+        latest_mentions = np.where(latest, self.mentions, 0).sum(axis=1)
+
+        result = {}
+        for row in np.flatnonzero(mentions):
+            result[self.symbols[row]] = {
+                "mentions": int(mentions[row]),
+                "mentions_latest_bucket": int(latest_mentions[row]),
+                "avg_sentiment": round(float(sentiment_sum[row] / mentions[row]), 3),
+                "positive": int(positive[row]),
+                "negative": int(negative[row]),
+                "window_hours": round(self.n_buckets * self.bucket_seconds / 3600, 1),
+            }
+        return result
+
+
+class RedditSentimentIngester:
+
+    def __init__(
+        self,
+        symbols: Optional[List[str]] = None,
+        window_hours: Optional[float] = None,
+        bucket_minutes: Optional[int] = None,
+    ):
+        symbols = symbols or NIFTY_50
+        window_hours = window_hours or settings.reddit_window_hours
+        bucket_minutes = bucket_minutes or settings.reddit_bucket_minutes
+
+        bucket_seconds = bucket_minutes * 60
+        self.window = RollingSentiment(
+            symbols,
+            bucket_seconds=bucket_seconds,
+            n_buckets=max(int(window_hours * 3600 // bucket_seconds), 1),
+        )
+        # Longest first so e.g. "BAJAJFINSV" wins over a shorter prefix; $TICKER also counts
+        alternatives = "|".join(re.escape(s) for s in sorted(symbols, key=len, reverse=True))
+        self.pattern = re.compile(rf"(?<![A-Za-z0-9&-])\$?({alternatives})(?![A-Za-z0-9&-])")
+
+        self.items_read = 0
+        self.items_matched = 0
+
+    def ingest(self, source: RedditSource, now: Optional[float] = None) -> None:
+        """Consume the whole stream; text is dropped as soon as it is scored."""
+        now = now or time.time()
+        for item in source.stream():
+            self.items_read += 1
+            symbols = set(self.pattern.findall(item.text))
+            if not symbols:
+                continue
+
+            sentiment = score_text(item.text)
+            counted = False
+            for symbol in symbols:
+                counted |= self.window.add(symbol, item.created_utc, sentiment, now)
+            self.items_matched += counted
+
+    def aggregates(self, now: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        return self.window.summary(now or time.time())
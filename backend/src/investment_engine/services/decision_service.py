@@ -18,7 +18,9 @@ from investment_engine.schemas.decisions import (
 class DecisionService:
 
     @staticmethod
-    def persist(decision_response, portfolio_id, model_name="gpt-4.1-mini"):
+    def persist(decision_response, portfolio_id, model_name=None):
+        """model_name -> defaults to the response's model_name, then gpt-4.1-mini"""
+        model_name = (model_name or decision_response.model_name or "gpt-4.1-mini")[:50]
         with session_scope() as session:
             decision_rows = []
 
@@ -30,6 +32,8 @@ class DecisionService:
                     reasoning=d.reasoning,
                     raw_llm_output=d.model_dump_json(),
                     model_used=model_name,
+                    llm_call_id=d._llm_call_id,
+                    ensemble_stats=d._ensemble_stats,
                 )
 
                 session.add(row)
@@ -173,6 +177,8 @@ class DecisionService:
                 reasoning=decision.reasoning,
                 raw_llm_output=decision.raw_llm_output,
                 model_used=decision.model_used,
+                llm_call_id=decision.llm_call_id,
+                ensemble_stats=decision.ensemble_stats,
                 created_at=decision.created_at,
                 trade=trade_execution
             )
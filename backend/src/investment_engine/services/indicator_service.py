@@ -0,0 +1,174 @@
+"""
+Indicator Service
+
+Incrementally maintained technical indicators per symbol: SMA 20/50,
+EMA 20, RSI 14, ATR 14, 20-day average volume and 52-week high/low.
+
+Each symbol's running state is cached as JSON next to the bar store and
+advanced only over bars it has not seen, so a run costs a handful of
+updates per symbol instead of a pass over full history. The newest stored
+bar may still be an intraday bar, so it is applied to a throwaway copy of
+the state and only committed once a newer bar exists.
+"""
+
+import json
+import os
+from collections import deque
+from copy import deepcopy
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from investment_engine.services.data_sources.bar_store import BarStore
+
+SMA_SHORT = 20
+SMA_LONG = 50
+EMA_PERIOD = 20
+RSI_PERIOD = 14
+ATR_PERIOD = 14
+VOLUME_PERIOD = 20
+YEAR_BARS = 252
+
+
+@dataclass
+class IndicatorState:
+    last_date: Optional[str] = None
+    bars: int = 0
+    prev_close: Optional[float] = None
+    ema: Optional[float] = None
+    # Wilder averages; sums are used until the first full period is seen
+    avg_gain: float = 0.0
+    avg_loss: float = 0.0
+    atr: float = 0.0
+    closes: List[float] = field(default_factory=list)
+    volumes: List[float] = field(default_factory=list)
+    highs: List[float] = field(default_factory=list)
+    lows: List[float] = field(default_factory=list)
+
+    def update(self, high: float, low: float, close: float, volume: float) -> None:
+        high, low, close, volume = float(high), float(low), float(close), float(volume)
+
+        if self.prev_close is None:
+            true_range = high - low
+        else:
+            true_range = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+            change = close - self.prev_close
+            gain, loss = max(change, 0.0), max(-change, 0.0)
+            # This is change number `self.bars`; the first RSI_PERIOD are averaged plainly
+            if self.bars <= RSI_PERIOD:
+                self.avg_gain += gain / RSI_PERIOD
+                self.avg_loss += loss / RSI_PERIOD
+            else:
+                self.avg_gain = (self.avg_gain * (RSI_PERIOD - 1) + gain) / RSI_PERIOD
+                self.avg_loss = (self.avg_loss * (RSI_PERIOD - 1) + loss) / RSI_PERIOD
+
+        if self.bars < ATR_PERIOD:
+            self.atr += true_range / ATR_PERIOD
+        else:
+            self.atr = (self.atr * (ATR_PERIOD - 1) + true_range) / ATR_PERIOD
+
+        alpha = 2 / (EMA_PERIOD + 1)
+        self.ema = close if self.ema is None else alpha * close + (1 - alpha) * self.ema
+
+        self.closes = list(deque(self.closes + [close], maxlen=SMA_LONG))
+        self.volumes = list(deque(self.volumes + [volume], maxlen=VOLUME_PERIOD))
+        self.highs = list(deque(self.highs + [high], maxlen=YEAR_BARS))
+        self.lows = list(deque(self.lows + [low], maxlen=YEAR_BARS))
+
+        self.prev_close = close
+        self.bars += 1
+
+    def values(self) -> Dict[str, Optional[float]]:
+        """Current indicator values; None until enough bars have been seen."""
+        def rounded(value: Optional[float]) -> Optional[float]:
+            return None if value is None else round(value, 2)
+
+        close = self.prev_close
+        rsi = None
+        if self.bars > RSI_PERIOD:
+            rsi = 100.0 if self.avg_loss == 0 else 100 - 100 / (1 + self.avg_gain / self.avg_loss)
+        atr = self.atr if self.bars >= ATR_PERIOD else None
+        avg_volume = sum(self.volumes) / len(self.volumes) if len(self.volumes) == VOLUME_PERIOD else None
+        high_52w = max(self.highs) if self.highs else None
+        low_52w = min(self.lows) if self.lows else None
+
+        return {
+            "sma_20": rounded(sum(self.closes[-SMA_SHORT:]) / SMA_SHORT) if len(self.closes) >= SMA_SHORT else None,
+            "sma_50": rounded(sum(self.closes) / SMA_LONG) if len(self.closes) >= SMA_LONG else None,
+            "ema_20": rounded(self.ema) if self.bars >= EMA_PERIOD else None,
+            "rsi_14": rounded(rsi),
+            "atr_14": rounded(atr),
+            "atr_pct": rounded(atr / close * 100) if atr is not None and close else None,
+            "avg_volume_20": rounded(avg_volume),
+            "volume_ratio": rounded(self.volumes[-1] / avg_volume) if avg_volume else None,
+            "high_52w": rounded(high_52w),
+            "low_52w": rounded(low_52w),
+            "pct_from_52w_high": rounded((close / high_52w - 1) * 100) if high_52w and close else None,
+            "pct_from_52w_low": rounded((close / low_52w - 1) * 100) if low_52w and close else None,
+        }
+
+
+class IndicatorService:
+
+    @staticmethod
+    def _state_path(store: BarStore, ticker: str) -> Path:
+        return store.root / "_indicators" / f"{ticker}.json"
+
+    @staticmethod
+    def _load_state(store: BarStore, ticker: str) -> IndicatorState:
+        path = IndicatorService._state_path(store, ticker)
+        if not path.exists():
+            return IndicatorState()
+        try:
+            return IndicatorState(**json.loads(path.read_text()))
+        except (OSError, ValueError, TypeError) as e:
+            print(f"Warning: rebuilding indicator state for {ticker}: {e}")
+            return IndicatorState()
+
+    @staticmethod
+    def _save_state(store: BarStore, ticker: str, state: IndicatorState) -> None:
+        path = IndicatorService._state_path(store, ticker)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(asdict(state)))
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def compute(store: BarStore, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Indicator values per symbol from the bars in `store`.
+        Symbols without stored bars are left out.
+        """
+        result = {}
+
+        for symbol in symbols:
+            ticker = f"{symbol}.NS"
+            state = IndicatorService._load_state(store, ticker)
+
+            since = pd.Timestamp(state.last_date) + pd.Timedelta(days=1) if state.last_date else None
+            data = store.read([ticker], since=since)
+            if data.empty:
+                if state.bars:
+                    result[symbol] = state.values()
+                continue
+
+            bars = data[ticker].dropna()
+            if bars.empty:
+                continue
+
+            # Commit every bar but the newest, which may still be forming
+            committed = bars.iloc[:-1]
+            for date, row in committed.iterrows():
+                state.update(row["High"], row["Low"], row["Close"], row["Volume"])
+                state.last_date = date.strftime("%Y-%m-%d")
+            if len(committed):
+                IndicatorService._save_state(store, ticker, state)
+
+            latest = bars.iloc[-1]
+            current = deepcopy(state)
+            current.update(latest["High"], latest["Low"], latest["Close"], latest["Volume"])
+            result[symbol] = current.values()
+
+        return result
@@ -1,78 +1,471 @@
-from openai import OpenAI
-from investment_engine.workflows.schemas.llm_models import DecisionResponse
-from investment_engine.workflows.schemas.prompt_builder import build_prompts
-from investment_engine.workflows.utils.parser_helper import extract_json
+from openai import OpenAI, RateLimitError
+from investment_engine.workflows.schemas.llm_models import DecisionResponse, LLMUsage
+from investment_engine.workflows.schemas.prompt_builder import build_budgeted_prompts
+from investment_engine.workflows.utils.parser_helper import DecisionStreamParser
+from investment_engine.services.rate_limiter import get_rate_limiter, parse_retry_after
+from investment_engine.services.llm.response_cache import LLMResponseCacheService
+from investment_engine.services.llm.decision_merger import DecisionMerger
+from investment_engine.services.llm.telemetry import LLMTelemetryService
+from investment_engine.services.llm.local_llm import LocalLLMBackend, LocalLLMError
+from investment_engine.services.llm.decision_ensemble import DecisionEnsemble, parse_members
+from investment_engine.services.llm.mock_llm import MockLLMBackend
+from investment_engine.workflows.utils.token_counter import count_tokens
+from investment_engine.settings import settings
+from concurrent.futures import ThreadPoolExecutor
 import json
+import queue
+import threading
 import time
 
 client = OpenAI()
 
-ollama_client = OpenAI(
-    base_url="http://localhost:11434/v1",
-    api_key="ollama" # Dummy key req by OpenAI
-)
-
 
 class DecisionEngine:
 
+    MODEL = "gpt-4.1-mini"
+    TEMPERATURE = 0.2
+    # Routes every call (and shard) to the same prefix cache on the provider side
+    PROMPT_CACHE_KEY = "investment-engine-decisions"
+
+    @staticmethod
+    def _usage(response, latency_seconds):
+        usage = response.usage
+        details = getattr(usage, "prompt_tokens_details", None) if usage else None
+        return LLMUsage(
+            calls=1,
+            prompt_tokens=usage.prompt_tokens if usage else 0,
+            cached_tokens=(details.cached_tokens or 0) if details else 0,
+            completion_tokens=usage.completion_tokens if usage else 0,
+            latency_seconds=latency_seconds,
+        )
+
     @staticmethod
-    def generate(state, candidates):
+    def _link_call(parsed, call_id):
+        """Tag each decision with the llm_calls row that produced it."""
+        for decision in parsed.decisions:
+            decision._llm_call_id = call_id
+
+    @staticmethod
+    def _cache_lookup(cache_key, model):
+        try:
+            cached = LLMResponseCacheService.get(cache_key)
+        except Exception as e:
+            print(f"Warning: LLM cache lookup failed: {e}")
+            return None
+        if cached is None:
+            return None
+        print(f"LLM cache hit ({cache_key[:12]}), skipping {model} call")
+        return DecisionResponse.model_validate_json(cached)
+
+    @staticmethod
+    def _cache_store(cache_key, model, parsed):
+        try:
+            LLMResponseCacheService.put(cache_key, model, parsed.model_dump_json())
+        except Exception as e:
+            print(f"Warning: could not cache LLM response: {e}")
+
+    @staticmethod
+    def _prompts(state, candidates, market_news=None):
+        system_prompt, user_prompt, token_report = build_budgeted_prompts(state, candidates, market_news)
+        print(token_report.summary())
+        if token_report.over_budget:
+            print(f"Warning: prompt is over the {token_report.budget}-token budget after trimming")
+        return system_prompt, user_prompt
+
+    @staticmethod
+    def generate(state, candidates, market_news=None, use_cache=None, model=None, prompts=None):
+        """
+        use_cache -> answer byte-identical prompts from the LLM response cache;
+                     defaults to settings.llm_cache_enabled. Pass False to force a fresh call.
+        model -> OpenAI model; defaults to DecisionEngine.MODEL
+        prompts -> prebuilt (system, user) prompts, e.g. shared by ensemble members
+        """
+        model = model or DecisionEngine.MODEL
+        system_prompt, user_prompt = prompts or DecisionEngine._prompts(state, candidates, market_news)
+
+        use_cache = settings.llm_cache_enabled if use_cache is None else use_cache
+        cache_key = None
+        if use_cache:
+            cache_key = LLMResponseCacheService.make_key(
+                model=model,
+                temperature=DecisionEngine.TEMPERATURE,
+                schema=DecisionResponse.model_json_schema(),
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+            )
+            lookup_started = time.perf_counter()
+            cached = DecisionEngine._cache_lookup(cache_key, model)
+            if cached is not None:
+                cached._usage = LLMUsage(response_cache_hits=1)
+                cached._model = model
+                call_id = LLMTelemetryService.record(
+                    backend="openai",
+                    model=model,
+                    status="response_cache_hit",
+                    latency_seconds=time.perf_counter() - lookup_started,
+                    candidates=len(candidates),
+                )
+                DecisionEngine._link_call(cached, call_id)
+                return cached
 
-        system_prompt, user_prompt = build_prompts(state, candidates)
+        limiter = get_rate_limiter("openai")
+        started = None
 
         try:
-            response = client.chat.completions.parse(
-                model="gpt-4.1-mini",
+            limiter.acquire()
+            started = time.perf_counter()
+            # Raw response for retries_taken; the openai client retries 5xx/connection errors itself
+            raw = client.chat.completions.with_raw_response.parse(
+                model=model,
                 messages=[
                     {"role": "system", "content": system_prompt},  
                     {"role": "user", "content": user_prompt},
                 ],
                 response_format=DecisionResponse,
-                temperature=0.2,
+                temperature=DecisionEngine.TEMPERATURE,
+                prompt_cache_key=DecisionEngine.PROMPT_CACHE_KEY,
             )
+            response = raw.parse()
+            latency = time.perf_counter() - started
+
+            limiter.report_success()
 
             # parsed object directly available
-            return response.choices[0].message.parsed
+            parsed = response.choices[0].message.parsed
+            usage = DecisionEngine._usage(response, latency)
+            call_id = LLMTelemetryService.record(
+                backend="openai",
+                model=model,
+                status="ok" if parsed is not None else "error",
+                latency_seconds=latency,
+                candidates=len(candidates),
+                prompt_tokens=usage.prompt_tokens,
+                cached_tokens=usage.cached_tokens,
+                completion_tokens=usage.completion_tokens,
+                retries=raw.retries_taken,
+                error=None if parsed is not None else "No parsed response (refusal or empty output)",
+            )
+            if parsed is not None:
+                parsed._usage = usage
+                parsed._model = model
+                print(parsed.usage.summary())
+                DecisionEngine._link_call(parsed, call_id)
+            if cache_key is not None and parsed is not None:
+                DecisionEngine._cache_store(cache_key, model, parsed)
+            return parsed
 
+        except RateLimitError as e:
+            limiter.report_rate_limited(parse_retry_after(e.response.headers.get("retry-after")))
+            DecisionEngine._record_failure("openai", model, started, candidates, e)
+            raise RuntimeError(f"OpenAI rate limit hit in DecisionEngine: {e}") from e
         except Exception as e:
+            DecisionEngine._record_failure("openai", model, started, candidates, e)
             raise RuntimeError(f"Unexpected error in DecisionEngine: {e}") from e
 
     @staticmethod
-    def generate_ollama(candidates, retries: int = 3):
-
-        system_prompt, user_prompt = build_prompts(candidates)
-
-        # FORCE JSON — extremely important for local models
-        system_prompt = (
-            system_prompt + 
-            """
-                Return ONLY raw JSON.
-                Do NOT wrap it in quotes.
-                Do NOT use markdown.
-                Do NOT add commentary.
-                Do NOT say "Here is the JSON".
-            """
+    def _record_failure(backend, model, started, candidates, error, retries=0):
+        LLMTelemetryService.record(
+            backend=backend,
+            model=model,
+            status="error",
+            latency_seconds=time.perf_counter() - started if started is not None else 0.0,
+            candidates=len(candidates),
+            retries=retries,
+            error=str(error),
         )
 
-        last_error = None
+    @staticmethod
+    def _shard_market_news(shard, market_news):
+        """Only the shared stories this shard's candidates point at."""
+        refs = {ref for stock in shard for ref in stock.get("news_refs", [])}
+        return [item for item in market_news or [] if item["id"] in refs]
 
-        for attempt in range(retries):
-            try:
-                response = ollama_client.chat.completions.create(
-                    model="mistral",
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt},
-                    ],
-                    temperature=0.2,
+    @staticmethod
+    def generate_sharded(
+        state, candidates, market_news=None, use_cache=None, shard_size=None, max_workers=None, backend=None
+    ):
+        """
+        Split candidates into shards of `shard_size` (in screener order), run one
+        generate() per shard concurrently with the full portfolio context, and
+        merge the results with DecisionMerger (BUY cap, cash budget, one
+        decision per symbol). Each call goes through the response cache and the
+        openai rate limiter like a single call would.
+
+        backend -> "openai", "ollama" or "mock" (settings.llm_backend); Ollama
+                   shards share one async client, settings.ollama_max_concurrency
+                   in flight
+
+        A failed shard is logged and skipped; if every shard fails the first
+        error is raised.
+        """
+        shard_size = shard_size or settings.llm_shard_size
+        max_workers = max_workers or settings.llm_max_parallel_calls
+
+        backend = backend or settings.llm_backend
+
+        shards = [candidates[i:i + shard_size] for i in range(0, len(candidates), shard_size)]
+        if len(shards) <= 1:
+            if backend == "ollama":
+                return DecisionEngine.generate_ollama(state, candidates, market_news=market_news)
+            if backend == "mock":
+                return DecisionEngine.generate_mock(state, candidates, market_news=market_news)
+            return DecisionEngine.generate(state, candidates, market_news=market_news, use_cache=use_cache)
+
+        if backend == "ollama":
+            print(f"Evaluating {len(candidates)} candidates in {len(shards)} shards on Ollama")
+            outcomes = DecisionEngine._generate_ollama_shards(state, shards, market_news)
+        else:
+            print(f"Evaluating {len(candidates)} candidates in {len(shards)} shards ({max_workers} in parallel)")
+
+            def run(shard):
+                if backend == "mock":
+                    return DecisionEngine.generate_mock(
+                        state, shard, market_news=DecisionEngine._shard_market_news(shard, market_news)
+                    )
+                return DecisionEngine.generate(
+                    state,
+                    shard,
+                    market_news=DecisionEngine._shard_market_news(shard, market_news),
+                    use_cache=use_cache,
                 )
 
-                content = response.choices[0].message.content
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(run, shard) for shard in shards]
+
+            outcomes = []
+            for future in futures:
+                try:
+                    outcomes.append(future.result())
+                except Exception as e:
+                    outcomes.append(e)
 
-                parsed_dict = extract_json(content)
+        responses, errors = [], []
+        for index, outcome in enumerate(outcomes):
+            if isinstance(outcome, Exception):
+                print(f"Warning: shard {index + 1}/{len(shards)} failed: {outcome}")
+                responses.append(None)
+                errors.append(outcome)
+            else:
+                responses.append(outcome)
 
-                return DecisionResponse.model_validate(parsed_dict)
+        if len(errors) == len(shards):
+            raise errors[0]
+
+        merged = DecisionMerger.merge(
+            responses,
+            cash_balance=state["cash_balance"],
+            prices=DecisionMerger.price_map(state, candidates),
+            max_buys=settings.llm_max_buys,
+        )
+        merged._usage = LLMUsage.combine([r.usage for r in responses if r is not None])
+        merged._model = next(r.model_name for r in responses if r is not None)
+        return merged
 
+    # Ollama constrains decoding to this schema, so output is always DecisionResponse-shaped JSON
+    OLLAMA_FORMAT = DecisionResponse.model_json_schema()
+
+    @staticmethod
+    def _ollama_parser_factory(state, candidates):
+        """Fresh DecisionStreamParser per attempt, accepting only symbols in the prompt."""
+        symbols = [c["symbol"] for c in candidates] + [h["symbol"] for h in state.get("holdings", [])]
+        return lambda: DecisionStreamParser(allowed_symbols=symbols, max_decisions=len(set(symbols)))
+
+    @staticmethod
+    def _ollama_response(result, candidates, started, model=None):
+        """LocalLLMResult (or the LocalLLMError in its place) -> DecisionResponse, logged to llm_calls."""
+        model = model or settings.ollama_model
+        if isinstance(result, LocalLLMError):
+            DecisionEngine._record_failure(
+                "ollama", model, started, candidates, result, retries=result.retries
+            )
+            raise result
+
+        # Validated decision by decision while streaming
+        parsed = result.parsed
+
+        if result.load_seconds > 1:
+            print(f"Warning: Ollama spent {result.load_seconds:.1f}s loading {model}; is warm-up running?")
+
+        parsed._usage = LLMUsage(
+            calls=1,
+            prompt_tokens=result.prompt_tokens,
+            completion_tokens=result.completion_tokens,
+            latency_seconds=result.latency_seconds,
+        )
+        parsed._model = f"ollama:{model}"
+        print(parsed.usage.summary())
+        call_id = LLMTelemetryService.record(
+            backend="ollama",
+            model=model,
+            status="ok",
+            latency_seconds=result.latency_seconds,
+            candidates=len(candidates),
+            prompt_tokens=result.prompt_tokens,
+            completion_tokens=result.completion_tokens,
+            retries=result.retries,
+        )
+        DecisionEngine._link_call(parsed, call_id)
+        return parsed
+
+    @staticmethod
+    def generate_ollama(state, candidates, market_news=None, model=None, prompts=None):
+        """
+        Same prompts as generate(), answered by the local Ollama model
+        (settings.ollama_*). Decoding is constrained to the DecisionResponse
+        schema and the output is streamed through DecisionStreamParser, so
+        a response that goes invalid is abandoned mid-generation and retried.
+        Not cached or rate limited. Raises LocalLLMError if the server is
+        unreachable or no attempt produced a valid DecisionResponse.
+
+        model -> Ollama model; defaults to settings.ollama_model
+        prompts -> prebuilt (system, user) prompts, e.g. shared by ensemble members
+        """
+        model = model or settings.ollama_model
+        system_prompt, user_prompt = prompts or DecisionEngine._prompts(state, candidates, market_news)
+
+        started = time.perf_counter()
+        try:
+            result = LocalLLMBackend.chat(
+                system_prompt,
+                user_prompt,
+                format=DecisionEngine.OLLAMA_FORMAT,
+                make_parser=DecisionEngine._ollama_parser_factory(state, candidates),
+                model=model,
+            )
+        except LocalLLMError as e:
+            result = e
+        return DecisionEngine._ollama_response(result, candidates, started, model)
+
+    @staticmethod
+    def _generate_ollama_shards(state, shards, market_news=None, model=None):
+        """All shards on one async Ollama client; a response or an exception per shard."""
+        model = model or settings.ollama_model
+        prompts = [
+            DecisionEngine._prompts(state, shard, DecisionEngine._shard_market_news(shard, market_news))
+            for shard in shards
+        ]
+        started = time.perf_counter()
+        results = LocalLLMBackend.chat_many(
+            prompts,
+            format=DecisionEngine.OLLAMA_FORMAT,
+            make_parsers=[DecisionEngine._ollama_parser_factory(state, shard) for shard in shards],
+            model=model,
+        )
+
+        outcomes = []
+        for shard, result in zip(shards, results):
+            try:
+                outcomes.append(DecisionEngine._ollama_response(result, shard, started, model))
             except Exception as e:
-                last_error = str(e)
-                time.sleep(1.5 ** attempt)
+                outcomes.append(e)
+        return outcomes
+
+    @staticmethod
+    def generate_mock(state, candidates, market_news=None, model=None, prompts=None):
+        """
+        Deterministic stand-in for the model (see MockLLMBackend), for
+        benchmarking the rest of the flow without an API key or a GPU. The
+        prompts are still built and token-counted, and the call is logged to
+        llm_calls as backend "mock", so everything around the model costs
+        what it does in production.
+
+        model -> mock "model" name, mixed into the seed; defaults to settings.mock_llm_model
+        prompts -> prebuilt (system, user) prompts, e.g. shared by ensemble members
+        """
+        model = model or settings.mock_llm_model
+        system_prompt, user_prompt = prompts or DecisionEngine._prompts(state, candidates, market_news)
+
+        started = time.perf_counter()
+        parsed = MockLLMBackend.decide(state, candidates, model=model)
+        latency = time.perf_counter() - started
+
+        parsed._usage = LLMUsage(
+            calls=1,
+            prompt_tokens=count_tokens(system_prompt) + count_tokens(user_prompt),
+            completion_tokens=count_tokens(parsed.model_dump_json()),
+            latency_seconds=latency,
+        )
+        parsed._model = f"mock:{model}"
+        print(parsed.usage.summary())
+        call_id = LLMTelemetryService.record(
+            backend="mock",
+            model=model,
+            status="ok",
+            latency_seconds=latency,
+            candidates=len(candidates),
+            prompt_tokens=parsed.usage.prompt_tokens,
+            completion_tokens=parsed.usage.completion_tokens,
+        )
+        DecisionEngine._link_call(parsed, call_id)
+        return parsed
+
+    @staticmethod
+    def generate_ensemble(state, candidates, market_news=None, use_cache=None, members=None, budget_seconds=None):
+        """
+        Send one prompt to every ensemble member (settings.llm_ensemble_members)
+        concurrently and combine the answers with DecisionEnsemble.vote, then
+        apply the BUY cap and cash budget with DecisionMerger. Returns as soon
+        as every member has answered, or after `budget_seconds` with whatever
+        has arrived. Members run on daemon threads, so one still running past
+        the budget doesn't vote and doesn't hold up the flow or the process
+        exit; its call is logged only if it finishes while the process lives.
+
+        Raises RuntimeError if no member answered in time.
+        """
+        members = members or parse_members(settings.llm_ensemble_members)
+        if len({m.name for m in members}) != len(members):
+            raise ValueError(f"Duplicate ensemble members: {', '.join(m.name for m in members)}")
+        budget_seconds = budget_seconds or settings.llm_ensemble_budget_seconds
+        prompts = DecisionEngine._prompts(state, candidates, market_news)
+        answers = queue.Queue()
+
+        def run(member):
+            try:
+                if member.backend == "ollama":
+                    response = DecisionEngine.generate_ollama(state, candidates, model=member.model, prompts=prompts)
+                elif member.backend == "mock":
+                    response = DecisionEngine.generate_mock(state, candidates, model=member.model, prompts=prompts)
+                else:
+                    response = DecisionEngine.generate(
+                        state, candidates, use_cache=use_cache, model=member.model, prompts=prompts
+                    )
+                answers.put((member, response, None))
+            except Exception as e:
+                answers.put((member, None, e))
+
+        print(f"Ensemble of {len(members)} models, {budget_seconds:.0f}s budget: {', '.join(m.name for m in members)}")
+        for member in members:
+            threading.Thread(target=run, args=(member,), name=f"ensemble-{member.name}", daemon=True).start()
+
+        deadline = time.monotonic() + budget_seconds
+        responses, answered = {}, set()
+        while len(answered) < len(members):
+            try:
+                member, response, error = answers.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            answered.add(member)
+            if error is not None:
+                print(f"Warning: ensemble member {member.name} failed: {error}")
+            elif response is not None:
+                responses[member] = response
+        for member in members:
+            if member not in answered:
+                print(f"Warning: ensemble member {member.name} missed the {budget_seconds:.0f}s budget")
+
+        if not responses:
+            raise RuntimeError(f"No ensemble member answered within {budget_seconds:.0f}s")
+
+        voted = DecisionEnsemble.vote(responses, members)
+        print(f"Ensemble agreement with the vote: {DecisionEnsemble.member_agreement(voted)}")
+
+        merged = DecisionMerger.merge(
+            [voted],
+            cash_balance=state["cash_balance"],
+            prices=DecisionMerger.price_map(state, candidates),
+            max_buys=settings.llm_max_buys,
+        )
+        merged._usage = LLMUsage.combine([r.usage for r in responses.values()])
+        # Per-member votes are in each decision's ensemble_stats
+        merged._model = "ensemble"
+        return merged
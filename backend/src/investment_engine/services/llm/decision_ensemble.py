@@ -0,0 +1,159 @@
+"""
+Decision Ensemble
+
+Combines the DecisionResponses of several models that saw the same prompt
+into one, by confidence-weighted voting per symbol:
+
+- each responding member votes for the action it chose, with its confidence
+  times its weight; a member that didn't mention a symbol abstains
+- the action with the highest score wins; ties go to the more conservative
+  action (HOLD, then SELL, then BUY)
+- confidence is the winning score over the total weight of all responding
+  members, so a decision only one of three models made is discounted
+- quantity is the confidence-weighted mean of the winners' quantities, and
+  the reasoning is the most confident winner's
+
+Per-symbol agreement stats (every member's vote, who responded and who
+timed out) ride along on each StockDecision and are stored with the
+decision row.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from investment_engine.workflows.schemas.llm_models import DecisionResponse, StockDecision
+
+REASONING_MAX_LENGTH = 300
+
+# Lower wins ties
+ACTION_CAUTION = {"HOLD": 0, "SELL": 1, "BUY": 2}
+
+
+@dataclass(frozen=True)
+class EnsembleMember:
+    backend: str        # openai, ollama, mock
+    model: str
+    weight: float = 1.0
+
+    @property
+    def name(self) -> str:
+        return f"{self.backend}:{self.model}"
+
+
+def parse_members(spec: str) -> List[EnsembleMember]:
+    """
+    'openai:gpt-4.1-mini, ollama:mistral*0.5' -> members; '*w' sets a weight.
+    Each backend:model may appear once: votes and stats are keyed by it.
+    """
+    members = []
+    for item in (part.strip() for part in spec.split(",")):
+        if not item:
+            continue
+        item, _, weight = item.partition("*")
+        backend, _, model = item.partition(":")
+        if backend not in ("openai", "ollama", "mock") or not model:
+            raise ValueError(
+                f"Invalid ensemble member '{item}', expected 'openai:<model>', 'ollama:<model>' or 'mock:<model>'"
+            )
+        member = EnsembleMember(backend=backend, model=model, weight=float(weight) if weight else 1.0)
+        if any(m.name == member.name for m in members):
+            raise ValueError(f"Duplicate ensemble member '{member.name}'; use a weight instead of listing it twice")
+        members.append(member)
+    return members
+
+
+class DecisionEnsemble:
+
+    @staticmethod
+    def vote(
+        responses: Dict[EnsembleMember, DecisionResponse],
+        members: List[EnsembleMember],
+    ) -> DecisionResponse:
+        """
+        responses -> members that answered within the budget
+        members -> every configured member, so stats can name the ones that didn't
+        """
+        responded = [m for m in members if m in responses]
+        total_weight = sum(m.weight for m in responded)
+        timed_out = [m.name for m in members if m not in responses]
+
+        # symbol -> member -> that member's decision
+        ballots: Dict[str, Dict[EnsembleMember, StockDecision]] = {}
+        for member in responded:
+            for decision in responses[member].decisions:
+                symbol = decision.symbol.upper()
+                current = ballots.setdefault(symbol, {}).get(member)
+                # A member listing a symbol twice keeps its most confident answer
+                if current is None or decision.confidence > current.confidence:
+                    ballots[symbol][member] = decision
+
+        decisions = []
+        for symbol in sorted(ballots):
+            votes = ballots[symbol]
+
+            scores: Dict[str, float] = {}
+            for member, decision in votes.items():
+                action = decision.action.upper()
+                scores[action] = scores.get(action, 0.0) + decision.confidence * member.weight
+
+            winner = min(scores, key=lambda action: (-scores[action], ACTION_CAUTION.get(action, 0), action))
+            winners = [(m, d) for m, d in votes.items() if d.action.upper() == winner]
+            winner_weight = sum(d.confidence * m.weight for m, d in winners)
+
+            quantity = int(sum(d.quantity * d.confidence * m.weight for m, d in winners) / winner_weight) if winner_weight else 0
+            _, best = max(winners, key=lambda item: (item[1].confidence * item[0].weight, -members.index(item[0])))
+
+            agree = sum(m.weight for m, _ in winners)
+            reasoning = f"[{len(winners)}/{len(responded)} models agree] {best.reasoning}"[:REASONING_MAX_LENGTH]
+
+            decision = StockDecision(
+                symbol=symbol,
+                action=winner,
+                quantity=quantity if winner != "HOLD" else 0,
+                confidence=round(min(scores[winner] / total_weight, 1.0), 4) if total_weight else 0.0,
+                reasoning=reasoning,
+            )
+            decision._llm_call_id = best._llm_call_id
+            decision._ensemble_stats = DecisionEnsemble._stats(
+                votes, members, responded, timed_out, scores, winner, agree / total_weight if total_weight else 0.0
+            )
+            decisions.append(decision)
+
+        return DecisionResponse(decisions=decisions)
+
+    @staticmethod
+    def _stats(
+        votes: Dict[EnsembleMember, StockDecision],
+        members: List[EnsembleMember],
+        responded: List[EnsembleMember],
+        timed_out: List[str],
+        scores: Dict[str, float],
+        winner: str,
+        agreement: float,
+    ) -> Dict[str, Any]:
+        return {
+            "winner": winner,
+            "agreement": round(agreement, 3),
+            "scores": {action: round(score, 4) for action, score in sorted(scores.items())},
+            "votes": {
+                m.name: (
+                    {"action": votes[m].action.upper(), "confidence": votes[m].confidence, "quantity": votes[m].quantity}
+                    if m in votes else None     # responded but abstained on this symbol
+                )
+                for m in responded
+            },
+            "members": [m.name for m in members],
+            "timed_out": timed_out,
+        }
+
+    @staticmethod
+    def member_agreement(response: DecisionResponse) -> Dict[str, Optional[float]]:
+        """Share of decisions where each member voted with the winner; for the run log."""
+        agreed: Dict[str, int] = {}
+        voted: Dict[str, int] = {}
+        for decision in response.decisions:
+            stats = decision._ensemble_stats or {}
+            for name, vote in stats.get("votes", {}).items():
+                voted[name] = voted.get(name, 0) + 1
+                agreed[name] = agreed.get(name, 0) + int(vote is not None and vote["action"] == stats["winner"])
+        return {name: round(agreed[name] / voted[name], 3) for name in voted}
@@ -0,0 +1,94 @@
+"""
+Decision Merger
+
+Folds the DecisionResponses of a sharded run (one LLM call per group of
+candidates, all sharing the same portfolio context) into a single response
+that respects the constraints a single call would have been asked to keep:
+
+- one decision per symbol; holdings appear in every shard's context, so the
+  most confident decision wins (ties go to the earlier shard)
+- at most `max_buys` BUYs, most confident first
+- BUYs fit in the cash balance; a BUY that doesn't fit is scaled down to the
+  affordable quantity, and one that can't buy a single share becomes HOLD
+
+The result is deterministic for a given list of responses: every ordering
+uses (confidence desc, shard, position) and never completion order.
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+from investment_engine.workflows.schemas.llm_models import DecisionResponse, StockDecision
+
+REASONING_MAX_LENGTH = 300
+
+
+def _demote_to_hold(decision: StockDecision, note: str) -> StockDecision:
+    reasoning = f"[{note}] {decision.reasoning}"[:REASONING_MAX_LENGTH]
+    return decision.model_copy(update={"action": "HOLD", "quantity": 0, "reasoning": reasoning})
+
+
+class DecisionMerger:
+
+    @staticmethod
+    def price_map(state: Dict, candidates: List[Dict]) -> Dict[str, float]:
+        prices = {h["symbol"]: float(h["current_price"]) for h in state.get("holdings", []) if h.get("current_price")}
+        prices.update({c["symbol"]: float(c["current_price"]) for c in candidates if c.get("current_price")})
+        return prices
+
+    @staticmethod
+    def merge(
+        responses: Sequence[Optional[DecisionResponse]],
+        cash_balance: float,
+        prices: Dict[str, float],
+        max_buys: int = 2,
+    ) -> DecisionResponse:
+        """
+        responses -> per-shard results in shard order; None for a failed shard
+        Returns SELLs first (they free cash when executed), then BUYs by
+        confidence, then HOLDs.
+        """
+        # 1. One decision per symbol
+        best: Dict[str, tuple] = {}
+        for shard, response in enumerate(responses):
+            if response is None:
+                continue
+            for position, decision in enumerate(response.decisions):
+                symbol = decision.symbol.upper()
+                rank = (-decision.confidence, shard, position)
+                current = best.get(symbol)
+                if current is None or rank < current[0]:
+                    best[symbol] = (rank, decision.model_copy(update={
+                        "symbol": symbol,
+                        "action": decision.action.upper(),
+                    }))
+
+        ranked = [decision for _, decision in sorted(best.values(), key=lambda item: item[0])]
+
+        sells = [d for d in ranked if d.action == "SELL"]
+        holds = [d for d in ranked if d.action not in ("BUY", "SELL")]
+        buys = []
+
+        # 2. BUY cap and 3. cash budget, most confident first
+        remaining_cash = float(cash_balance)
+        for decision in (d for d in ranked if d.action == "BUY"):
+            if len(buys) >= max_buys:
+                holds.append(_demote_to_hold(decision, f"over the {max_buys}-BUY limit"))
+                continue
+
+            price = prices.get(decision.symbol)
+            if not price:
+                # No price to budget with; the trade step will skip it too
+                buys.append(decision)
+                continue
+
+            quantity = min(decision.quantity, int(remaining_cash // price))
+            if quantity <= 0:
+                holds.append(_demote_to_hold(decision, "no cash left"))
+                continue
+            if quantity < decision.quantity:
+                decision = decision.model_copy(update={"quantity": quantity})
+
+            remaining_cash -= quantity * price
+            buys.append(decision)
+
+        return DecisionResponse(decisions=sells + buys + holds)
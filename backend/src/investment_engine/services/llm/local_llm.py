@@ -0,0 +1,282 @@
+"""
+Local LLM Backend (Ollama)
+
+Managed access to a local Ollama server for DecisionEngine:
+
+- one pooled sync client per process (keep-alive HTTP connections) and an
+  async client per batch for concurrent shard requests, capped at
+  `ollama_max_concurrency` in flight (match OLLAMA_NUM_PARALLEL on the server)
+- `keep_alive` on every request so the model stays loaded between runs, and
+  `warm_up()` to pay the model load once at worker start instead of on the
+  first decision
+- connect/read timeouts per HTTP read, plus a wall-clock deadline per call
+  (`ollama_deadline_seconds`, retries included) so a generation that keeps
+  streaming tokens can't run forever; retries with backoff only for
+  transient failures (connection errors, read timeouts, 5xx); a missing
+  model, a bad request or a spent deadline fails at once
+- with a `make_parser`, the response is streamed into a fresh incremental
+  parser per attempt (see DecisionStreamParser); output that goes invalid
+  aborts the generation right away and counts as a retry
+
+Every failure surfaces as LocalLLMError; nothing returns None.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import httpx
+from ollama import AsyncClient, Client, ResponseError
+
+from investment_engine.settings import settings
+from investment_engine.workflows.utils.parser_helper import StreamParseError
+
+
+class LocalLLMError(RuntimeError):
+    """The local model could not produce a response."""
+
+    def __init__(self, message: str, retries: int = 0):
+        super().__init__(message)
+        self.retries = retries
+
+
+@dataclass
+class LocalLLMResult:
+    content: str
+    prompt_tokens: int
+    completion_tokens: int
+    latency_seconds: float
+    load_seconds: float     # model load time paid by this request; ~0 when warm
+    retries: int
+    parsed: Any = None      # make_parser's close() result when streamed
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(settings.ollama_timeout_seconds, connect=settings.ollama_connect_timeout_seconds)
+
+
+@lru_cache(maxsize=1)
+def _client() -> Client:
+    return Client(host=settings.ollama_host, timeout=_timeout())
+
+
+def _is_transient(error: Exception) -> bool:
+    if isinstance(error, ResponseError):
+        return error.status_code >= 500 or error.status_code == 429
+    return isinstance(error, (ConnectionError, httpx.TransportError, StreamParseError))
+
+
+class LocalLLMBackend:
+
+    @staticmethod
+    def _request(
+        system_prompt: str,
+        user_prompt: str,
+        format: Union[str, Dict[str, Any], None],
+        stream: bool = False,
+        model: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        return dict(
+            model=model or settings.ollama_model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            format=format,
+            options={"temperature": settings.ollama_temperature},
+            keep_alive=settings.ollama_keep_alive,
+            stream=stream,
+        )
+
+    @staticmethod
+    def _result(response, started: float, retries: int, content: Optional[str] = None, parsed: Any = None) -> LocalLLMResult:
+        return LocalLLMResult(
+            content=response.message.content or "" if content is None else content,
+            prompt_tokens=response.prompt_eval_count or 0,
+            completion_tokens=response.eval_count or 0,
+            latency_seconds=time.perf_counter() - started,
+            load_seconds=(response.load_duration or 0) / 1e9,
+            retries=retries,
+            parsed=parsed,
+        )
+
+    @staticmethod
+    def _consume(stream, parser, started: float, retries: int, deadline: float) -> LocalLLMResult:
+        content, final = [], None
+        try:
+            for chunk in stream:
+                if time.perf_counter() > deadline:
+                    raise TimeoutError(f"generation still streaming after {settings.ollama_deadline_seconds:.0f}s")
+                piece = chunk.message.content or ""
+                content.append(piece)
+                parser.feed(piece)
+                if chunk.done:
+                    final = chunk
+        finally:
+            # Dropping out early closes the HTTP response, which stops generation on the server
+            stream.close()
+        if final is None:
+            raise StreamParseError("stream ended without a final chunk")
+        return LocalLLMBackend._result(final, started, retries, "".join(content), parser.close())
+
+    @staticmethod
+    async def _aconsume(stream, parser, started: float, retries: int) -> LocalLLMResult:
+        content, final = [], None
+        try:
+            async for chunk in stream:
+                piece = chunk.message.content or ""
+                content.append(piece)
+                parser.feed(piece)
+                if chunk.done:
+                    final = chunk
+        finally:
+            await stream.aclose()
+        if final is None:
+            raise StreamParseError("stream ended without a final chunk")
+        return LocalLLMBackend._result(final, started, retries, "".join(content), parser.close())
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        return settings.ollama_retry_backoff_seconds * 2 ** attempt
+
+    @staticmethod
+    def _remaining(deadline: float) -> float:
+        """Seconds left before `deadline`; raises TimeoutError (not retried) once it has passed."""
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            raise TimeoutError(f"no response within the {settings.ollama_deadline_seconds:.0f}s deadline")
+        return remaining
+
+    @staticmethod
+    def chat(
+        system_prompt: str,
+        user_prompt: str,
+        format: Union[str, Dict[str, Any], None] = None,
+        make_parser: Optional[Callable[[], Any]] = None,
+        model: Optional[str] = None,
+    ) -> LocalLLMResult:
+        """
+        One chat request on the pooled client; raises LocalLLMError.
+
+        format -> "json" or a JSON schema the output is constrained to
+        make_parser -> builds a parser with feed(chunk) / close(); streams the
+                       response through it and returns close() as `parsed`
+        """
+        model = model or settings.ollama_model
+        request = LocalLLMBackend._request(system_prompt, user_prompt, format, stream=make_parser is not None, model=model)
+        started = time.perf_counter()
+        deadline = started + settings.ollama_deadline_seconds
+
+        for attempt in range(settings.ollama_max_retries + 1):
+            try:
+                LocalLLMBackend._remaining(deadline)
+                if make_parser is not None:
+                    stream = _client().chat(**request)
+                    return LocalLLMBackend._consume(stream, make_parser(), started, attempt, deadline)
+                # Ollama sends a non-streamed reply in one piece, so the read timeout bounds it
+                response = _client().chat(**request)
+                return LocalLLMBackend._result(response, started, attempt)
+            except Exception as e:
+                if not _is_transient(e) or attempt == settings.ollama_max_retries:
+                    raise LocalLLMError(
+                        f"Ollama {model} failed after {attempt + 1} attempt(s): {e}",
+                        retries=attempt,
+                    ) from e
+                print(f"Ollama request failed ({e}), retrying")
+                if not isinstance(e, StreamParseError):
+                    time.sleep(min(LocalLLMBackend._backoff(attempt), max(deadline - time.perf_counter(), 0)))
+
+    @staticmethod
+    async def _achat(
+        client: AsyncClient,
+        semaphore: asyncio.Semaphore,
+        system_prompt: str,
+        user_prompt: str,
+        format: Union[str, Dict[str, Any], None],
+        make_parser: Optional[Callable[[], Any]],
+        model: str,
+    ) -> LocalLLMResult:
+        request = LocalLLMBackend._request(system_prompt, user_prompt, format, stream=make_parser is not None, model=model)
+
+        async def attempt_once(attempt: int, started: float, deadline: float) -> LocalLLMResult:
+            async def request_and_consume() -> LocalLLMResult:
+                if make_parser is not None:
+                    stream = await client.chat(**request)
+                    return await LocalLLMBackend._aconsume(stream, make_parser(), started, attempt)
+                response = await client.chat(**request)
+                return LocalLLMBackend._result(response, started, attempt)
+
+            try:
+                # Cancelling the attempt closes its stream (see _aconsume)
+                return await asyncio.wait_for(request_and_consume(), timeout=LocalLLMBackend._remaining(deadline))
+            except asyncio.TimeoutError as e:
+                raise TimeoutError(f"generation still running after {settings.ollama_deadline_seconds:.0f}s") from e
+
+        async with semaphore:
+            started = time.perf_counter()
+            deadline = started + settings.ollama_deadline_seconds
+            for attempt in range(settings.ollama_max_retries + 1):
+                try:
+                    return await attempt_once(attempt, started, deadline)
+                except Exception as e:
+                    if not _is_transient(e) or attempt == settings.ollama_max_retries:
+                        raise LocalLLMError(
+                            f"Ollama {model} failed after {attempt + 1} attempt(s): {e}",
+                            retries=attempt,
+                        ) from e
+                    print(f"Ollama request failed ({e}), retrying")
+                    if not isinstance(e, StreamParseError):
+                        await asyncio.sleep(min(LocalLLMBackend._backoff(attempt), max(deadline - time.perf_counter(), 0)))
+
+    @staticmethod
+    async def _chat_all(
+        prompts: Sequence[Tuple[str, str]],
+        format: Union[str, Dict[str, Any], None],
+        make_parsers: Sequence[Optional[Callable[[], Any]]],
+        model: str,
+    ) -> List[Union[LocalLLMResult, LocalLLMError]]:
+        semaphore = asyncio.Semaphore(settings.ollama_max_concurrency)
+        async with AsyncClient(host=settings.ollama_host, timeout=_timeout()) as client:
+            return await asyncio.gather(
+                *(
+                    LocalLLMBackend._achat(client, semaphore, system, user, format, make_parser, model)
+                    for (system, user), make_parser in zip(prompts, make_parsers)
+                ),
+                return_exceptions=True,
+            )
+
+    @staticmethod
+    def chat_many(
+        prompts: Sequence[Tuple[str, str]],
+        format: Union[str, Dict[str, Any], None] = None,
+        make_parsers: Optional[Sequence[Optional[Callable[[], Any]]]] = None,
+        model: Optional[str] = None,
+    ) -> List[Union[LocalLLMResult, LocalLLMError]]:
+        """
+        (system, user) prompt pairs sent concurrently on one async client,
+        each with its own make_parser (see chat). Returns a result or a
+        LocalLLMError per prompt, in input order.
+        """
+        model = model or settings.ollama_model
+        make_parsers = make_parsers or [None] * len(prompts)
+        results = asyncio.run(LocalLLMBackend._chat_all(prompts, format, make_parsers, model))
+        return [
+            r if isinstance(r, (LocalLLMResult, LocalLLMError)) else LocalLLMError(str(r))
+            for r in results
+        ]
+
+    @staticmethod
+    def warm_up(model: Optional[str] = None) -> float:
+        """
+        Load the model into memory and pin it for `ollama_keep_alive`; an
+        empty prompt makes Ollama load without generating. Returns the load
+        time in seconds (~0 if it was already loaded).
+        """
+        model = model or settings.ollama_model
+        try:
+            response = _client().generate(model=model, prompt="", keep_alive=settings.ollama_keep_alive)
+        except Exception as e:
+            raise LocalLLMError(f"Could not warm up Ollama model {model} at {settings.ollama_host}: {e}") from e
+        return (response.load_duration or 0) / 1e9
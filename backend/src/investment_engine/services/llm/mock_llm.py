@@ -0,0 +1,127 @@
+"""
+Mock LLM Backend
+
+A deterministic stand-in for the decision model, for profiling and load
+testing the flow offline. Decisions come from a small rule set over the
+same candidates and holdings the real model would see, so they look like
+real output (schema-valid, at most two BUYs, sized to the cash balance):
+
+- holdings: take profits above +10%, cut losses below -10%, otherwise HOLD
+- candidates: score = daily move + SMA-20 / RSI-14, Reddit sentiment and
+  news signals + seeded jitter; the two best scores above the bar are BUYs
+- everything else is HOLD
+
+The same seed and inputs always give the same decisions. Simulated latency
+(`mock_llm_latency_ms` ± `mock_llm_latency_jitter_ms`) is drawn from the
+same seeded generator.
+"""
+
+import hashlib
+import random
+import time
+from typing import Dict, List, Optional
+
+from investment_engine.settings import settings
+from investment_engine.workflows.schemas.llm_models import DecisionResponse, StockDecision
+
+MAX_BUYS = 2
+BUY_SCORE_THRESHOLD = 2.0
+# Fraction of cash a single BUY may use
+POSITION_CASH_FRACTION = 0.1
+
+
+def _rng(seed: int, model: str, state: Dict, candidates: List[Dict]) -> random.Random:
+    """Seeded by the inputs, so a given run replays exactly"""
+    key = "|".join(
+        [str(seed), model, f"{state.get('cash_balance', 0):.2f}"]
+        + [f"{c['symbol']}:{c.get('current_price')}" for c in candidates]
+        + [f"{h['symbol']}:{h.get('quantity')}" for h in state.get("holdings", [])]
+    )
+    return random.Random(int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big"))
+
+
+def _score(stock: Dict, rng: random.Random) -> float:
+    score = stock.get("daily_change_pct", 0.0)
+
+    indicators = stock.get("indicators") or {}
+    sma_20, rsi_14 = indicators.get("sma_20"), indicators.get("rsi_14")
+    if sma_20:
+        score += 1.0 if stock.get("current_price", 0.0) > sma_20 else -1.0
+    if rsi_14 is not None:
+        score += 1.0 if rsi_14 < 30 else -1.0 if rsi_14 > 70 else 0.0
+
+    reddit = stock.get("reddit") or {}
+    score += 2.0 * reddit.get("avg_sentiment", 0.0)
+    score += 0.25 * (len(stock.get("news", [])) + len(stock.get("news_refs", [])))
+
+    return score + rng.uniform(-0.5, 0.5)
+
+
+class MockLLMBackend:
+
+    @staticmethod
+    def decide(
+        state: Dict, candidates: List[Dict], model: Optional[str] = None, seed: Optional[int] = None
+    ) -> DecisionResponse:
+        """
+        model -> mixed into the seed, so ensemble members named differently
+                 ("mock:a", "mock:b") disagree like real models would
+        seed -> defaults to settings.mock_llm_seed
+        """
+        model = model or settings.mock_llm_model
+        seed = settings.mock_llm_seed if seed is None else seed
+        rng = _rng(seed, model, state, candidates)
+        decisions = []
+
+        holdings = {h["symbol"]: h for h in state.get("holdings", [])}
+        for symbol, h in holdings.items():
+            pnl_pct = h.get("unrealized_pnl_pct", 0.0)
+            quantity = int(h.get("quantity", 0))
+            if pnl_pct > 10 and quantity > 1:
+                decisions.append(StockDecision(
+                    symbol=symbol, action="SELL", quantity=quantity // 2, confidence=0.7,
+                    reasoning=f"Up {pnl_pct:.1f}%; taking partial profits.",
+                ))
+            elif pnl_pct < -10 and quantity > 0:
+                decisions.append(StockDecision(
+                    symbol=symbol, action="SELL", quantity=quantity, confidence=0.6,
+                    reasoning=f"Down {pnl_pct:.1f}%; cutting the loss.",
+                ))
+            else:
+                decisions.append(StockDecision(
+                    symbol=symbol, action="HOLD", quantity=0, confidence=0.55,
+                    reasoning=f"P&L {pnl_pct:+.1f}% is within the holding range.",
+                ))
+
+        ranked = sorted(
+            ((_score(stock, rng), stock) for stock in candidates if stock["symbol"] not in holdings),
+            key=lambda item: (-item[0], item[1]["symbol"]),
+        )
+
+        cash = float(state.get("cash_balance", 0.0))
+        buys = 0
+        for score, stock in ranked:
+            price = float(stock.get("current_price") or 0.0)
+            quantity = int(cash * POSITION_CASH_FRACTION // price) if price > 0 else 0
+
+            if buys < MAX_BUYS and score >= BUY_SCORE_THRESHOLD and quantity > 0:
+                buys += 1
+                cash -= quantity * price
+                decisions.append(StockDecision(
+                    symbol=stock["symbol"], action="BUY", quantity=quantity,
+                    confidence=round(min(0.6 + score / 20, 0.9), 2),
+                    reasoning=f"Signal score {score:.2f} above {BUY_SCORE_THRESHOLD}; sized to 10% of cash.",
+                ))
+            else:
+                decisions.append(StockDecision(
+                    symbol=stock["symbol"], action="HOLD", quantity=0, confidence=0.5,
+                    reasoning=f"Signal score {score:.2f}; not compelling enough to buy.",
+                ))
+
+        latency = settings.mock_llm_latency_ms + rng.uniform(
+            -settings.mock_llm_latency_jitter_ms, settings.mock_llm_latency_jitter_ms
+        )
+        if latency > 0:
+            time.sleep(latency / 1000)
+
+        return DecisionResponse(decisions=decisions)
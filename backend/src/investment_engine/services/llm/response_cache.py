@@ -0,0 +1,95 @@
+"""
+LLM Response Cache
+
+Content-addressed cache of parsed DecisionEngine responses in Postgres.
+The key is a sha256 over the model, temperature, response JSON schema and
+the exact prompts, so a Prefect retry or manual rerun with byte-identical
+input is answered from the cache; any change to the prompt, model or schema
+is a miss.
+
+Entries expire after `llm_cache_ttl_seconds` and the table is trimmed to
+the newest `llm_cache_max_entries` on every write.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from investment_engine.db.models.llm_response_cache import LLMResponseCache
+from investment_engine.db.session import session_scope
+from investment_engine.settings import settings
+
+
+class LLMResponseCacheService:
+
+    @staticmethod
+    def make_key(
+        model: str,
+        temperature: float,
+        schema: Dict[str, Any],
+        system_prompt: str,
+        user_prompt: str,
+    ) -> str:
+        payload = json.dumps(
+            {
+                "model": model,
+                "temperature": temperature,
+                "schema": schema,
+                "system": system_prompt,
+                "user": user_prompt,
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def get(key: str) -> Optional[str]:
+        """Cached response JSON if present and within the TTL."""
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.llm_cache_ttl_seconds)
+        with session_scope() as session:
+            response = session.scalar(
+                select(LLMResponseCache.response).where(
+                    LLMResponseCache.key == key,
+                    LLMResponseCache.created_at >= cutoff,
+                )
+            )
+            if response is not None:
+                session.execute(
+                    update(LLMResponseCache)
+                    .where(LLMResponseCache.key == key)
+                    .values(hits=LLMResponseCache.hits + 1, last_hit_at=datetime.utcnow())
+                )
+            return response
+
+    @staticmethod
+    def put(key: str, model: str, response: str) -> None:
+        """Store (or refresh) a response, then evict expired and excess entries."""
+        now = datetime.utcnow()
+        cutoff = now - timedelta(seconds=settings.llm_cache_ttl_seconds)
+
+        with session_scope() as session:
+            session.execute(
+                insert(LLMResponseCache)
+                .values(key=key, model=model, response=response, hits=0, created_at=now)
+                .on_conflict_do_update(
+                    index_elements=[LLMResponseCache.key],
+                    set_={"response": response, "model": model, "hits": 0, "created_at": now},
+                )
+            )
+
+            session.execute(delete(LLMResponseCache).where(LLMResponseCache.created_at < cutoff))
+
+            # Size bound: keep only the newest entries
+            newest = (
+                select(LLMResponseCache.key)
+                .order_by(LLMResponseCache.created_at.desc())
+                .limit(settings.llm_cache_max_entries)
+            )
+            session.execute(
+                delete(LLMResponseCache).where(LLMResponseCache.key.not_in(newest))
+            )
@@ -0,0 +1,149 @@
+"""
+LLM Telemetry
+
+Every DecisionEngine call (OpenAI or Ollama, including response-cache hits
+and failures) is logged to llm_calls with its tokens, latency, retries and
+estimated cost, and the decisions it produced point back at it through
+decisions.llm_call_id. The summary answers "did this prompt change or model
+switch make runs slower or more expensive": p50/p95 latency and token
+averages overall and per day.
+
+Recording is best effort: a telemetry failure is logged and never fails
+the decision run.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import Integer, cast, func, select
+
+from investment_engine.db.models.llm_calls import LLMCall
+from investment_engine.db.session import session_scope
+
+# USD per 1M tokens: (input, cached input, output); models not listed cost 0 (local)
+MODEL_PRICING = {
+    "gpt-4.1": (2.00, 0.50, 8.00),
+    "gpt-4.1-mini": (0.40, 0.10, 1.60),
+    "gpt-4.1-nano": (0.10, 0.025, 0.40),
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+}
+
+
+def estimate_cost(model: str, prompt_tokens: int, cached_tokens: int, completion_tokens: int) -> float:
+    input_price, cached_price, output_price = MODEL_PRICING.get(model, (0.0, 0.0, 0.0))
+    uncached = max(prompt_tokens - cached_tokens, 0)
+    return (uncached * input_price + cached_tokens * cached_price + completion_tokens * output_price) / 1_000_000
+
+
+class LLMTelemetryService:
+
+    @staticmethod
+    def record(
+        backend: str,
+        model: str,
+        status: str,
+        latency_seconds: float,
+        candidates: int = 0,
+        prompt_tokens: int = 0,
+        cached_tokens: int = 0,
+        completion_tokens: int = 0,
+        retries: int = 0,
+        error: Optional[str] = None,
+    ) -> Optional[int]:
+        """Log one call; returns the llm_calls id, or None if it could not be written."""
+        try:
+            with session_scope() as session:
+                row = LLMCall(
+                    backend=backend,
+                    model=model,
+                    status=status,
+                    candidates=candidates,
+                    prompt_tokens=prompt_tokens,
+                    cached_tokens=cached_tokens,
+                    completion_tokens=completion_tokens,
+                    latency_ms=round(latency_seconds * 1000, 1),
+                    retries=retries,
+                    cost_usd=estimate_cost(model, prompt_tokens, cached_tokens, completion_tokens),
+                    error=error[:2000] if error else None,
+                )
+                session.add(row)
+                session.flush()
+                return row.id
+        except Exception as e:
+            print(f"Warning: could not record LLM call telemetry: {e}")
+            return None
+
+    @staticmethod
+    def _aggregates():
+        return (
+            func.count(LLMCall.id).label("calls"),
+            func.sum(cast(LLMCall.status == "error", Integer)).label("errors"),
+            func.sum(cast(LLMCall.status == "response_cache_hit", Integer)).label("response_cache_hits"),
+            func.percentile_cont(0.5).within_group(LLMCall.latency_ms).label("p50_latency_ms"),
+            func.percentile_cont(0.95).within_group(LLMCall.latency_ms).label("p95_latency_ms"),
+            func.avg(LLMCall.prompt_tokens).label("avg_prompt_tokens"),
+            func.avg(LLMCall.cached_tokens).label("avg_cached_tokens"),
+            func.avg(LLMCall.completion_tokens).label("avg_completion_tokens"),
+            func.sum(LLMCall.retries).label("retries"),
+            func.sum(LLMCall.cost_usd).label("cost_usd"),
+        )
+
+    @staticmethod
+    def _row(row) -> Dict[str, Any]:
+        def num(value, digits=1):
+            return round(float(value), digits) if value is not None else None
+
+        return {
+            "calls": row.calls,
+            "errors": int(row.errors or 0),
+            "response_cache_hits": int(row.response_cache_hits or 0),
+            "p50_latency_ms": num(row.p50_latency_ms),
+            "p95_latency_ms": num(row.p95_latency_ms),
+            "avg_prompt_tokens": num(row.avg_prompt_tokens),
+            "avg_cached_tokens": num(row.avg_cached_tokens),
+            "avg_completion_tokens": num(row.avg_completion_tokens),
+            "retries": int(row.retries or 0),
+            "cost_usd": num(row.cost_usd or 0, 4),
+        }
+
+    @staticmethod
+    def summary(days: int = 14, model: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Totals and per-day trend over the last `days` days. Latency
+        percentiles cover API calls only; response-cache hits would drag them
+        toward zero.
+        """
+        since = datetime.utcnow() - timedelta(days=days)
+        filters = [LLMCall.created_at >= since]
+        if model:
+            filters.append(LLMCall.model == model)
+
+        day = func.date_trunc("day", LLMCall.created_at).label("day")
+
+        with session_scope() as session:
+            total = session.execute(select(*LLMTelemetryService._aggregates()).where(*filters)).one()
+            latency = session.execute(
+                select(
+                    func.percentile_cont(0.5).within_group(LLMCall.latency_ms),
+                    func.percentile_cont(0.95).within_group(LLMCall.latency_ms),
+                ).where(*filters, LLMCall.status != "response_cache_hit")
+            ).one()
+            per_day = session.execute(
+                select(day, *LLMTelemetryService._aggregates())
+                .where(*filters, LLMCall.status != "response_cache_hit")
+                .group_by(day)
+                .order_by(day)
+            ).all()
+            per_model = session.execute(
+                select(LLMCall.model, *LLMTelemetryService._aggregates())
+                .where(*filters, LLMCall.status != "response_cache_hit")
+                .group_by(LLMCall.model)
+                .order_by(LLMCall.model)
+            ).all()
+
+        result = {"days": days, "model": model, **LLMTelemetryService._row(total)}
+        result["p50_latency_ms"] = round(float(latency[0]), 1) if latency[0] is not None else None
+        result["p95_latency_ms"] = round(float(latency[1]), 1) if latency[1] is not None else None
+        result["by_model"] = [{"model": row.model, **LLMTelemetryService._row(row)} for row in per_model]
+        result["trend"] = [{"day": row.day.date().isoformat(), **LLMTelemetryService._row(row)} for row in per_day]
+        return result
@@ -0,0 +1,133 @@
+"""
+News Cache Service
+
+Postgres-backed cache of MarketAux articles per symbol. Symbols fetched
+within `news_cache_ttl_seconds` are served entirely from the cache; stale
+symbols only ask MarketAux for articles newer than the latest cached one.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from investment_engine.db.models.news_articles import NewsArticle, NewsFetchState
+from investment_engine.db.session import session_scope
+from investment_engine.settings import settings
+
+
+class NewsCacheService:
+
+    @staticmethod
+    def _parse_published_at(value: Optional[str]) -> Optional[datetime]:
+        """MarketAux timestamps (e.g. 2024-05-02T09:15:00.000000Z) as naive UTC."""
+        if not value:
+            return None
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        return parsed
+
+    @staticmethod
+    def get_fetch_states(symbols: List[str]) -> Dict[str, NewsFetchState]:
+        """Last fetch time and newest cached article per symbol (missing if never fetched)."""
+        if not symbols:
+            return {}
+        with session_scope() as session:
+            rows = session.scalars(
+                select(NewsFetchState).where(NewsFetchState.symbol.in_(symbols))
+            ).all()
+            return {row.symbol: row for row in rows}
+
+    @staticmethod
+    def is_fresh(state: Optional[NewsFetchState]) -> bool:
+        if state is None:
+            return False
+        age = (datetime.utcnow() - state.fetched_at).total_seconds()
+        return age <= settings.news_cache_ttl_seconds
+
+    @staticmethod
+    def get_recent_articles(symbols: List[str], limit: int = 3) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        The `limit` newest cached articles per symbol within the news
+        lookback window, in the same shape MarketAuxClient returns.
+        """
+        result = {symbol: [] for symbol in symbols}
+        if not symbols:
+            return result
+
+        since = datetime.utcnow() - timedelta(days=settings.news_lookback_days)
+        ranked = (
+            select(
+                NewsArticle,
+                func.row_number().over(
+                    partition_by=NewsArticle.symbol,
+                    order_by=NewsArticle.published_at.desc(),
+                ).label("rank"),
+            )
+            .where(NewsArticle.symbol.in_(symbols), NewsArticle.published_at >= since)
+            .subquery()
+        )
+
+        with session_scope() as session:
+            rows = session.execute(
+                select(ranked)
+                .where(ranked.c.rank <= limit)
+                .order_by(ranked.c.symbol, ranked.c.published_at.desc())
+            ).all()
+
+            for row in rows:
+                result[row.symbol].append({
+                    "title": row.title,
+                    "description": row.description,
+                    "url": row.url,
+                    "published_at": row.published_at.strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+                    "source": row.source,
+                })
+        return result
+
+    @staticmethod
+    def store(symbol: str, articles: List[Dict[str, Any]]) -> None:
+        """
+        Insert new articles for `symbol` (already cached URLs are ignored)
+        and mark the symbol as fetched now.
+        """
+        now = datetime.utcnow()
+        rows = []
+        for article in articles:
+            published_at = NewsCacheService._parse_published_at(article.get("published_at"))
+            if not article.get("url") or published_at is None:
+                continue
+            rows.append({
+                "symbol": symbol,
+                "url": article["url"],
+                "title": article.get("title"),
+                "description": article.get("description"),
+                "source": article.get("source"),
+                "published_at": published_at,
+                "fetched_at": now,
+            })
+
+        with session_scope() as session:
+            if rows:
+                session.execute(
+                    insert(NewsArticle)
+                    .values(rows)
+                    .on_conflict_do_nothing(constraint="uq_news_articles_symbol_url")
+                )
+
+            latest = session.scalar(
+                select(func.max(NewsArticle.published_at)).where(NewsArticle.symbol == symbol)
+            )
+            session.execute(
+                insert(NewsFetchState)
+                .values(symbol=symbol, fetched_at=now, latest_published_at=latest)
+                .on_conflict_do_update(
+                    index_elements=[NewsFetchState.symbol],
+                    set_={"fetched_at": now, "latest_published_at": latest},
+                )
+            )
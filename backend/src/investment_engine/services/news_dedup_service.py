@@ -0,0 +1,123 @@
+"""
+News Dedup Service
+
+Sector-wide stories (RBI policy, budget, index moves) come back for several
+candidates, often syndicated under slightly different headlines. This
+groups articles that are the same story, by normalized URL or by a 64-bit
+SimHash over character shingles of the title, so that each story is
+rendered once in the prompt:
+
+- stories attached to two or more candidates move to a shared market_news
+  list and the candidates keep only their ids in `news_refs`
+- stories unique to one candidate stay in its `news`, minus repeats
+"""
+
+import hashlib
+import re
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+SHINGLE_SIZE = 4
+HASH_BITS = 64
+
+# Titles whose SimHashes differ in at most this many bits are the same story
+MAX_HAMMING_DISTANCE = 3
+
+
+def _normalize_url(url: Optional[str]) -> Optional[str]:
+    """Scheme, query string, fragment, "www." and trailing slash don't make a different article."""
+    if not url:
+        return None
+    parts = urlsplit(url.strip().lower())
+    host = parts.netloc[4:] if parts.netloc.startswith("www.") else parts.netloc
+    return f"{host}{parts.path.rstrip('/')}"
+
+
+def _normalize_title(title: Optional[str]) -> str:
+    return " ".join(re.sub(r"[^a-z0-9 ]", " ", (title or "").lower()).split())
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash of the character shingles of `text`."""
+    if len(text) <= SHINGLE_SIZE:
+        shingles = [text] if text else []
+    else:
+        shingles = {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+    weights = [0] * HASH_BITS
+    for shingle in shingles:
+        value = int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "big")
+        for bit in range(HASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+class NewsDedupService:
+
+    @staticmethod
+    def _same_story(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+        if a["url_key"] and a["url_key"] == b["url_key"]:
+            return True
+        if not a["title_key"] or not b["title_key"]:
+            return False
+        return bin(a["title_hash"] ^ b["title_hash"]).count("1") <= MAX_HAMMING_DISTANCE
+
+    @staticmethod
+    def dedupe(candidates: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Returns (candidates, market_news).
+
+        Each candidate is copied with `news` reduced to its unique stories
+        and `news_refs` listing the market_news ids it shares. Each
+        market_news item is the first copy of a shared story plus an `id`
+        and the `symbols` it relates to.
+        """
+        stories: List[Dict[str, Any]] = []
+        # Story indexes per candidate, in article order
+        candidate_stories: List[List[int]] = []
+
+        for stock in candidates:
+            indexes = []
+            for article in stock.get("news", []):
+                title_key = _normalize_title(article.get("title"))
+                entry = {
+                    "url_key": _normalize_url(article.get("url")),
+                    "title_key": title_key,
+                    "title_hash": simhash(title_key),
+                }
+                index = next((i for i, story in enumerate(stories) if NewsDedupService._same_story(story, entry)), None)
+                if index is None:
+                    index = len(stories)
+                    stories.append({**entry, "article": article, "symbols": []})
+                if index in indexes:
+                    continue
+                indexes.append(index)
+                stories[index]["symbols"].append(stock["symbol"])
+            candidate_stories.append(indexes)
+
+        # Shared stories get ids in first-seen order
+        story_ids = {}
+        market_news = []
+        for index, story in enumerate(stories):
+            if len(story["symbols"]) < 2:
+                continue
+            story_ids[index] = f"N{len(market_news) + 1}"
+            market_news.append({**story["article"], "id": story_ids[index], "symbols": story["symbols"]})
+
+        deduped = []
+        for stock, indexes in zip(candidates, candidate_stories):
+            deduped.append({
+                **stock,
+                "news": [stories[i]["article"] for i in indexes if i not in story_ids],
+                "news_refs": [story_ids[i] for i in indexes if i in story_ids],
+            })
+
+        article_count = sum(len(stock.get("news", [])) for stock in candidates)
+        rendered = len(stories)
+        if article_count:
+            print(
+                f"News dedup: {article_count} articles -> {rendered} stories "
+                f"({len(market_news)} shared across candidates)"
+            )
+        return deduped, market_news
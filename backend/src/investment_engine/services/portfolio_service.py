@@ -122,8 +122,18 @@ class PortfolioService:
             }
 
     @staticmethod
-    def get_current_portfolio_state(portfolio_id: Optional[int] = None, current_prices: Optional[Dict[str, float]] = None) -> PortfolioState:
-        """Get the current portfolio state with real-time market valuation"""
+    def get_current_portfolio_state(
+        portfolio_id: Optional[int] = None,
+        current_prices: Optional[Dict[str, float]] = None,
+        market_data_timestamp: Optional[datetime] = None,
+    ) -> PortfolioState:
+        """
+        Get the current portfolio state with real-time market valuation
+
+        Args:
+            market_data_timestamp: when `current_prices` were fetched (e.g. from the
+                                   price cache); defaults to now if prices are given
+        """
         with session_scope() as session:
             # Get the first portfolio if no ID specified
             if portfolio_id is None:
@@ -214,10 +224,26 @@ class PortfolioService:
                 unrealized_pnl=total_unrealized_pnl,
                 unrealized_pnl_pct=total_unrealized_pnl_pct,
                 snapshot_date=latest_snapshot.created_at,
-                market_data_timestamp=datetime.utcnow() if current_prices else None,
+                market_data_timestamp=(market_data_timestamp or datetime.utcnow()) if current_prices else None,
                 positions=position_list
             )
 
+    @staticmethod
+    def get_latest_snapshot_date(portfolio_id: Optional[int] = None) -> Optional[datetime]:
+        """Creation time of the latest snapshot; changes whenever positions do"""
+        with session_scope() as session:
+            if portfolio_id is None:
+                portfolio = session.query(Portfolio).first()
+                if not portfolio:
+                    return None
+                portfolio_id = portfolio.id
+
+            return (
+                session.query(func.max(PortfolioSnapshot.created_at))
+                .filter(PortfolioSnapshot.portfolio_id == portfolio_id)
+                .scalar()
+            )
+
     @staticmethod
     def get_portfolio_value_history(days: int = 30, portfolio_id: Optional[int] = None) -> PortfolioValueHistory:
         """Get portfolio value history for the specified number of days"""
@@ -0,0 +1,88 @@
+"""
+Price Cache Service
+
+Process-wide cache of the latest NIFTY 50 prices for the real-time API
+endpoints. Cached prices are served immediately; once they are older than
+`price_cache_ttl_seconds` a single background refresh is started and the
+stale prices keep being served until it completes.
+"""
+
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from investment_engine.services.data_sources.market_client import MarketDataClient
+from investment_engine.settings import settings
+from investment_engine.workflows.utils.nifty_50 import NIFTY_50
+
+
+class PriceCacheService:
+
+    _prices: Dict[str, float] = {}
+    _fetched_at: Optional[datetime] = None
+
+    # Serializes fetches so concurrent callers never trigger duplicate downloads
+    _refresh_lock = threading.Lock()
+
+    @staticmethod
+    def _age_seconds() -> Optional[float]:
+        if PriceCacheService._fetched_at is None:
+            return None
+        return (datetime.utcnow() - PriceCacheService._fetched_at).total_seconds()
+
+    @staticmethod
+    def _is_fresh() -> bool:
+        age = PriceCacheService._age_seconds()
+        return age is not None and age <= settings.price_cache_ttl_seconds
+
+    @staticmethod
+    def refresh() -> None:
+        """Fetch prices synchronously, keeping the previous prices on failure."""
+        with PriceCacheService._refresh_lock:
+            # Another caller may have refreshed while we waited for the lock
+            if PriceCacheService._is_fresh():
+                return
+
+            try:
+                market_data = MarketDataClient.get_market_snapshot(
+                    NIFTY_50,
+                    max_age_seconds=settings.price_cache_ttl_seconds,
+                )
+            except Exception as e:
+                print(f"Warning: price cache refresh failed, serving stale prices: {e}")
+                return
+
+            prices = dict(market_data.prices)
+            if not prices:
+                print("Warning: price cache refresh returned no prices, serving stale prices")
+                return
+
+            PriceCacheService._prices = prices
+            PriceCacheService._fetched_at = datetime.utcnow()
+
+    @staticmethod
+    def refresh_in_background() -> None:
+        """Start a refresh on a daemon thread unless one is already running."""
+        if PriceCacheService._refresh_lock.locked():
+            return
+        threading.Thread(
+            target=PriceCacheService.refresh,
+            name="price-cache-refresh",
+            daemon=True,
+        ).start()
+
+    @staticmethod
+    def get_prices() -> Tuple[Optional[Dict[str, float]], Optional[datetime]]:
+        """
+        Returns (prices, fetched_at).
+
+        Only a cold cache blocks on the network; stale prices are returned
+        as-is while a background refresh runs. Prices are None if nothing
+        could be fetched yet.
+        """
+        if PriceCacheService._fetched_at is None:
+            PriceCacheService.refresh()
+        elif not PriceCacheService._is_fresh():
+            PriceCacheService.refresh_in_background()
+
+        return (PriceCacheService._prices or None), PriceCacheService._fetched_at
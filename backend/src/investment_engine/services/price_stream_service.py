@@ -0,0 +1,176 @@
+"""
+Price Stream Service
+
+One background loop inside the API process that keeps the default
+portfolio valued at live prices and pushes changes to any number of
+Server-Sent Events subscribers.
+
+Each tick reads the shared price cache and revalues only the positions
+whose price moved. The full state is rebuilt from the database only when a
+new portfolio snapshot appears, i.e. after the daily flow traded.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Dict, Optional, Set
+
+from fastapi.concurrency import run_in_threadpool
+
+from investment_engine.schemas.portfolio import PortfolioState, PortfolioValueUpdate, Position
+from investment_engine.services.portfolio_service import PortfolioService
+from investment_engine.services.price_cache_service import PriceCacheService
+from investment_engine.settings import settings
+
+
+class PriceStreamService:
+
+    _task: Optional[asyncio.Task] = None
+    _subscribers: Set[asyncio.Queue] = set()
+
+    # Live valuation of the default portfolio
+    _state: Optional[PortfolioState] = None
+    _positions: Dict[str, Position] = {}
+    _snapshot_date: Optional[datetime] = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def start() -> None:
+        if PriceStreamService._task is None or PriceStreamService._task.done():
+            PriceStreamService._task = asyncio.create_task(PriceStreamService._run())
+
+    @staticmethod
+    async def stop() -> None:
+        task, PriceStreamService._task = PriceStreamService._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    @staticmethod
+    async def _run() -> None:
+        while True:
+            await asyncio.sleep(settings.price_stream_interval_seconds)
+            # Nobody listening -> no price reads or DB queries
+            if not PriceStreamService._subscribers:
+                continue
+            try:
+                await PriceStreamService.tick()
+            except Exception as e:
+                print(f"Warning: price stream tick failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Subscribers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def subscribe() -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=settings.price_stream_queue_size)
+        PriceStreamService._subscribers.add(queue)
+        return queue
+
+    @staticmethod
+    def unsubscribe(queue: asyncio.Queue) -> None:
+        PriceStreamService._subscribers.discard(queue)
+
+    @staticmethod
+    def _publish(event: str, payload: Dict) -> None:
+        for queue in PriceStreamService._subscribers:
+            # A slow client loses its oldest update rather than stalling everyone
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait((event, payload))
+
+    # ------------------------------------------------------------------
+    # Valuation
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    async def _reload(prices: Optional[Dict[str, float]], prices_as_of: Optional[datetime]) -> None:
+        state = await run_in_threadpool(
+            PortfolioService.get_current_portfolio_state,
+            None,
+            prices,
+            prices_as_of,
+        )
+        PriceStreamService._state = state
+        PriceStreamService._positions = {p.symbol: p for p in state.positions}
+        PriceStreamService._snapshot_date = state.snapshot_date
+
+    @staticmethod
+    def _revalue(changed: Dict[str, float], prices_as_of: Optional[datetime]) -> PortfolioValueUpdate:
+        """Reprice only the changed positions and adjust totals by the difference."""
+        state = PriceStreamService._state
+        updated = []
+
+        for symbol, price in changed.items():
+            old = PriceStreamService._positions[symbol]
+            current_value = old.quantity * price
+            unrealized_pnl = current_value - old.cost_basis
+
+            position = old.model_copy(update={
+                "current_price": price,
+                "current_value": current_value,
+                "unrealized_pnl": unrealized_pnl,
+                "unrealized_pnl_pct": (unrealized_pnl / old.cost_basis * 100) if old.cost_basis > 0 else 0,
+            })
+            PriceStreamService._positions[symbol] = position
+            updated.append(position)
+
+            state.equity_value += current_value - old.current_value
+
+        state.current_value = state.equity_value + state.cash_balance
+        state.unrealized_pnl = state.equity_value - state.cost_basis
+        state.unrealized_pnl_pct = (state.unrealized_pnl / state.cost_basis * 100) if state.cost_basis > 0 else 0
+        state.market_data_timestamp = prices_as_of
+        state.positions = list(PriceStreamService._positions.values())
+
+        return PortfolioValueUpdate(
+            portfolio_id=state.portfolio_id,
+            current_value=state.current_value,
+            equity_value=state.equity_value,
+            unrealized_pnl=state.unrealized_pnl,
+            unrealized_pnl_pct=state.unrealized_pnl_pct,
+            market_data_timestamp=prices_as_of,
+            positions=updated,
+        )
+
+    @staticmethod
+    async def tick() -> None:
+        prices, prices_as_of = await run_in_threadpool(PriceCacheService.get_prices)
+        snapshot_date = await run_in_threadpool(PortfolioService.get_latest_snapshot_date)
+
+        # New snapshot (trades happened) -> positions changed, rebuild everything
+        if PriceStreamService._state is None or snapshot_date != PriceStreamService._snapshot_date:
+            await PriceStreamService._reload(prices, prices_as_of)
+            PriceStreamService._publish("portfolio", PriceStreamService._state.model_dump(mode="json"))
+            return
+
+        if not prices:
+            return
+
+        changed = {
+            symbol: prices[symbol]
+            for symbol, position in PriceStreamService._positions.items()
+            if symbol in prices and prices[symbol] != position.current_price
+        }
+        if not changed:
+            return
+
+        update = PriceStreamService._revalue(changed, prices_as_of)
+        PriceStreamService._publish("update", update.model_dump(mode="json"))
+
+    @staticmethod
+    async def current_state() -> PortfolioState:
+        """
+        Latest valuation for a new subscriber. The loop idles without
+        subscribers, so in that case the state is reloaded first.
+        """
+        if PriceStreamService._state is None or not PriceStreamService._subscribers:
+            prices, prices_as_of = await run_in_threadpool(PriceCacheService.get_prices)
+            await PriceStreamService._reload(prices, prices_as_of)
+        return PriceStreamService._state
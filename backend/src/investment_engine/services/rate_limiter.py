@@ -0,0 +1,253 @@
+"""
+Rate limiting for external APIs (MarketAux, yfinance, OpenAI).
+
+Each provider gets one process-wide RateLimiter:
+
+- a token bucket (`rate_per_second`, `burst`) paces requests across threads
+- a 429 blocks the whole provider until its Retry-After has passed (or an
+  exponential backoff without one) and halves the request rate; the rate
+  creeps back up on successful calls
+- an optional daily quota is counted in Postgres so it survives restarts
+  and is shared by the API and the Prefect worker
+"""
+
+import threading
+import time
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from investment_engine.db.models.api_quota_usage import ApiQuotaUsage
+from investment_engine.db.session import session_scope
+from investment_engine.settings import settings
+
+# Limits per provider, resolved from settings by get_rate_limiter()
+PROVIDERS = ("marketaux", "yfinance", "openai")
+
+# Adaptive rate: halve on 429, recover by this fraction per success, never below MIN_RATE_FRACTION
+RECOVERY_STEP = 0.1
+MIN_RATE_FRACTION = 0.1
+
+BACKOFF_BASE_SECONDS = 2.0
+BACKOFF_MAX_SECONDS = 300.0
+
+
+class RateLimitExceeded(RuntimeError):
+    """The daily quota is used up, or a request slot didn't open in time."""
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After header (delta-seconds or HTTP-date) in seconds, if present."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((retry_at - datetime.now(retry_at.tzinfo)).total_seconds(), 0.0)
+
+
+class RateLimiter:
+
+    def __init__(
+        self,
+        name: str,
+        rate_per_second: float,
+        burst: int,
+        daily_quota: Optional[int] = None,
+    ):
+        self.name = name
+        self.configured_rate = rate_per_second
+        self.rate = rate_per_second
+        self.burst = max(burst, 1)
+        self.daily_quota = daily_quota
+
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._refilled_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._consecutive_limits = 0
+
+        # Counters for the health endpoint
+        self._acquired = 0
+        self._rate_limited = 0
+        self._waited_seconds = 0.0
+        self._quota_day: Optional[str] = None
+        self._quota_used: Optional[int] = None
+
+    # ------------------------------------------------------------------
+    # Token bucket
+    # ------------------------------------------------------------------
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def _reserve(self) -> float:
+        """Take a token if one is available; otherwise seconds until one is."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            self._refill(now)
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self, timeout: Optional[float] = None) -> None:
+        """
+        Block until a request may be sent. Raises RateLimitExceeded if the
+        daily quota is used up or no slot opens within `timeout` seconds
+        (default `rate_limit_max_wait_seconds`).
+        """
+        if timeout is None:
+            timeout = settings.rate_limit_max_wait_seconds
+        deadline = time.monotonic() + timeout
+
+        while True:
+            wait = self._reserve()
+            if wait == 0:
+                break
+            if time.monotonic() + wait > deadline:
+                raise RateLimitExceeded(f"{self.name}: no request slot within {timeout:.0f}s")
+            self._waited_seconds += wait
+            time.sleep(wait)
+
+        if self.daily_quota is not None:
+            self._consume_quota()
+        self._acquired += 1
+
+    # ------------------------------------------------------------------
+    # Feedback from responses
+    # ------------------------------------------------------------------
+
+    def report_rate_limited(self, retry_after: Optional[float] = None) -> float:
+        """
+        Record a 429. Blocks the provider for `retry_after` seconds (or an
+        exponential backoff) and halves the request rate. Returns the delay.
+        """
+        with self._lock:
+            self._rate_limited += 1
+            self._consecutive_limits += 1
+            if retry_after is None:
+                retry_after = min(
+                    BACKOFF_BASE_SECONDS * 2 ** (self._consecutive_limits - 1),
+                    BACKOFF_MAX_SECONDS,
+                )
+            self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+            self.rate = max(self.rate / 2, self.configured_rate * MIN_RATE_FRACTION)
+            self._tokens = 0.0
+
+        print(f"Rate limited by {self.name}: backing off {retry_after:.1f}s, rate now {self.rate:.2f}/s")
+        return retry_after
+
+    def report_success(self) -> None:
+        with self._lock:
+            self._consecutive_limits = 0
+            if self.rate < self.configured_rate:
+                self.rate = min(self.configured_rate, self.rate + self.configured_rate * RECOVERY_STEP)
+
+    # ------------------------------------------------------------------
+    # Daily quota
+    # ------------------------------------------------------------------
+
+    def _consume_quota(self) -> None:
+        """Count one request against today's quota in Postgres, atomically."""
+        today = datetime.utcnow().date()
+        now = datetime.utcnow()
+        try:
+            with session_scope() as session:
+                used = session.scalar(
+                    insert(ApiQuotaUsage)
+                    .values(provider=self.name, day=today, used=1, updated_at=now)
+                    .on_conflict_do_update(
+                        index_elements=[ApiQuotaUsage.provider, ApiQuotaUsage.day],
+                        set_={"used": ApiQuotaUsage.used + 1, "updated_at": now},
+                        where=ApiQuotaUsage.used < self.daily_quota,
+                    )
+                    .returning(ApiQuotaUsage.used)
+                )
+        except Exception as e:
+            # Never block requests on the bookkeeping itself
+            print(f"Warning: could not record {self.name} quota usage: {e}")
+            return
+
+        if used is None:
+            self._quota_day, self._quota_used = today.isoformat(), self.daily_quota
+            raise RateLimitExceeded(f"{self.name}: daily quota of {self.daily_quota} requests used up")
+        self._quota_day, self._quota_used = today.isoformat(), used
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+
+    def state(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            today = datetime.utcnow().date().isoformat()
+            used_today = self._quota_used if self._quota_day == today else None
+            return {
+                "name": self.name,
+                "configured_rate_per_second": self.configured_rate,
+                "rate_per_second": round(self.rate, 4),
+                "burst": self.burst,
+                "tokens_available": round(self._tokens, 2),
+                "blocked_for_seconds": round(max(self._blocked_until - now, 0.0), 1),
+                "requests": self._acquired,
+                "rate_limited": self._rate_limited,
+                "waited_seconds": round(self._waited_seconds, 1),
+                "daily_quota": self.daily_quota,
+                "used_today": used_today,
+                "remaining_today": (
+                    self.daily_quota - used_today
+                    if self.daily_quota is not None and used_today is not None
+                    else None
+                ),
+            }
+
+
+@lru_cache(maxsize=None)
+def get_rate_limiter(name: str) -> RateLimiter:
+    """Shared limiter for a provider in PROVIDERS, configured from settings."""
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown rate limited provider '{name}'. Available: {', '.join(PROVIDERS)}")
+    return RateLimiter(
+        name=name,
+        rate_per_second=getattr(settings, f"{name}_rate_per_second"),
+        burst=getattr(settings, f"{name}_burst"),
+        daily_quota=getattr(settings, f"{name}_daily_quota"),
+    )
+
+
+def rate_limiter_states() -> Dict[str, Dict[str, Any]]:
+    """
+    State of every provider's limiter in this process. Quota usage is read
+    from Postgres, so it also counts requests made by other processes.
+    """
+    states = {name: get_rate_limiter(name).state() for name in PROVIDERS}
+
+    try:
+        with session_scope() as session:
+            rows = session.scalars(
+                select(ApiQuotaUsage).where(ApiQuotaUsage.day == datetime.utcnow().date())
+            ).all()
+            used = {row.provider: row.used for row in rows}
+    except Exception as e:
+        print(f"Warning: could not read quota usage: {e}")
+        return states
+
+    for name, state in states.items():
+        state["used_today"] = used.get(name, 0)
+        if state["daily_quota"] is not None:
+            state["remaining_today"] = max(state["daily_quota"] - state["used_today"], 0)
+    return states
@@ -0,0 +1,92 @@
+"""
+Screener Service
+
+Evaluates a ScreenerSpec over the whole market snapshot in one vectorized
+pass and keeps the top-k matches with a partial selection instead of a full
+sort, so screening stays cheap as the universe grows.
+"""
+
+from typing import Any, Dict, List
+
+import numpy as np
+
+from investment_engine.services.data_sources.market_snapshot import MarketSnapshot
+from investment_engine.workflows.schemas.screener_models import ScreenerSpec
+
+
+class ScreenerService:
+
+    @staticmethod
+    def _criteria_mask(cols: Dict[str, np.ndarray], spec: ScreenerSpec) -> np.ndarray:
+        change = cols["daily_change_pct"]
+        abs_change = np.abs(change)
+        mask = np.isfinite(change)
+
+        if spec.min_abs_change_pct is not None:
+            mask &= abs_change >= spec.min_abs_change_pct
+        if spec.max_abs_change_pct is not None:
+            mask &= abs_change <= spec.max_abs_change_pct
+        if spec.direction == "up":
+            mask &= change > 0
+        elif spec.direction == "down":
+            mask &= change < 0
+
+        # NaN comparisons are False, so symbols without a baseline drop out
+        if spec.min_volume_ratio is not None:
+            mask &= cols["volume_ratio"] >= spec.min_volume_ratio
+        if spec.min_abs_gap_pct is not None:
+            mask &= np.abs(cols["gap_pct"]) >= spec.min_abs_gap_pct
+
+        if spec.reversal is not None:
+            prior_move = cols["prev_close"] - cols["prev_prev_close"]
+            today_move = cols["current_price"] - cols["prev_close"]
+            bullish = (prior_move < 0) & (today_move > 0)
+            bearish = (prior_move > 0) & (today_move < 0)
+            if spec.reversal == "bullish":
+                mask &= bullish
+            elif spec.reversal == "bearish":
+                mask &= bearish
+            else:
+                mask &= bullish | bearish
+
+        return mask
+
+    @staticmethod
+    def screen(market_snapshot: MarketSnapshot, spec: ScreenerSpec) -> List[Dict[str, Any]]:
+        """
+        Returns the top `spec.top_n` snapshot rows matching every criterion,
+        strongest `spec.rank_by` score first, as candidate dicts.
+        """
+        if not len(market_snapshot):
+            return []
+
+        # Snapshot columns are already arrays; derived ones go into a shallow copy
+        cols = dict(market_snapshot.columns)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cols["volume_ratio"] = cols["volume"] / cols["avg_volume"]
+            cols["gap_pct"] = (cols["open"] - cols["prev_close"]) / cols["prev_close"] * 100
+
+        mask = ScreenerService._criteria_mask(cols, spec)
+        matches = np.flatnonzero(mask)
+
+        score = {
+            "abs_change": np.abs(cols["daily_change_pct"]),
+            "volume_ratio": cols["volume_ratio"],
+            "abs_gap": np.abs(cols["gap_pct"]),
+        }[spec.rank_by][matches]
+
+        # Partial selection of the top-k, then order just those k
+        if len(matches) > spec.top_n:
+            top = np.argpartition(-score, spec.top_n - 1)[:spec.top_n]
+        else:
+            top = np.arange(len(matches))
+        top = top[np.lexsort((matches[top], -score[top]))]
+
+        selected = [market_snapshot.record(i) for i in matches[top]]
+
+        print(
+            f"Screened {len(market_snapshot)} stocks: {len(matches)} matched, "
+            f"returning top {len(selected)} by {spec.rank_by}: "
+            + ", ".join(f"{s['symbol']} ({s['daily_change_pct']}%)" for s in selected)
+        )
+        return selected
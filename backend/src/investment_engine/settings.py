@@ -10,6 +10,132 @@ class Settings(BaseSettings):
     market_aux_api_key:str
     market_aux_base_url:str
 
+    # News enrichment: concurrent MarketAux requests over one pooled session
+    news_fetch_max_concurrency: int = 5
+    news_fetch_timeout_seconds: float = 10.0
+    news_enrichment_deadline_seconds: float = 30.0
+    news_lookback_days: int = 14
+
+    # "batched": comma-separated symbols per request, split back by article entities
+    # "per_symbol": one request per symbol
+    news_fetch_mode: str = "batched"
+    news_batch_size: int = 10
+    # Articles per request (plan maximum); pages per batch are sized for
+    # limit x symbols, capped at news_batch_max_pages, and symbols still
+    # short after that get a per-symbol request
+    news_page_size: int = 3
+    news_batch_max_pages: int = 5
+
+    # Postgres news cache: symbols fetched within the TTL are served from it
+    news_cache_enabled: bool = True
+    news_cache_ttl_seconds: int = 21600
+
+    # LLM response cache: identical prompts within the TTL skip the API call
+    llm_cache_enabled: bool = True
+    llm_cache_ttl_seconds: int = 86400
+    llm_cache_max_entries: int = 500
+
+    # Sharded LLM evaluation: candidates per call and concurrent calls;
+    # runs with more than llm_shard_size candidates are split and merged
+    llm_sharding_enabled: bool = True
+    llm_shard_size: int = 10
+    llm_max_parallel_calls: int = 4
+    llm_max_buys: int = 2
+
+    # Prompt token budget per LLM call (system + user prompt, 0 = unbounded);
+    # over budget, news descriptions go first, then low-ranked candidates,
+    # then holdings switch to a compact format
+    llm_prompt_token_budget: int = 12000
+    llm_prompt_min_candidates: int = 3
+
+    # Prompt section order: "stable_prefix" (static instructions first, most
+    # volatile data last, for provider prefix caching) or "legacy"
+    llm_prompt_layout: str = "stable_prefix"
+
+    # Decision backend: "openai" (gpt-4.1-mini), "ollama" (local model) or
+    # "mock" (deterministic rules, for offline benchmarking; see mock_llm.py)
+    llm_backend: str = "openai"
+
+    # Ensemble mode: the same prompt to every member concurrently, combined by
+    # confidence-weighted voting; "backend:model*weight", weight optional.
+    # Members that haven't answered after the budget are left out of the vote
+    llm_ensemble_enabled: bool = False
+    llm_ensemble_members: str = "openai:gpt-4.1-mini,ollama:mistral"
+    llm_ensemble_budget_seconds: float = 60.0
+
+    # Local LLM (Ollama); keep_alive pins the model in memory between runs,
+    # max_concurrency should match OLLAMA_NUM_PARALLEL on the server
+    ollama_host: str = "http://localhost:11434"
+    ollama_model: str = "mistral"
+    ollama_temperature: float = 0.2
+    ollama_keep_alive: str = "30m"
+    # timeout is per HTTP read; deadline bounds a whole call, retries included
+    ollama_timeout_seconds: float = 120.0
+    ollama_connect_timeout_seconds: float = 5.0
+    ollama_deadline_seconds: float = 300.0
+    ollama_max_concurrency: int = 2
+    ollama_max_retries: int = 2
+    ollama_retry_backoff_seconds: float = 1.0
+    ollama_warm_up_on_worker_start: bool = True
+
+    # Mock LLM: seeded rule-based decisions plus simulated latency
+    # (latency_ms ± jitter_ms per call)
+    mock_llm_model: str = "rules-v1"
+    mock_llm_seed: int = 42
+    mock_llm_latency_ms: float = 800.0
+    mock_llm_latency_jitter_ms: float = 200.0
+
+    # Reddit sentiment: "praw" (Reddit API) or "fixture" (local JSONL, offline)
+    reddit_source: str = "praw"
+    reddit_client_id: Optional[str] = None
+    reddit_client_secret: Optional[str] = None
+    reddit_user_agent: str = "investment-engine/0.1"
+    reddit_subreddits: str = "IndianStockMarket,IndiaInvestments,DalalStreetTalks"
+    reddit_fetch_limit: int = 500
+    reddit_fixture_path: str = "scripts/fixtures/reddit_sample.jsonl"
+    reddit_window_hours: float = 24.0
+    reddit_bucket_minutes: int = 60
+
+    # External API rate limits: token bucket per provider, optional daily quota
+    # counted in Postgres (see services/rate_limiter.py)
+    marketaux_rate_per_second: float = 1.0
+    marketaux_burst: int = 3
+    marketaux_daily_quota: Optional[int] = 100
+    yfinance_rate_per_second: float = 5.0
+    yfinance_burst: int = 10
+    yfinance_daily_quota: Optional[int] = None
+    openai_rate_per_second: float = 1.0
+    openai_burst: int = 2
+    openai_daily_quota: Optional[int] = None
+    rate_limit_max_wait_seconds: float = 30.0
+    rate_limit_max_retries: int = 2
+
+    # Market data provider: "yfinance" (live) or "replay" (recorded bars, offline)
+    market_data_provider: str = "yfinance"
+    market_replay_dir: str = ".data/replay"
+    market_replay_latency_ms: int = 0
+    market_replay_as_of: Optional[str] = None
+
+    # Chunked, concurrent downloads for large universes; yfinance runs one
+    # batched chunk at a time with chunk_size tickers in flight
+    market_fetch_chunk_size: int = 10
+    market_fetch_max_workers: int = 8
+    market_fetch_max_retries: int = 2
+    market_fetch_retry_backoff_seconds: float = 1.0
+
+    # Local OHLCV bar store (see services/data_sources/bar_store.py)
+    bar_store_dir: str = ".data/bars"
+    bar_store_refresh_seconds: int = 900
+    bar_store_backfill_days: int = 400
+
+    # Shared price cache for the real-time portfolio endpoints
+    price_cache_ttl_seconds: int = 300
+
+    # Live portfolio valuation stream (SSE)
+    price_stream_interval_seconds: float = 15.0
+    price_stream_keepalive_seconds: float = 20.0
+    price_stream_queue_size: int = 100
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -1,45 +1,79 @@
+from typing import Optional
+
 from investment_engine.workflows.tasks.decisions import store_decisions
 from prefect import flow
 from investment_engine.services.decision_service import DecisionService
 from investment_engine.workflows.tasks.market.fetch_stock_candidates import fetch_market_snapshot
 from investment_engine.workflows.tasks.market.filter_stock_candidates import filter_stock_candidates
+from investment_engine.workflows.tasks.market.attach_indicators import attach_indicators
 from investment_engine.workflows.tasks.external.enrich_stock_candidates import enrich_candidates
+from investment_engine.workflows.tasks.external.dedupe_news import dedupe_news
+from investment_engine.workflows.tasks.external.attach_reddit_sentiment import attach_reddit_sentiment
 from investment_engine.workflows.tasks.llm.generate_decisions import generate_decisions
 from investment_engine.workflows.tasks.portfolio.build_state import build_state
 from investment_engine.workflows.tasks.decisions.store_decisions import store_decisions
 from investment_engine.workflows.tasks.execution.execute_trade import execute_trade
 from investment_engine.workflows.tasks.snapshot.create_snapshot import create_snapshot
+from investment_engine.workflows.schemas.screener_models import ScreenerSpec
 
 
 @flow
-def daily_flow():
+def daily_flow(
+    market_data_provider: Optional[str] = None,
+    screener_spec: Optional[ScreenerSpec] = None,
+    use_llm_cache: Optional[bool] = None,
+    shard_llm_calls: Optional[bool] = None,
+    llm_backend: Optional[str] = None,
+    llm_ensemble: Optional[bool] = None,
+):
     """
     Daily investment workflow with real-time portfolio valuation
     
     Key improvement: Fetch market data FIRST, then build portfolio state with current prices
     This ensures the LLM gets real-time portfolio values for better decision making
+
+    market_data_provider -> override settings.market_data_provider, e.g. "replay" for offline runs
+    screener_spec -> candidate screening criteria; defaults to the 'Active Movers' filter
+    use_llm_cache -> False bypasses the LLM response cache for this run
+    shard_llm_calls -> override settings.llm_sharding_enabled for this run
+    llm_backend -> "openai", "ollama" or "mock"; overrides settings.llm_backend for this run
+    llm_ensemble -> override settings.llm_ensemble_enabled for this run
     """
     # 1. Fetch current market data FIRST
-    market_snapshot = fetch_market_snapshot()
-    
-    # 2. Create price lookup for real-time portfolio valuation
-    price_lookup = {
-        s["symbol"]: s["current_price"]
-        for s in market_snapshot
-    }
+    market_snapshot = fetch_market_snapshot(provider_name=market_data_provider)
     
+    # 2. Price lookup for real-time portfolio valuation (a view, no copy)
+    price_lookup = market_snapshot.prices
+
     # 3. Build portfolio state with current market prices
     # This gives the LLM real-time portfolio values instead of stale snapshot data
     state = build_state(current_prices=price_lookup)
 
     # 4. Filter top stock candidates based on market conditions
-    stock_candidates = filter_stock_candidates(market_snapshot=market_snapshot)
+    stock_candidates = filter_stock_candidates(market_snapshot=market_snapshot, spec=screener_spec)
+
+    # 4b. Add trend context from the locally stored bar history
+    stock_candidates = attach_indicators(candidates=stock_candidates, provider_name=market_data_provider)
 
     # 5. Enrich candidates with recent news and market context
     stock_candidates_with_news_data = enrich_candidates(candidates=stock_candidates)
 
+    # 5a. Reddit mention counts and sentiment next to the news
+    stock_candidates_with_news_data = attach_reddit_sentiment(candidates=stock_candidates_with_news_data)
+
+    # 5b. Render stories shared by several candidates once
+    stock_candidates_with_news_data, market_news = dedupe_news(candidates=stock_candidates_with_news_data)
+
     # 6. LLM Decision Phase - now with real-time portfolio context
-    decisions = generate_decisions(state, enriched_candidates=stock_candidates_with_news_data)
+    decisions = generate_decisions(
+        state,
+        enriched_candidates=stock_candidates_with_news_data,
+        market_news=market_news,
+        use_cache=use_llm_cache,
+        sharded=shard_llm_calls,
+        backend=llm_backend,
+        ensemble=llm_ensemble,
+    )
 
     # 7. Store decisions and return decision_id's
     decision_rows = store_decisions(decisions, state=state)
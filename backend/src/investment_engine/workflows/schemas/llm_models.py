@@ -1,14 +1,65 @@
-from pydantic import BaseModel, Field
-from typing import List
+from pydantic import BaseModel, Field, PrivateAttr
+from typing import Any, Dict, List, Optional
 
 
 class StockDecision(BaseModel):
     symbol: str = Field(..., description="Ticker symbol")
     action: str = Field(..., description="BUY, or SELL")
-    quantity: int = Field(ge=0),
+    quantity: int = Field(..., ge=0)
     confidence: float = Field(..., ge=0, le=1)
     reasoning: str = Field(..., max_length=300)
 
+    # llm_calls row that produced this decision; set by DecisionEngine, kept by model_copy
+    _llm_call_id: Optional[int] = PrivateAttr(default=None)
+    # Per-model votes behind an ensemble decision (see DecisionEnsemble)
+    _ensemble_stats: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+
+
+class LLMUsage(BaseModel):
+    """Token usage and latency of the LLM call(s) behind one DecisionResponse"""
+    calls: int = 0
+    response_cache_hits: int = 0
+    prompt_tokens: int = 0
+    cached_tokens: int = 0          # prompt tokens served from the provider's prefix cache
+    completion_tokens: int = 0
+    latency_seconds: float = 0.0    # summed over calls
+
+    @property
+    def cached_ratio(self) -> float:
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+    @classmethod
+    def combine(cls, usages: List[Optional["LLMUsage"]]) -> "LLMUsage":
+        usages = [u for u in usages if u is not None]
+        return cls(
+            calls=sum(u.calls for u in usages),
+            response_cache_hits=sum(u.response_cache_hits for u in usages),
+            prompt_tokens=sum(u.prompt_tokens for u in usages),
+            cached_tokens=sum(u.cached_tokens for u in usages),
+            completion_tokens=sum(u.completion_tokens for u in usages),
+            latency_seconds=sum(u.latency_seconds for u in usages),
+        )
+
+    def summary(self) -> str:
+        return (
+            f"LLM usage: {self.calls} API calls, {self.response_cache_hits} response cache hits, "
+            f"prompt {self.prompt_tokens} tokens ({self.cached_tokens} cached, {self.cached_ratio:.0%}), "
+            f"completion {self.completion_tokens}, {self.latency_seconds:.2f}s"
+        )
+
 
 class DecisionResponse(BaseModel):
     decisions: List[StockDecision]
+
+    # Not part of the LLM schema; set by DecisionEngine
+    _usage: Optional[LLMUsage] = PrivateAttr(default=None)
+    _model: Optional[str] = PrivateAttr(default=None)
+
+    @property
+    def usage(self) -> Optional[LLMUsage]:
+        return self._usage
+
+    @property
+    def model_name(self) -> Optional[str]:
+        """Model that produced the decisions, stored as decisions.model_used."""
+        return self._model
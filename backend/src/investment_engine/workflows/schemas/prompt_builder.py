@@ -1,5 +1,12 @@
+from dataclasses import dataclass, field
 from textwrap import dedent
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
+
+from investment_engine.settings import settings
+from investment_engine.workflows.utils.token_counter import count_tokens, tokenizer_name
+
+# News descriptions are clipped to this many characters in the prompt
+DESCRIPTION_MAX_CHARS = 280
 
 
 SYSTEM_PROMPT = dedent("""
@@ -49,29 +56,86 @@ def _compute_momentum_label(change: float) -> str:
     return "NEUTRAL"
 
 
-def _format_news(news_items: List[Dict]) -> str:
-    if not news_items:
+def _format_description(item: Dict, include_descriptions: bool) -> str:
+    description = (item.get("description") or "").strip()
+    if not include_descriptions or not description:
+        return ""
+    if len(description) > DESCRIPTION_MAX_CHARS:
+        description = description[:DESCRIPTION_MAX_CHARS].rsplit(" ", 1)[0] + "…"
+    return f"\n    <summary>{description}</summary>"
+
+
+def _format_news(
+    news_items: List[Dict],
+    news_refs: Optional[List[str]] = None,
+    include_descriptions: bool = True,
+) -> str:
+    news_refs = news_refs or []
+    if not news_items and not news_refs:
         return "<no_news>No reliable recent news.</no_news>"
 
+    # Stories shared with other candidates are listed once under <market_news>
+    refs = f'<market_news_refs>{", ".join(news_refs)}</market_news_refs>' if news_refs else ""
+
     articles = "\n".join(
-        dedent(f"""
-        <article>
-            <headline>{item.get("title", "No headline")}</headline>
-            <date>{item.get("published_at", "Recent")}</date>
-        </article>
-        """).strip()
+        f"<article>\n"
+        f"    <headline>{item.get('title', 'No headline')}</headline>\n"
+        f"    <date>{item.get('published_at', 'Recent')}</date>"
+        f"{_format_description(item, include_descriptions)}\n"
+        f"</article>"
         for item in news_items[:3]
     )
 
     return dedent(f"""
     <news_summary>
-        <article_count>{len(news_items)}</article_count>
+        <article_count>{len(news_items) + len(news_refs)}</article_count>
     </news_summary>
+    {refs}
     {articles}
     """)
 
 
-def _format_stock(stock: Dict) -> str:
+def _format_market_news(market_news: List[Dict], include_descriptions: bool = True) -> str:
+    if not market_news:
+        return "<no_market_news>No stories shared across candidates.</no_market_news>"
+
+    return "\n".join(
+        f"<article id=\"{item['id']}\">\n"
+        f"    <headline>{item.get('title', 'No headline')}</headline>\n"
+        f"    <date>{item.get('published_at', 'Recent')}</date>"
+        f"{_format_description(item, include_descriptions)}\n"
+        f"    <related_symbols>{', '.join(item.get('symbols', []))}</related_symbols>\n"
+        f"</article>"
+        for item in market_news
+    )
+
+
+def _format_reddit(reddit: Dict) -> str:
+    if not reddit:
+        return "<no_social_mentions>Not discussed on Reddit recently.</no_social_mentions>"
+
+    return dedent(f"""
+    <window_hours>{reddit['window_hours']}</window_hours>
+    <mentions>{reddit['mentions']}</mentions>
+    <mentions_current_bucket>{reddit['mentions_latest_bucket']}</mentions_current_bucket>
+    <avg_sentiment>{reddit['avg_sentiment']}</avg_sentiment>
+    <positive_mentions>{reddit['positive']}</positive_mentions>
+    <negative_mentions>{reddit['negative']}</negative_mentions>
+    """).strip()
+
+
+def _format_indicators(indicators: Dict) -> str:
+    if not indicators:
+        return "<no_indicators>Insufficient price history.</no_indicators>"
+
+    return "\n".join(
+        f"<{name}>{value}</{name}>"
+        for name, value in indicators.items()
+        if value is not None
+    )
+
+
+def _format_stock(stock: Dict, include_descriptions: bool = True) -> str:
     momentum = _compute_momentum_label(stock["daily_change_pct"])
 
     trend = (
@@ -80,7 +144,9 @@ def _format_stock(stock: Dict) -> str:
         else "DOWN"
     )
 
-    news_block = _format_news(stock.get("news", []))
+    news_block = _format_news(stock.get("news", []), stock.get("news_refs"), include_descriptions)
+    indicators_block = _format_indicators(stock.get("indicators", {}))
+    reddit_block = _format_reddit(stock.get("reddit", {}))
 
     return dedent(f"""
     <stock>
@@ -99,10 +165,18 @@ def _format_stock(stock: Dict) -> str:
             <day_before_close>{stock['prev_prev_close']}</day_before_close>
         </trend_context>
 
+        <technical_indicators>
+            {indicators_block}
+        </technical_indicators>
+
         <news_context>
             {news_block}
         </news_context>
 
+        <social_sentiment>
+            {reddit_block}
+        </social_sentiment>
+
     </stock>
     """)
 
@@ -191,6 +265,23 @@ def _format_holdings(holdings: List[Dict], total_portfolio_value: float) -> str:
     return "\n\n".join(formatted_holdings)
 
 
+def _format_holdings_compact(holdings: List[Dict], total_portfolio_value: float) -> str:
+    """One line per holding; same facts as _format_holdings, a fraction of the tokens"""
+    if not holdings:
+        return "No current positions (100% Cash)."
+
+    lines = []
+    for h in holdings:
+        current_value = h.get('current_value', 0)
+        portfolio_weight = (current_value / total_portfolio_value * 100) if total_portfolio_value > 0 else 0
+        lines.append(
+            f"{h['symbol']}: {h['quantity']} @ ₹{h['avg_price']:,.2f} -> ₹{h.get('current_price', h['avg_price']):,.2f}, "
+            f"P&L {h.get('unrealized_pnl_pct', 0):+.1f}%, {h.get('days_held', '?')}d, "
+            f"weight {portfolio_weight:.1f}%, {_get_risk_assessment(h, total_portfolio_value)}"
+        )
+    return "\n".join(lines)
+
+
 def _get_portfolio_health_assessment(state: Dict) -> str:
     """Assess overall portfolio health and provide guidance"""
     holdings = state.get('holdings', [])
@@ -241,77 +332,251 @@ def _get_portfolio_health_assessment(state: Dict) -> str:
     return " | ".join(assessments)
 
 
-def build_prompts(state: Dict, candidates: List[Dict]) -> Tuple[str, str]:
-    """Build enhanced prompts with comprehensive portfolio context"""
-    
+# Everything after the position sizing line of [DECISION FRAMEWORK]; static
+_DECISION_FRAMEWORK_BODY = dedent("""
+🛡️ Risk Management: Capital preservation is priority #1
+📊 Portfolio Strategy: 
+    • For existing profitable positions (>10% gain): Consider taking partial profits
+    • For existing losing positions (<-10% loss): Evaluate if fundamentals justify holding
+    • For concentrated positions (>25% weight): Consider reducing exposure
+    • For new positions: Size based on conviction and available capital
+
+🔍 Decision Logic:
+    • BUY: Strong fundamentals + good entry point + sufficient capital
+    • SELL: Deteriorating fundamentals OR take profits OR reduce concentration
+    • HOLD: Mixed signals OR position is performing as expected
+
+⚠️ Constraints:
+    • Maximum 2 BUY decisions per analysis
+    • Must output ONLY valid JSON
+    • Quantity must be realistic relative to stock price and available cash
+    • Consider existing position when evaluating same stock
+
+[REQUIRED OUTPUT FORMAT]
+{
+  "decisions": [
+    {
+      "symbol": "SYMBOL",
+      "action": "BUY/SELL/HOLD",
+      "confidence": float,
+      "quantity": int,
+      "reasoning": "Detailed explanation considering current portfolio context, P&L, and market conditions"
+    }
+  ]
+}
+""").lstrip("\n")
+
+# Instructions for the stable-prefix layout, compiled once: no per-run values
+STABLE_INSTRUCTIONS = (
+    "[DECISION FRAMEWORK]\n"
+    "🎯 Position Sizing: Use the available cash shown in [PORTFOLIO CONTEXT] - use your judgment\n"
+    f"{_DECISION_FRAMEWORK_BODY}"
+)
+
+
+@dataclass
+class PromptTokenReport:
+    """Token usage of one prompt, per section, and what was trimmed to fit the budget"""
+    tokenizer: str
+    budget: Optional[int]
+    sections: Dict[str, int]
+    total: int
+    trimmed: List[str] = field(default_factory=list)
+    dropped_symbols: List[str] = field(default_factory=list)
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.total > self.budget
+
+    def summary(self) -> str:
+        sections = ", ".join(f"{name} {tokens}" for name, tokens in self.sections.items())
+        budget = f"/{self.budget}" if self.budget else ""
+        trimmed = f" | trimmed: {', '.join(self.trimmed)}" if self.trimmed else ""
+        return f"Prompt tokens {self.total}{budget} ({self.tokenizer}): {sections}{trimmed}"
+
+
+def _referenced_news(candidates: List[Dict], market_news: List[Dict]) -> List[Dict]:
+    refs = {ref for stock in candidates for ref in stock.get("news_refs", [])}
+    return [item for item in market_news if item["id"] in refs]
+
+
+def _render_sections(
+    state: Dict,
+    candidates: List[Dict],
+    market_news: List[Dict],
+    include_descriptions: bool = True,
+    compact_holdings: bool = False,
+    layout: Optional[str] = None,
+) -> Dict[str, str]:
+    """
+    The user prompt as named sections, in prompt order.
+
+    layout -> "stable_prefix" (default, settings.llm_prompt_layout) puts the
+              precompiled instructions first and orders the rest from least to
+              most volatile, so provider-side prefix caching can reuse
+              everything up to the candidates, including across shards of one
+              run; "legacy" keeps the original data-first order.
+    """
+    layout = layout or settings.llm_prompt_layout
+
     # 1. Format the Candidate XML
-    stocks_xml = "\n".join(_format_stock(stock) for stock in candidates)
+    stocks_xml = "\n".join(_format_stock(stock, include_descriptions) for stock in candidates)
+    market_news_xml = _format_market_news(market_news, include_descriptions)
 
     # 2. Extract and format the Current Holdings with P&L context
     holdings = state.get("holdings", [])
     total_portfolio_value = state.get('total_value', 0)
-    holdings_formatted = _format_holdings(holdings, total_portfolio_value)
-    
+    format_holdings = _format_holdings_compact if compact_holdings else _format_holdings
+    holdings_formatted = format_holdings(holdings, total_portfolio_value)
+
     # 3. Get portfolio health assessment
     portfolio_health = _get_portfolio_health_assessment(state)
-    
+
     # 4. Calculate allocation percentages
     cash_pct = (state.get('cash_balance', 0) / total_portfolio_value * 100) if total_portfolio_value > 0 else 100
     equity_pct = (state.get('equity_value', 0) / total_portfolio_value * 100) if total_portfolio_value > 0 else 0
-    
+
     # 5. Build the enhanced User Prompt
-    user_prompt = dedent(f"""
+    portfolio = dedent(f"""
     [PORTFOLIO CONTEXT]
     💰 Cash Balance: ₹{state.get('cash_balance', 0):,.0f} ({cash_pct:.1f}%)
     📊 Equity Value: ₹{state.get('equity_value', 0):,.0f} ({equity_pct:.1f}%) [Current Market Value]
     💵 Cost Basis: ₹{state.get('cost_basis', 0):,.0f} [What We Originally Paid]
     🏦 Total Portfolio Value: ₹{total_portfolio_value:,.0f}
     📈 Unrealized P&L: ₹{state.get('unrealized_pnl', 0):,.0f} ({state.get('unrealized_pnl_pct', 0):+.1f}%)
-    
+
     [PORTFOLIO HEALTH ASSESSMENT]
     {portfolio_health}
-
-    [CURRENT HOLDINGS WITH P&L ANALYSIS]
-    {holdings_formatted}
-
-    [CANDIDATE STOCKS FOR ANALYSIS]
-    The following NIFTY 50 candidates have been pre-filtered based on market activity:
-    <candidates>
-    {stocks_xml}
-    </candidates>
-
-    [DECISION FRAMEWORK]
-    🎯 Position Sizing: You have ₹{state.get('cash_balance', 0):,.0f} available cash - use your judgment
-    🛡️ Risk Management: Capital preservation is priority #1
-    📊 Portfolio Strategy: 
-        • For existing profitable positions (>10% gain): Consider taking partial profits
-        • For existing losing positions (<-10% loss): Evaluate if fundamentals justify holding
-        • For concentrated positions (>25% weight): Consider reducing exposure
-        • For new positions: Size based on conviction and available capital
-    
-    🔍 Decision Logic:
-        • BUY: Strong fundamentals + good entry point + sufficient capital
-        • SELL: Deteriorating fundamentals OR take profits OR reduce concentration
-        • HOLD: Mixed signals OR position is performing as expected
-    
-    ⚠️ Constraints:
-        • Maximum 2 BUY decisions per analysis
-        • Must output ONLY valid JSON
-        • Quantity must be realistic relative to stock price and available cash
-        • Consider existing position when evaluating same stock
-
-    [REQUIRED OUTPUT FORMAT]
-    {{
-      "decisions": [
-        {{
-          "symbol": "SYMBOL",
-          "action": "BUY/SELL/HOLD",
-          "confidence": float,
-          "quantity": int,
-          "reasoning": "Detailed explanation considering current portfolio context, P&L, and market conditions"
-        }}
-      ]
-    }}
     """)
 
-    return SYSTEM_PROMPT, user_prompt
\ No newline at end of file
+    holdings_section = f"\n[CURRENT HOLDINGS WITH P&L ANALYSIS]\n{holdings_formatted}\n"
+
+    market_news_section = (
+        "\n[CANDIDATE STOCKS FOR ANALYSIS]\n"
+        "Stories relevant to several candidates, referenced by id from each <stock>:\n"
+        f"<market_news>\n{market_news_xml}\n</market_news>\n"
+    )
+
+    candidates_section = (
+        "\nThe following NIFTY 50 candidates have been pre-filtered based on market activity:\n"
+        f"<candidates>\n{stocks_xml}\n</candidates>\n"
+    )
+
+    if layout == "stable_prefix":
+        # Cash moves into the portfolio section so the instructions stay byte-identical
+        portfolio += f"🎯 Available Cash For New Positions: ₹{state.get('cash_balance', 0):,.0f}\n"
+        return {
+            "instructions": STABLE_INSTRUCTIONS,
+            "portfolio": portfolio,
+            "holdings": holdings_section,
+            "market_news": market_news_section,
+            "candidates": candidates_section,
+        }
+
+    instructions = (
+        "\n[DECISION FRAMEWORK]\n"
+        f"🎯 Position Sizing: You have ₹{state.get('cash_balance', 0):,.0f} available cash - use your judgment\n"
+        f"{_DECISION_FRAMEWORK_BODY}"
+    )
+
+    return {
+        "portfolio": portfolio,
+        "holdings": holdings_section,
+        "market_news": market_news_section,
+        "candidates": candidates_section,
+        "instructions": instructions,
+    }
+
+
+def _measure(system_prompt: str, sections: Dict[str, str]) -> Dict[str, int]:
+    counts = {"system": count_tokens(system_prompt)}
+    counts.update({name: count_tokens(text) for name, text in sections.items()})
+    return counts
+
+
+def build_budgeted_prompts(
+    state: Dict,
+    candidates: List[Dict],
+    market_news: Optional[List[Dict]] = None,
+    token_budget: Optional[int] = None,
+    layout: Optional[str] = None,
+) -> Tuple[str, str, PromptTokenReport]:
+    """
+    build_prompts, trimmed to fit `token_budget` (system + user prompt;
+    defaults to settings.llm_prompt_token_budget, 0 disables) in this order:
+
+    1. drop news descriptions, keeping headlines and dates
+    2. drop the lowest-ranked candidates (candidates are in screener order),
+       keeping at least settings.llm_prompt_min_candidates
+    3. switch holdings to the one-line compact format
+
+    If the prompt is still over budget it is sent as is and the report says so.
+    layout -> see _render_sections
+    """
+    token_budget = settings.llm_prompt_token_budget if token_budget is None else token_budget
+    market_news = market_news or []
+
+    kept = list(candidates)
+    include_descriptions = True
+    compact_holdings = False
+    trimmed: List[str] = []
+
+    sections = _render_sections(state, kept, market_news, include_descriptions, compact_holdings, layout)
+    counts = _measure(SYSTEM_PROMPT, sections)
+
+    def overshoot() -> int:
+        return sum(counts.values()) - token_budget if token_budget else 0
+
+    # 1. News descriptions
+    if overshoot() > 0:
+        include_descriptions = False
+        trimmed.append("news descriptions")
+        sections = _render_sections(state, kept, market_news, include_descriptions, compact_holdings, layout)
+        counts = _measure(SYSTEM_PROMPT, sections)
+
+    # 2. Lowest-ranked candidates; each stock block is counted once and dropped from the tail
+    if overshoot() > 0 and len(kept) > settings.llm_prompt_min_candidates:
+        excess = overshoot()
+        while excess > 0 and len(kept) > settings.llm_prompt_min_candidates:
+            excess -= count_tokens(_format_stock(kept.pop(), include_descriptions))
+        trimmed.append(f"{len(candidates) - len(kept)} low-ranked candidates")
+        sections = _render_sections(
+            state, kept, _referenced_news(kept, market_news), include_descriptions, compact_holdings, layout
+        )
+        counts = _measure(SYSTEM_PROMPT, sections)
+
+    # 3. Compact holdings
+    if overshoot() > 0 and state.get("holdings"):
+        compact_holdings = True
+        trimmed.append("compact holdings")
+        sections = _render_sections(
+            state, kept, _referenced_news(kept, market_news), include_descriptions, compact_holdings, layout
+        )
+        counts = _measure(SYSTEM_PROMPT, sections)
+
+    user_prompt = "".join(sections.values())
+    report = PromptTokenReport(
+        tokenizer=tokenizer_name(),
+        budget=token_budget or None,
+        sections=counts,
+        total=sum(counts.values()),
+        trimmed=trimmed,
+        dropped_symbols=[stock["symbol"] for stock in candidates[len(kept):]],
+    )
+    return SYSTEM_PROMPT, user_prompt, report
+
+
+def build_prompts(
+    state: Dict,
+    candidates: List[Dict],
+    market_news: Optional[List[Dict]] = None,
+    layout: Optional[str] = None,
+) -> Tuple[str, str]:
+    """
+    Build enhanced prompts with comprehensive portfolio context.
+
+    market_news -> stories shared by several candidates (see NewsDedupService);
+                   candidates point at them through `news_refs`
+    """
+    sections = _render_sections(state, candidates, market_news or [], layout=layout)
+    return SYSTEM_PROMPT, "".join(sections.values())
@@ -0,0 +1,26 @@
+from pydantic import BaseModel, Field
+from typing import Literal, Optional
+
+
+class ScreenerSpec(BaseModel):
+    """
+    Criteria for picking candidates out of the market snapshot.
+    Unset (None) criteria are not applied.
+    """
+
+    # Daily move: |change %| bounds and direction
+    min_abs_change_pct: Optional[float] = Field(1.5, ge=0)
+    max_abs_change_pct: Optional[float] = Field(None, ge=0)
+    direction: Literal["any", "up", "down"] = "any"
+
+    # Today's volume relative to the recent average (e.g. 1.5 = 50% above normal)
+    min_volume_ratio: Optional[float] = Field(None, ge=0)
+
+    # |open - prev_close| / prev_close, in %
+    min_abs_gap_pct: Optional[float] = Field(None, ge=0)
+
+    # 3-day reversal: yesterday's move (prev vs prev-prev close) flips today
+    reversal: Optional[Literal["any", "bullish", "bearish"]] = None
+
+    rank_by: Literal["abs_change", "volume_ratio", "abs_gap"] = "abs_change"
+    top_n: int = Field(10, ge=1)
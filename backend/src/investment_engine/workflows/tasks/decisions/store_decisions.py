@@ -5,4 +5,4 @@ from prefect import task
 
 @task
 def store_decisions(decisions, state):
-    return DecisionService.persist(decisions, portfolio_id=state["portfolio_id"])
+    return DecisionService.persist(decisions, portfolio_id=state["portfolio_id"], model_name=decisions.model_name)
@@ -6,16 +6,10 @@ def execute_trade(decision_rows, state, market_snapshot):
     """
     decision_rows -> persisted Decision rows with IDs & raw LLM Output
     state -> Portfolio state with cash balance
-    market_snapshot -> list of stocks from your fetch task
+    market_snapshot -> MarketSnapshot from your fetch task
     """
-
-    price_lookup = {
-        s["symbol"]: s["current_price"]
-        for s in market_snapshot
-    }
-
     TradeService.execute(
         decision_rows=decision_rows,
         state=state,
-        price_lookup=price_lookup        
+        price_lookup=market_snapshot.prices,
     )
@@ -0,0 +1,34 @@
+from prefect import task
+from typing import List, Dict, Any, Optional
+from investment_engine.services.data_sources.reddit_client import RedditSentimentIngester, get_reddit_source
+
+@task
+def attach_reddit_sentiment(
+    candidates: List[Dict[str, Any]],
+    source_name: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Adds rolling-window Reddit mention counts and lexicon sentiment to each
+    candidate under 'reddit' (empty if the symbol wasn't mentioned).
+
+    source_name -> "praw" or "fixture"; defaults to settings.reddit_source.
+    Reddit being unavailable never fails the flow; candidates just get no
+    social context.
+    """
+    try:
+        source = get_reddit_source(source_name)
+        ingester = RedditSentimentIngester()
+        ingester.ingest(source)
+        aggregates = ingester.aggregates()
+        print(
+            f"Reddit ({source.name}): {ingester.items_read} items read, "
+            f"{ingester.items_matched} mentioning NIFTY 50 symbols"
+        )
+    except Exception as e:
+        print(f"Warning: Reddit sentiment unavailable: {e}")
+        aggregates = {}
+
+    return [
+        {**candidate, "reddit": aggregates.get(candidate["symbol"], {})}
+        for candidate in candidates
+    ]
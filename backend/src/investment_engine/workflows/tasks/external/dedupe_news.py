@@ -0,0 +1,14 @@
+from prefect import task
+from typing import List, Dict, Any, Tuple
+from investment_engine.services.news_dedup_service import NewsDedupService
+
+@task
+def dedupe_news(candidates: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Collapses exact and near-duplicate articles across candidates.
+
+    Returns (candidates, market_news): stories shared by several candidates
+    are moved to market_news and referenced by id from each candidate's
+    `news_refs`, so the prompt renders them once.
+    """
+    return NewsDedupService.dedupe(candidates)
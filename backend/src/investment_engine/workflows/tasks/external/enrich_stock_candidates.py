@@ -1,13 +1,23 @@
 from prefect import task, get_run_logger
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from investment_engine.services.data_sources.news_client import MarketAuxClient
 from investment_engine.settings import settings
 
 @task()
-def enrich_candidates(candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def enrich_candidates(candidates: List[Dict[str, Any]], use_cache: Optional[bool] = None) -> List[Dict[str, Any]]:
     """
     Takes the filtered list of candidates and appends news context 
     using the Marketaux API.
+
+    use_cache -> serve recently fetched news from Postgres; defaults to
+                 settings.news_cache_enabled
     """
-    news_client = MarketAuxClient(api_key=settings.market_aux_api_key, base_url=settings.market_aux_base_url)
-    return news_client.enrich_stock_candidates(candidates=candidates)
\ No newline at end of file
+    news_client = MarketAuxClient(
+        api_key=settings.market_aux_api_key,
+        base_url=settings.market_aux_base_url,
+        use_cache=use_cache,
+    )
+    try:
+        return news_client.enrich_stock_candidates(candidates=candidates)
+    finally:
+        news_client.close()
\ No newline at end of file
@@ -1,8 +1,40 @@
 from prefect import task
 from investment_engine.services.llm.decision_engine import DecisionEngine
+from investment_engine.settings import settings
 
 
 @task
-def generate_decisions(state, enriched_candidates):
-    return DecisionEngine.generate(state, enriched_candidates)
-    #return DecisionEngine.generate_ollama(state, candidates=enriched_candidates)
+def generate_decisions(
+    state, enriched_candidates, market_news=None, use_cache=None, sharded=None, backend=None, ensemble=None
+):
+    """
+    use_cache -> False forces a fresh LLM call instead of reusing a cached
+                 response for an identical prompt (OpenAI only)
+    sharded -> split candidates over parallel LLM calls and merge the results;
+               defaults to settings.llm_sharding_enabled
+    backend -> "openai", "ollama" or "mock"; defaults to settings.llm_backend
+    ensemble -> ask every settings.llm_ensemble_members model and vote; takes
+                precedence over sharded/backend. Defaults to settings.llm_ensemble_enabled
+    """
+    sharded = settings.llm_sharding_enabled if sharded is None else sharded
+    backend = backend or settings.llm_backend
+    ensemble = settings.llm_ensemble_enabled if ensemble is None else ensemble
+
+    if ensemble:
+        response = DecisionEngine.generate_ensemble(
+            state, enriched_candidates, market_news=market_news, use_cache=use_cache
+        )
+    elif sharded:
+        response = DecisionEngine.generate_sharded(
+            state, enriched_candidates, market_news=market_news, use_cache=use_cache, backend=backend
+        )
+    elif backend == "ollama":
+        response = DecisionEngine.generate_ollama(state, enriched_candidates, market_news=market_news)
+    elif backend == "mock":
+        response = DecisionEngine.generate_mock(state, enriched_candidates, market_news=market_news)
+    else:
+        response = DecisionEngine.generate(state, enriched_candidates, market_news=market_news, use_cache=use_cache)
+
+    if response is not None and response.usage is not None:
+        print(f"Run total - {response.usage.summary()}")
+    return response
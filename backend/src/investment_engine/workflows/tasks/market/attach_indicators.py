@@ -0,0 +1,25 @@
+from prefect import task
+from typing import List, Dict, Any, Optional
+from investment_engine.services.data_sources.market_client import MarketDataClient
+from investment_engine.services.data_sources.market_providers import get_market_provider
+from investment_engine.services.indicator_service import IndicatorService
+
+@task
+def attach_indicators(
+    candidates: List[Dict[str, Any]],
+    provider_name: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Adds technical indicators (SMA/EMA, RSI, ATR, volume average,
+    52-week range) to each candidate under 'indicators'.
+
+    Reads the bars fetch_market_snapshot already stored locally and only
+    advances each symbol's cached indicator state, so no extra network calls.
+    """
+    store = MarketDataClient.bar_store(get_market_provider(provider_name))
+    indicators = IndicatorService.compute(store, [c["symbol"] for c in candidates])
+
+    return [
+        {**candidate, "indicators": indicators.get(candidate["symbol"], {})}
+        for candidate in candidates
+    ]
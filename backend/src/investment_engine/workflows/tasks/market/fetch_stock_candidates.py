@@ -1,8 +1,15 @@
+from typing import Optional
+
 from prefect import task
 from investment_engine.services.data_sources.market_client import MarketDataClient
+from investment_engine.services.data_sources.market_providers import get_market_provider
 from investment_engine.workflows.utils.nifty_50 import NIFTY_50
 
 @task
-def fetch_market_snapshot():
-    # Returns a list of dicts with price AND change data
-    return MarketDataClient.get_market_snapshot(NIFTY_50)
+def fetch_market_snapshot(provider_name: Optional[str] = None):
+    """
+    provider_name -> market data provider to use ("yfinance", "replay");
+                     defaults to settings.market_data_provider
+    """
+    # Columnar MarketSnapshot with price AND change data; built once per run
+    return MarketDataClient.get_market_snapshot(NIFTY_50, provider=get_market_provider(provider_name))
@@ -1,19 +1,26 @@
 from prefect import task
-from typing import List, Dict, Any
-from investment_engine.services.data_sources.market_client import MarketDataClient
+from typing import List, Dict, Any, Optional
+from investment_engine.services.data_sources.market_snapshot import MarketSnapshot
+from investment_engine.services.screener_service import ScreenerService
+from investment_engine.workflows.schemas.screener_models import ScreenerSpec
 
 @task
 def filter_stock_candidates(
-    market_snapshot: List[Dict[str, Any]], 
+    market_snapshot: MarketSnapshot,
     min_change_pct: float = 1.5, 
-    top_n: int = 10
+    top_n: int = 10,
+    spec: Optional[ScreenerSpec] = None,
 ) -> List[Dict[str, Any]]:
     """
-    Filters the market snapshot for 'Active Movers'.
+    Screens the market snapshot for candidates.
     
-    Logic:
+    Without a spec this keeps the 'Active Movers' logic:
     1. Filter stocks where absolute(daily_change) >= min_change_pct.
-    2. Sort by magnitude of move (biggest movers first).
+    2. Rank by magnitude of move (biggest movers first).
     3. Return top_n candidates.
+
+    A ScreenerSpec adds volume, gap and reversal criteria and other rankings.
     """
-    return MarketDataClient.filter_candidates(market_snapshot, min_change_pct, top_n)
\ No newline at end of file
+    if spec is None:
+        spec = ScreenerSpec(min_abs_change_pct=min_change_pct, top_n=top_n)
+    return ScreenerService.screen(market_snapshot, spec)
@@ -3,13 +3,10 @@ from investment_engine.services.snapshot_service import SnapshotService
 
 @task
 def create_snapshot(state, market_snapshot):
-
-    price_lookup = {
-        s["symbol"]: s["current_price"]
-        for s in market_snapshot
-    }
-
+    """
+    market_snapshot -> MarketSnapshot from your fetch task
+    """
     SnapshotService.create(
         portfolio_id=state["portfolio_id"],
-        price_lookup=price_lookup,
+        price_lookup=market_snapshot.prices,
     )
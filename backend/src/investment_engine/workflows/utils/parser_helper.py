@@ -1,32 +1,119 @@
 import json
-import re
+from typing import Iterable, List, Optional
 
+from investment_engine.workflows.schemas.llm_models import DecisionResponse, StockDecision
 
-def extract_json(content: str) -> dict:
+ACTIONS = {"BUY", "SELL", "HOLD"}
+
+
+class StreamParseError(ValueError):
+    """Streamed model output can no longer become a valid DecisionResponse."""
+
+
+class DecisionStreamParser:
     """
-    Extract the first valid JSON object from LLM output.
-    Handles:
-    - wrapped quotes
-    - markdown blocks
-    - prefixed text
-    - trailing garbage
+    Incremental parser for a streamed {"decisions": [{...}, ...]} document.
+
+    feed() takes chunks as they arrive and returns each StockDecision as soon
+    as its object closes, validated. It raises StreamParseError at the first
+    sign the output went wrong (text before the JSON, a malformed or invalid
+    decision, a symbol we didn't ask about, too many decisions, trailing
+    output), so the caller can abort the generation instead of waiting for
+    it to finish.
     """
 
-    content = content.strip()
+    def __init__(self, allowed_symbols: Optional[Iterable[str]] = None, max_decisions: Optional[int] = None):
+        self.allowed_symbols = {s.upper() for s in allowed_symbols} if allowed_symbols is not None else None
+        self.max_decisions = max_decisions
+        self.decisions: List[StockDecision] = []
+
+        self._text: List[str] = []
+        self._object: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._started = False
+        self._done = False
+
+    def _complete(self, raw: str) -> StockDecision:
+        try:
+            decision = StockDecision.model_validate_json(raw)
+        except ValueError as e:
+            raise StreamParseError(f"invalid decision {raw[:80]!r}: {e}") from e
+
+        if decision.action.upper() not in ACTIONS:
+            raise StreamParseError(f"unknown action {decision.action!r} for {decision.symbol}")
+        if self.allowed_symbols is not None and decision.symbol.upper() not in self.allowed_symbols:
+            raise StreamParseError(f"decision for {decision.symbol}, which is not a candidate or holding")
+        if self.max_decisions is not None and len(self.decisions) >= self.max_decisions:
+            raise StreamParseError(f"more than {self.max_decisions} decisions")
+
+        self.decisions.append(decision)
+        return decision
+
+    def feed(self, chunk: str) -> List[StockDecision]:
+        """Consume a chunk; returns the decisions completed by it."""
+        completed = []
+        for ch in chunk:
+            self._text.append(ch)
+
+            if self._done:
+                if not ch.isspace():
+                    raise StreamParseError("output continues after the JSON document")
+                continue
 
-    # Remove markdown
-    content = content.replace("```json", "").replace("```", "").strip()
+            if not self._started:
+                if ch.isspace():
+                    continue
+                if ch != "{":
+                    raise StreamParseError(f"expected a JSON object, output starts with {ch!r}")
+                self._started = True
+                self._depth = 1
+                continue
 
-    # Remove wrapping quotes
-    if content.startswith(("'", '"')) and content.endswith(("'", '"')):
-        content = content[1:-1]
+            if self._depth >= 3:
+                self._object.append(ch)
 
-    # 🔥 Find JSON via regex
-    match = re.search(r"\{.*\}", content, re.DOTALL)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
 
-    if not match:
-        raise ValueError("No JSON object found in response")
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                # root {=1, "decisions" [=2, each decision {=3
+                if self._depth == 1 and ch != "[":
+                    raise StreamParseError("decisions must be a list")
+                if self._depth == 2 and ch != "{":
+                    raise StreamParseError("each decision must be an object")
+                self._depth += 1
+                if self._depth == 3:
+                    self._object = [ch]
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 2 and ch == "}":
+                    completed.append(self._complete("".join(self._object)))
+                    self._object = []
+                elif self._depth == 0:
+                    self._done = True
+                elif self._depth < 0:
+                    raise StreamParseError("unbalanced brackets")
 
-    json_str = match.group(0)
+        return completed
 
-    return json.loads(json_str)
+    def close(self) -> DecisionResponse:
+        """The whole document, once the stream has ended."""
+        if not self._done:
+            raise StreamParseError("output ended before the JSON document was complete")
+        try:
+            document = json.loads("".join(self._text))
+        except ValueError as e:
+            raise StreamParseError(f"output is not valid JSON: {e}") from e
+        if set(document) != {"decisions"}:
+            raise StreamParseError(f"unexpected top-level keys {sorted(document)}")
+        return DecisionResponse(decisions=self.decisions)
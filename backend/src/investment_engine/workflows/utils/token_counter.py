@@ -0,0 +1,54 @@
+import math
+import re
+from functools import lru_cache
+
+import tiktoken
+
+# Words, numbers, and every other non-space character on its own
+_PIECES = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # The BPE files are downloaded on first use (cached under TIKTOKEN_CACHE_DIR);
+        # without them, counts fall back to the estimate below
+        print(f"Warning: tiktoken unavailable for {model}, estimating token counts: {e}")
+        return None
+
+
+def tokenizer_name(model: str = "gpt-4.1-mini") -> str:
+    encoding = _encoding(model)
+    return encoding.name if encoding is not None else "regex-estimate"
+
+
+def _estimate(text: str) -> int:
+    """
+    Rough BPE count without a vocabulary: ~4 letters per token, ~3 digits
+    per token, one token per punctuation mark and two per non-ASCII
+    character (₹, emoji). Errs on the high side, so budgets trim early
+    rather than late.
+    """
+    total = 0
+    for piece in _PIECES.findall(text):
+        if piece[0].isalpha():
+            total += math.ceil(len(piece) / 4)
+        elif piece[0].isdigit():
+            total += math.ceil(len(piece) / 3)
+        else:
+            total += 1 if piece.isascii() else 2
+    return total
+
+
+def count_tokens(text: str, model: str = "gpt-4.1-mini") -> int:
+    """Tokens `text` costs for `model`; an estimate only if tiktoken can't load its vocabulary."""
+    if not text:
+        return 0
+    encoding = _encoding(model)
+    if encoding is None:
+        return _estimate(text)
+    return len(encoding.encode(text, disallowed_special=()))